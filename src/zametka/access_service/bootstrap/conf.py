@@ -45,6 +45,7 @@ def load_all_config() -> AllConfig:
         host=os.environ["DB_HOST"],
         password=os.environ["POSTGRES_PASSWORD"],
         user=os.environ["POSTGRES_USER"],
+        statement_timeout_ms=int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", 30000)),
     )
 
     amqp = AMQPConfig(
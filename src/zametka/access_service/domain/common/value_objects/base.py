@@ -1,11 +1,11 @@
 from abc import ABC
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Self, TypeVar
 
 V = TypeVar("V", bound=Any)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseValueObject(ABC):
     def __post_init__(self) -> None:
         self._validate()
@@ -13,10 +13,19 @@ class BaseValueObject(ABC):
     def _validate(self) -> None: ...
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ValueObject(BaseValueObject, ABC, Generic[V]):
     value: V
 
+    @classmethod
+    def from_trusted(cls, value: V) -> Self:
+        """Skip the validation, only for the values loaded from the database"""
+
+        value_object = object.__new__(cls)
+        object.__setattr__(value_object, "value", value)
+
+        return value_object
+
     def to_raw(self) -> V:
         return self.value
 
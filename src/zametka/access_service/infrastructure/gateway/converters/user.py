@@ -14,16 +14,17 @@ from zametka.access_service.infrastructure.persistence.models.user_identity impo
     DBUser,
 )
 
+# the stored values were validated on the way in, they are not checked again
 convert_db_user_to_entity = get_converter(
     DBUser,
     User,
     recipe=[
-        link(P[DBUser].user_id, P[User].user_id, coercer=lambda x: UserId(x)),
-        link(P[DBUser].email, P[User].email, coercer=lambda x: UserEmail(x)),
+        link(P[DBUser].user_id, P[User].user_id, coercer=UserId.from_trusted),
+        link(P[DBUser].email, P[User].email, coercer=UserEmail.from_trusted),
         link(
             P[DBUser].hashed_password,
             P[User].hashed_password,
-            coercer=lambda x: UserHashedPassword(x),
+            coercer=UserHashedPassword.from_trusted,
         ),
     ],
 )
@@ -19,6 +19,19 @@ class BaseDBConfig:
 class DBConfig(BaseDBConfig):
     """App database config"""
 
+    application_name: str = "zametka-access"
+    statement_timeout_ms: int = 30000
+    jit: bool = False
+
+    def get_server_settings(self) -> dict[str, str]:
+        """Session settings applied once to every new connection"""
+
+        return {
+            "application_name": self.application_name,
+            "statement_timeout": str(self.statement_timeout_ms),
+            "jit": "on" if self.jit else "off",
+        }
+
 
 @dataclass
 class AlembicDBConfig(BaseDBConfig):
@@ -0,0 +1,108 @@
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from zametka.access_service.domain.entities.user import User as IdentityEntity
+from zametka.access_service.domain.value_objects.user_email import UserEmail
+from zametka.access_service.domain.value_objects.user_hashed_password import (
+    UserHashedPassword,
+)
+from zametka.access_service.domain.value_objects.user_id import (
+    UserId as IdentityId,
+)
+from zametka.access_service.infrastructure.gateway.converters.user import (
+    convert_db_user_to_entity,
+)
+from zametka.access_service.infrastructure.persistence.models.user_identity import (
+    DBUser,
+)
+from zametka.notes.domain.entities.note import DBNote
+from zametka.notes.domain.value_objects.note.note_created_at import NoteCreatedAt
+from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.note.note_text import NoteText
+from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.domain.value_objects.note.note_version import NoteVersion
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.db.models.note import Note
+from zametka.notes.infrastructure.repositories.converters.note import (
+    note_db_model_to_db_note_entity,
+)
+from zametka.notes.infrastructure.repositories.text_codec import decode_text
+
+WARMUP_ROWS = 100
+
+
+def _validated_note(note: Note) -> DBNote:
+    """The converter as it was, every value object checked again"""
+
+    text = decode_text(note.text, note.text_compressed, note.text_codec)
+
+    return DBNote(
+        note_id=NoteId(note.note_id),
+        title=NoteTitle(note.title),
+        text=NoteText(text) if text else None,
+        author_id=UserId(note.author_id),
+        created_at=NoteCreatedAt(note.created_at),
+        version=NoteVersion(note.version),
+    )
+
+
+def _validated_identity(user: DBUser) -> IdentityEntity:
+    return IdentityEntity(
+        user_id=IdentityId(user.user_id),
+        email=UserEmail(user.email),
+        hashed_password=UserHashedPassword(user.hashed_password),
+        is_active=user.is_active,
+    )
+
+
+def _per_row(convert: Callable[[Any], Any], rows: list[Any]) -> float:
+    for row in rows[:WARMUP_ROWS]:
+        convert(row)
+
+    started = time.perf_counter()
+
+    for row in rows:
+        convert(row)
+
+    return (time.perf_counter() - started) / len(rows) * 1_000_000
+
+
+def benchmark_hydration(rows: int) -> None:
+    """Microseconds per row of the DB converters, validated and trusted"""
+
+    author_id = uuid.uuid4()
+    notes = [
+        Note(
+            note_id=note_id,
+            title=f"Заметка {note_id}",
+            text="Длинный текст заметки. " * 2600,
+            created_at=datetime.now(),
+            version=1,
+            author_id=author_id,
+        )
+        for note_id in range(rows)
+    ]
+    users = [
+        DBUser(
+            user_id=uuid.uuid4(),
+            email=f"user{number}@example.com",
+            hashed_password="$argon2id$v=19$m=65536,t=3,p=4$hash",
+            is_active=True,
+        )
+        for number in range(rows)
+    ]
+
+    for name, validated, trusted, data in (
+        ("notes", _validated_note, note_db_model_to_db_note_entity, notes),
+        ("identities", _validated_identity, convert_db_user_to_entity, users),
+    ):
+        before = _per_row(validated, data)
+        after = _per_row(trusted, data)
+
+        print(
+            f">> {name}: validated {before:.2f} us/row, "
+            f"trusted {after:.2f} us/row, x{before / after:.1f}",
+        )
@@ -1,13 +1,25 @@
+import asyncio
 import sys
+from pathlib import Path
+from uuid import UUID
 
 import alembic.config
 
 from zametka.access_service.infrastructure.persistence.alembic.config import (
     ALEMBIC_CONFIG as ACCESS_SERVICE_ALEMBIC,
 )
+from zametka.main.benchmarks import benchmark_hydration
 from zametka.notes.infrastructure.db.alembic.config import (
     ALEMBIC_CONFIG as NOTES_ALEMBIC,
 )
+from zametka.notes.main.cli import (
+    benchmark_auth,
+    benchmark_repositories,
+    import_notes,
+    move_notes,
+    recode_notes,
+)
+from zametka.notes.presentation.note_import import ImportFormat
 
 
 def notes_alembic_handler(args: list[str]) -> None:
@@ -16,6 +28,65 @@ def notes_alembic_handler(args: list[str]) -> None:
     )
 
 
+def notes_import_handler(args: list[str]) -> None:
+    """zametka notes import <path> <author identity id> [ndjson|csv]"""
+
+    try:
+        path = Path(args[0])
+        author_id = UUID(args[1])
+        import_format = ImportFormat(args[2]) if len(args) > 2 else ImportFormat.NDJSON
+    except (IndexError, ValueError):
+        print(">> Usage: notes import <path> <author identity id> [ndjson|csv]")
+        return
+
+    asyncio.run(import_notes(path, author_id, import_format))
+
+
+def notes_compress_handler(args: list[str]) -> None:
+    """zametka notes compress [--decompress]"""
+
+    asyncio.run(recode_notes(decompress="--decompress" in args))
+
+
+def notes_move_handler(args: list[str]) -> None:
+    """zametka notes move <author identity id> <shard>"""
+
+    try:
+        author_id = UUID(args[0])
+        target = int(args[1])
+    except (IndexError, ValueError):
+        print(">> Usage: notes move <author identity id> <shard>")
+        return
+
+    asyncio.run(move_notes(author_id, target))
+
+
+def notes_benchmark_handler(args: list[str]) -> None:
+    """zametka notes benchmark <author identity id> [seconds]"""
+
+    try:
+        author_id = UUID(args[0])
+        seconds = float(args[1]) if len(args) > 1 else 10.0
+    except (IndexError, ValueError):
+        print(">> Usage: notes benchmark <author identity id> [seconds]")
+        return
+
+    asyncio.run(benchmark_repositories(author_id, seconds))
+
+
+def notes_benchmark_auth_handler(args: list[str]) -> None:
+    """zametka notes benchmark-auth <access token> [seconds]"""
+
+    try:
+        access_token = args[0]
+        seconds = float(args[1]) if len(args) > 1 else 10.0
+    except (IndexError, ValueError):
+        print(">> Usage: notes benchmark-auth <access token> [seconds]")
+        return
+
+    asyncio.run(benchmark_auth(access_token, seconds))
+
+
 def access_service_alembic_handler(args: list[str]) -> None:
     alembic.config.main(
         argv=["-c", ACCESS_SERVICE_ALEMBIC, *args],
@@ -27,6 +98,18 @@ def all_alembic_handler(args: list[str]) -> None:
     access_service_alembic_handler(args)
 
 
+def hydration_benchmark_handler(args: list[str]) -> None:
+    """zametka all benchmark-hydration [rows]"""
+
+    try:
+        rows = int(args[0]) if args else 10000
+    except ValueError:
+        print(">> Usage: all benchmark-hydration [rows]")
+        return
+
+    benchmark_hydration(rows)
+
+
 def main() -> None:
     print(">> zametka CLI <<")
 
@@ -47,12 +130,18 @@ def main() -> None:
     modules = {
         "notes": {
             "alembic": notes_alembic_handler,
+            "import": notes_import_handler,
+            "compress": notes_compress_handler,
+            "move": notes_move_handler,
+            "benchmark": notes_benchmark_handler,
+            "benchmark-auth": notes_benchmark_auth_handler,
         },
         "access_service": {
             "alembic": access_service_alembic_handler,
         },
         "all": {
             "alembic": all_alembic_handler,
+            "benchmark-hydration": hydration_benchmark_handler,
         },
     }
 
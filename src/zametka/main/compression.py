@@ -0,0 +1,309 @@
+import gzip
+import hashlib
+import io
+from collections.abc import Callable, Hashable
+from typing import Any, Protocol, TypeVar
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from zametka.notes.infrastructure.cache.lru import TTLLRUCache
+
+BROTLI = "br"
+GZIP = "gzip"
+SUPPORTED_ENCODINGS = (BROTLI, GZIP)  # in the order of preference
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+SKIP_COMPRESSION = "__skip_compression__"
+
+EndpointT = TypeVar("EndpointT", bound=Callable[..., Any])
+
+
+def skip_compression(endpoint: EndpointT) -> EndpointT:
+    """Opt the route out of the response compression, put it under @router.get"""
+
+    setattr(endpoint, SKIP_COMPRESSION, True)
+
+    return endpoint
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick the best supported encoding of Accept-Encoding, br wins ties"""
+
+    weights: dict[str, float] = {}
+
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        params = params.strip().lower()
+        weight = 1.0
+
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+
+        weights[name.strip().lower()] = weight
+
+    chosen = None
+    chosen_weight = 0.0
+
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+
+        if weight > chosen_weight:
+            chosen, chosen_weight = encoding, weight
+
+    return chosen
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        raise NotImplementedError
+
+
+class BrotliCompressor(Compressor):
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        # flush so every streamed chunk can be decoded as soon as it arrives
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class GzipCompressor(Compressor):
+    def __init__(self, level: int):
+        self._buffer = io.BytesIO()
+        self._file = gzip.GzipFile(mode="wb", fileobj=self._buffer, compresslevel=level)
+
+    def compress(self, data: bytes) -> bytes:
+        self._file.write(data)
+        self._file.flush()
+        return self._take()
+
+    def finish(self) -> bytes:
+        self._file.close()
+        return self._take()
+
+    def _take(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with br or gzip, whichever Accept-Encoding prefers.
+
+    Bodies smaller than minimum_size, not textual or already encoded are sent
+    as is, routes opt out with @skip_compression. Compressed bodies of responses
+    with a strong ETag or Cache-Control: immutable are cached, private ones
+    only for the same credentials.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        brotli_quality: int = 4,
+        gzip_level: int = 6,
+        cache_max_entries: int = 1024,
+        cache_max_bytes: int = 32 * 1024 * 1024,
+        cache_ttl_seconds: float = 300,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.brotli_quality = brotli_quality
+        self.gzip_level = gzip_level
+        self.cache: TTLLRUCache[Hashable, bytes] = TTLLRUCache(
+            max_entries=cache_max_entries,
+            ttl_seconds=cache_ttl_seconds,
+            max_bytes=cache_max_bytes,
+            sizeof=len,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def make_compressor(self, encoding: str) -> Compressor:
+        if encoding == BROTLI:
+            return BrotliCompressor(self.brotli_quality)
+
+        return GzipCompressor(self.gzip_level)
+
+    def compress(
+        self, scope: Scope, headers: MutableHeaders, body: bytes, encoding: str,
+    ) -> bytes:
+        key = self._cache_key(scope, headers, body, encoding)
+
+        if key is not None and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        if encoding == BROTLI:
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+        if key is not None:
+            self.cache.put(key, compressed)
+
+        return compressed
+
+    @staticmethod
+    def _cache_key(
+        scope: Scope, headers: MutableHeaders, body: bytes, encoding: str,
+    ) -> Hashable | None:
+        etag = headers.get("etag")
+
+        # a strong ETag names exactly these bytes of this resource, but a private
+        # resource may differ per user, e.g. note ids repeat across the shards
+        if etag and not etag.startswith("W/"):
+            if "private" in headers.get("cache-control", ""):
+                return encoding, scope["path"], etag, _credentials(scope)
+
+            return encoding, scope["path"], etag
+
+        if "immutable" in headers.get("cache-control", ""):
+            return encoding, hashlib.blake2b(body, digest_size=16).digest()
+
+        return None
+
+
+def _credentials(scope: Scope) -> bytes:
+    request_headers = Headers(scope=scope)
+    credentials = hashlib.blake2b(digest_size=16)
+
+    for name in ("authorization", "cookie"):
+        credentials.update(request_headers.get(name, "").encode())
+        credentials.update(b"\0")
+
+    return credentials.digest()
+
+
+class CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        scope: Scope,
+        send: Send,
+        encoding: str,
+    ) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self._send = send
+        self._start: Message | None = None
+        self._compressor: Compressor | None = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # headers depend on the first body chunk, hold them until it comes
+            self._start = message
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send_start()
+            await self._send(message)
+            return
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            await self._send_first_body(start, message)
+            return
+
+        if self._compressor is None:
+            await self._send(message)
+            return
+
+        body = self._compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+
+        if not more_body:
+            body += self._compressor.finish()
+
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body},
+        )
+
+    async def _send_start(self) -> None:
+        if self._start is not None:
+            start, self._start = self._start, None
+            await self._send(start)
+
+    async def _send_first_body(self, start: Message, message: Message) -> None:
+        headers = MutableHeaders(raw=start["headers"])
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if not self._should_compress(start, headers, body, more_body):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body:
+            body = self.middleware.compress(self.scope, headers, body, self.encoding)
+            headers["Content-Length"] = str(len(body))
+        else:
+            self._compressor = self.middleware.make_compressor(self.encoding)
+            body = self._compressor.compress(body)
+            del headers["Content-Length"]
+
+        etag = headers.get("etag")
+
+        # the encoded bytes differ, so the validator may only be weak now
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        await self._send(start)
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body},
+        )
+
+    def _should_compress(
+        self, start: Message, headers: MutableHeaders, body: bytes, more_body: bool,
+    ) -> bool:
+        if getattr(self.scope.get("endpoint"), SKIP_COMPRESSION, False):
+            return False
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            return False
+
+        # streamed bodies are expected to be large
+        return more_body or len(body) >= self.middleware.minimum_size
@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from zametka.access_service import presentation as access_presentation
 from zametka.access_service.bootstrap import di as access_di
+from zametka.main.compression import CompressionMiddleware
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +29,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
 
 logging.info("Initialized app middlewares.")
 
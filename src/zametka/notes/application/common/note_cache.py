@@ -0,0 +1,30 @@
+from abc import abstractmethod
+from typing import Protocol
+
+from zametka.notes.domain.entities.note import DBNote
+from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.user.user_id import UserId
+
+
+class NoteCache(Protocol):
+    """
+    Note cache interface, ids are unique only among the notes of one shard.
+
+    Notes are kept with the generation of the author notes they were read
+    at, an entry of another generation is a miss, so writes of any process
+    are seen.
+    """
+
+    @abstractmethod
+    def get(
+        self, author_id: UserId, note_id: NoteId, generation: int,
+    ) -> DBNote | None:
+        """Get by author and id, if read at the generation"""
+
+    @abstractmethod
+    def put(self, note: DBNote, generation: int) -> None:
+        """Put"""
+
+    @abstractmethod
+    def invalidate(self, author_id: UserId, note_id: NoteId) -> None:
+        """Evict by author and id"""
@@ -1,11 +1,21 @@
 from abc import abstractmethod
+from collections.abc import AsyncIterator
 from typing import Protocol
 
-from zametka.notes.application.note.dto import DBNoteDTO, ListNotesDTO
+from zametka.notes.application.note.dto import (
+    AuthorNotesStatsDTO,
+    DBNoteDTO,
+    ExportNoteDTO,
+    ListNoteDTO,
+    ListNotesDTO,
+    NoteListField,
+    SearchMode,
+)
 from zametka.notes.application.user.dto import UserDTO
 from zametka.notes.domain.entities.note import DBNote, Note
 from zametka.notes.domain.entities.user import User
 from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.note.note_version import NoteVersion
 from zametka.notes.domain.value_objects.user.user_id import UserId
 
 
@@ -17,28 +27,113 @@ class NoteRepository(Protocol):
         """Create"""
 
     @abstractmethod
-    async def get(self, note_id: NoteId) -> DBNote | None:
-        """Get by id"""
+    async def create_many(self, notes: list[Note]) -> list[DBNoteDTO]:
+        """Create in one statement, results are in the order of notes"""
+
+    @abstractmethod
+    async def copy_many(self, notes: list[Note]) -> None:
+        """Bulk load for imports, nothing is saved if any note fails"""
+
+    @abstractmethod
+    async def get(self, note_id: NoteId, author_id: UserId) -> DBNote | None:
+        """Get by id if author_id is the author"""
+
+    @abstractmethod
+    async def get_author_id(self, note_id: NoteId) -> UserId | None:
+        """Get author of the note without loading it, not scoped by the author"""
+
+    @abstractmethod
+    async def get_author_ids(self, note_ids: list[NoteId]) -> dict[int, UserId]:
+        """Get authors of the existing notes without loading them, not scoped"""
 
     @abstractmethod
     async def update(
-        self, note_id: NoteId, updated_note: DBNote,
+        self,
+        note_id: NoteId,
+        updated_note: Note,
+        version: NoteVersion | None = None,
     ) -> DBNoteDTO | None:
-        """Update"""
+        """
+        Update if updated_note.author_id is the author and the note is of version.
+
+        Keeps text if it is empty, bumps the version.
+        """
+
+    @abstractmethod
+    async def update_many(
+        self, author_id: UserId, notes: list[tuple[NoteId, Note]],
+    ) -> list[DBNoteDTO]:
+        """Update the notes of author_id in one statement, bumps their versions"""
+
+    @abstractmethod
+    async def delete_many(
+        self, author_id: UserId, note_ids: list[NoteId],
+    ) -> list[int]:
+        """Delete the notes of author_id in one statement, returns deleted ids"""
 
     @abstractmethod
-    async def list(self, limit: int, offset: int, author_id: UserId) -> ListNotesDTO:
-        """List"""
+    async def get_generation(self, author_id: UserId) -> int:
+        """Generation of the author notes, 0 if the author has never had notes"""
+
+    @abstractmethod
+    async def get_stats(
+        self, author_id: UserId, lock: bool = False,
+    ) -> AuthorNotesStatsDTO:
+        """
+        Counters of the author notes, zeros if the author has never had notes.
+
+        With lock the counters stay as read until the transaction ends.
+        """
+
+    @abstractmethod
+    async def get_text_bytes(
+        self, author_id: UserId, note_ids: list[NoteId],
+    ) -> dict[int, int]:
+        """Stored bytes of the texts of the existing notes of author_id"""
+
+    @abstractmethod
+    async def suggest(
+        self, author_id: UserId, query: str, limit: int,
+    ) -> list[ListNoteDTO]:
+        """Titles of the author nearest to the query, which may be a word fragment"""
+
+    @abstractmethod
+    def export(self, author_id: UserId) -> AsyncIterator[list[ExportNoteDTO]]:
+        """Stream all notes of the author in batches, oldest first"""
+
+    @abstractmethod
+    async def list(
+        self,
+        limit: int,
+        offset: int,
+        author_id: UserId,
+        cursor: str | None = None,
+        fields: frozenset[NoteListField] = frozenset(),
+        preview_chars: int = 100,
+    ) -> ListNotesDTO:
+        """
+        List, seeks after the cursor instead of offset when it is given.
+
+        Notes are ListNoteDetailsDTO with the given fields when there are any.
+        """
 
     @abstractmethod
     async def search(
-        self, query: str, limit: int, offset: int, author_id: UserId,
+        self,
+        query: str,
+        limit: int,
+        offset: int,
+        author_id: UserId,
+        cursor: str | None = None,
+        mode: SearchMode = SearchMode.FUZZY,
+        fields: frozenset[NoteListField] = frozenset(),
+        preview_chars: int = 100,
     ) -> ListNotesDTO:
-        """FTS"""
+        """FTS, seeks after the cursor instead of offset, fields are like in list"""
 
     @abstractmethod
-    async def delete(self, note_id: NoteId) -> None:
-        """Delete"""
+    async def delete(self, note_id: NoteId, author_id: UserId) -> bool:
+        """Delete if author_id is the author, returns whether it was deleted"""
 
 
 class UserRepository(Protocol):
@@ -0,0 +1,30 @@
+from abc import abstractmethod
+from typing import Protocol
+
+from zametka.notes.application.note.dto import ListNotesDTO, ListNotesInputDTO
+from zametka.notes.domain.value_objects.user.user_id import UserId
+
+
+class SearchCache(Protocol):
+    """
+    Search results cache interface.
+
+    Results are keyed by the generation of the author notes, so a write
+    makes the old entries unreachable instead of invalidating them.
+    """
+
+    @abstractmethod
+    def get(
+        self, user_id: UserId, generation: int, data: ListNotesInputDTO,
+    ) -> ListNotesDTO | None:
+        """Get the page of the normalized search"""
+
+    @abstractmethod
+    def put(
+        self,
+        user_id: UserId,
+        generation: int,
+        data: ListNotesInputDTO,
+        notes: ListNotesDTO,
+    ) -> None:
+        """Put"""
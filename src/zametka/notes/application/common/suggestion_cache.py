@@ -0,0 +1,17 @@
+from abc import abstractmethod
+from typing import Protocol
+
+from zametka.notes.application.note.dto import ListNoteDTO
+from zametka.notes.domain.value_objects.user.user_id import UserId
+
+
+class SuggestionCache(Protocol):
+    """Title suggestions cache interface"""
+
+    @abstractmethod
+    def get(self, user_id: UserId, query: str) -> list[ListNoteDTO] | None:
+        """Get by user and normalized query"""
+
+    @abstractmethod
+    def put(self, user_id: UserId, query: str, notes: list[ListNoteDTO]) -> None:
+        """Put"""
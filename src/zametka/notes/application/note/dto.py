@@ -1,4 +1,20 @@
+from collections.abc import AsyncIterable
 from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+
+class SearchMode(Enum):
+    FUZZY = "fuzzy"  # trigram similarity over the title
+    FULLTEXT = "fulltext"  # ranked full-text search over the title and the text
+
+
+class NoteListField(Enum):
+    """Optional fields of the listed notes, only the requested ones are fetched"""
+
+    PREVIEW = "preview"  # the first preview_chars characters of the text
+    CREATED_AT = "created_at"
+    TEXT_LENGTH = "text_length"
 
 
 @dataclass(frozen=True)
@@ -10,6 +26,7 @@ class NoteDTO:
 @dataclass(frozen=True, kw_only=True)
 class DBNoteDTO(NoteDTO):
     note_id: int
+    version: int
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -18,6 +35,15 @@ class ListNoteDTO:
     note_id: int
 
 
+@dataclass(frozen=True, kw_only=True)
+class ListNoteDetailsDTO(ListNoteDTO):
+    """Fields that were not requested stay None"""
+
+    preview: str | None = None
+    created_at: datetime | None = None
+    text_length: int | None = None
+
+
 @dataclass(frozen=True)
 class CreateNoteInputDTO:
     title: str
@@ -29,6 +55,7 @@ class UpdateNoteInputDTO:
     note_id: int
     title: str
     text: str | None = None
+    version: int | None = None  # expected version, None overwrites any
 
 
 @dataclass(frozen=True)
@@ -39,16 +66,116 @@ class ReadNoteInputDTO:
 @dataclass(frozen=True)
 class ListNotesInputDTO:
     limit: int
-    offset: int
+    offset: int = 0
     search: str | None = None
+    search_mode: SearchMode = SearchMode.FUZZY
+    cursor: str | None = None
+    fields: frozenset[NoteListField] = frozenset()
+    preview_chars: int = 100
+
+
+@dataclass(frozen=True)
+class SuggestNotesInputDTO:
+    query: str
+
+
+@dataclass(frozen=True)
+class NoteSuggestionsDTO:
+    """The nearest titles first"""
+
+    notes: list[ListNoteDTO]
+
+
+@dataclass(frozen=True, kw_only=True)
+class AuthorNotesStatsDTO:
+    """Counters kept by the database with every write, reading them is cheap"""
+
+    generation: int = 0
+    note_count: int = 0
+    text_bytes: int = 0
 
 
 @dataclass(frozen=True)
 class ListNotesDTO:
     notes: list[ListNoteDTO]
     has_next: bool
+    next_cursor: str | None = None
+    total: int | None = None
+    bytes_used: int | None = None
+    # of the notes the page was read with, for the ETag, not serialized
+    generation: int | None = None
+
+
+@dataclass(frozen=True)
+class ExportNotesInputDTO:
+    pass
+
+
+@dataclass(frozen=True, kw_only=True)
+class ExportNoteDTO:
+    note_id: int
+    title: str
+    text: str | None
+    created_at: datetime
+
+
+@dataclass(frozen=True, kw_only=True)
+class ImportNoteDTO:
+    line: int  # where the row starts in the source, for error reports
+    title: str
+    text: str | None = None
+    created_at: datetime | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class ImportNoteErrorDTO:
+    line: int
+    error: str
+
+
+@dataclass(frozen=True)
+class ImportNotesInputDTO:
+    """Rows that could not be parsed come as errors and are reported as is"""
+
+    notes: AsyncIterable[ImportNoteDTO | ImportNoteErrorDTO]
+
+
+@dataclass(frozen=True, kw_only=True)
+class ImportNotesProgressDTO:
+    """Totals so far and the errors of the last chunk"""
+
+    imported: int
+    failed: int
+    errors: list[ImportNoteErrorDTO]
 
 
 @dataclass(frozen=True)
 class DeleteNoteInputDTO:
     note_id: int
+
+
+@dataclass(frozen=True)
+class BatchNotesInputDTO:
+    """Operations run in one transaction: creates, then updates, then deletes"""
+
+    operations: list[CreateNoteInputDTO | UpdateNoteInputDTO | DeleteNoteInputDTO]
+
+
+class BatchNoteStatus(Enum):
+    OK = "ok"
+    INVALID = "invalid"
+    NOT_FOUND = "not_found"
+    ACCESS_DENIED = "access_denied"
+
+
+@dataclass(frozen=True, kw_only=True)
+class BatchNoteResultDTO:
+    index: int
+    status: BatchNoteStatus
+    note: DBNoteDTO | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class BatchNotesResultDTO:
+    results: list[BatchNoteResultDTO]
@@ -0,0 +1,147 @@
+from collections.abc import AsyncIterable, AsyncIterator
+
+from zametka.notes.application.common.id_provider import IdProvider
+from zametka.notes.application.common.interactor import Interactor
+from zametka.notes.application.common.repository import NoteRepository
+from zametka.notes.application.common.uow import UoW
+from zametka.notes.application.note.dto import (
+    ImportNoteDTO,
+    ImportNoteErrorDTO,
+    ImportNotesInputDTO,
+    ImportNotesProgressDTO,
+)
+from zametka.notes.application.note.quota import NoteQuota, note_text_bytes
+from zametka.notes.domain.entities.note import Note
+from zametka.notes.domain.exceptions.note import (
+    NoteDataError,
+    NoteQuotaExceededError,
+    NotesNotSavedError,
+)
+from zametka.notes.domain.value_objects.note.note_created_at import (
+    NoteCreatedAt,
+)
+from zametka.notes.domain.value_objects.note.note_text import NoteText
+from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.domain.value_objects.user.user_id import UserId
+
+
+class ImportNotes(
+    Interactor[ImportNotesInputDTO, AsyncIterator[ImportNotesProgressDTO]],
+):
+    """
+    Bulk import of the user notes.
+
+    Rows are validated and loaded in chunks, every chunk is committed on its own,
+    so a failed chunk does not undo the others. Progress is reported per chunk.
+    A chunk over the quota fails as a whole.
+    """
+
+    CHUNK_SIZE = 5000
+
+    def __init__(
+        self,
+        note_repository: NoteRepository,
+        uow: UoW,
+        id_provider: IdProvider,
+        quota: NoteQuota | None = None,
+    ):
+        self.note_repository = note_repository
+        self.uow = uow
+        self.id_provider = id_provider
+        self.quota = quota or NoteQuota()
+
+    async def __call__(
+        self, data: ImportNotesInputDTO,
+    ) -> AsyncIterator[ImportNotesProgressDTO]:
+        user_id: UserId = await self.id_provider.get_user_id()
+
+        return self._import(data.notes, user_id)
+
+    @staticmethod
+    def _make_note(row: ImportNoteDTO, author_id: UserId) -> Note:
+        return Note(
+            title=NoteTitle(row.title),
+            author_id=author_id,
+            text=NoteText(row.text) if row.text else None,
+            created_at=NoteCreatedAt(row.created_at) if row.created_at else None,
+        )
+
+    async def _save(
+        self, chunk: list[tuple[int, Note]], errors: list[ImportNoteErrorDTO],
+    ) -> int:
+        """Load the chunk, returns how many notes were saved"""
+
+        if not chunk:
+            return 0
+
+        notes = [note for _, note in chunk]
+
+        try:
+            if self.quota.is_limited:
+                # locked until the commit, like NoteInteractor does it
+                stats = await self.note_repository.get_stats(
+                    notes[0].author_id, lock=True,
+                )
+                self.quota.check(
+                    stats, len(notes), sum(note_text_bytes(note) for note in notes),
+                )
+
+            await self.note_repository.copy_many(notes)
+        except (NotesNotSavedError, NoteQuotaExceededError) as exc:
+            await self.uow.rollback()
+            errors.append(
+                ImportNoteErrorDTO(
+                    line=chunk[0][0],
+                    error=f"{exc.message} Строки {chunk[0][0]}-{chunk[-1][0]}.",
+                ),
+            )
+            return 0
+
+        await self.uow.commit()
+
+        return len(chunk)
+
+    async def _import(
+        self,
+        rows: AsyncIterable[ImportNoteDTO | ImportNoteErrorDTO],
+        author_id: UserId,
+    ) -> AsyncIterator[ImportNotesProgressDTO]:
+        imported = 0
+        failed = 0
+        chunk: list[tuple[int, Note]] = []
+        errors: list[ImportNoteErrorDTO] = []
+        reported = False
+
+        async for row in rows:
+            if isinstance(row, ImportNoteErrorDTO):
+                errors.append(row)
+            else:
+                try:
+                    chunk.append((row.line, self._make_note(row, author_id)))
+                except NoteDataError as exc:
+                    errors.append(
+                        ImportNoteErrorDTO(line=row.line, error=str(exc.message)),
+                    )
+
+            if len(chunk) + len(errors) < self.CHUNK_SIZE:
+                continue
+
+            failed += len(errors)
+            saved = await self._save(chunk, errors)
+            imported += saved
+            failed += len(chunk) - saved
+
+            yield ImportNotesProgressDTO(
+                imported=imported, failed=failed, errors=errors,
+            )
+            chunk, errors, reported = [], [], True
+
+        if chunk or errors or not reported:
+            failed += len(errors)
+            saved = await self._save(chunk, errors)
+            imported += saved
+            failed += len(chunk) - saved
+
+            yield ImportNotesProgressDTO(
+                imported=imported, failed=failed, errors=errors,
+            )
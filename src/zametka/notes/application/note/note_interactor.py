@@ -1,47 +1,62 @@
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from typing import NoReturn
 
 from zametka.notes.application.common.id_provider import IdProvider
+from zametka.notes.application.common.note_cache import NoteCache
 from zametka.notes.application.common.repository import NoteRepository
+from zametka.notes.application.common.search_cache import SearchCache
 from zametka.notes.application.common.uow import UoW
 from zametka.notes.application.note.dto import (
+    BatchNoteResultDTO,
+    BatchNotesInputDTO,
+    BatchNotesResultDTO,
+    BatchNoteStatus,
     CreateNoteInputDTO,
     DBNoteDTO,
     DeleteNoteInputDTO,
+    ExportNoteDTO,
+    ExportNotesInputDTO,
     ListNotesDTO,
     ListNotesInputDTO,
     ReadNoteInputDTO,
     UpdateNoteInputDTO,
 )
+from zametka.notes.application.note.query import normalize_query
+from zametka.notes.application.note.quota import NoteQuota, note_text_bytes
 from zametka.notes.domain.entities.note import DBNote, Note
 from zametka.notes.domain.exceptions.note import (
     NoteAccessDeniedError,
+    NoteDataError,
     NoteNotExistsError,
+    NoteVersionConflictError,
+    TooManyNoteOperationsError,
 )
 from zametka.notes.domain.value_objects.note.note_id import NoteId
 from zametka.notes.domain.value_objects.note.note_text import NoteText
 from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.domain.value_objects.note.note_version import NoteVersion
 from zametka.notes.domain.value_objects.user.user_id import UserId
 
 
 class NoteInteractor:
+    MAX_BATCH_SIZE = 500
+
     def __init__(
         self,
         note_repository: NoteRepository,
         uow: UoW,
         id_provider: IdProvider,
+        note_cache: NoteCache,
+        search_cache: SearchCache,
+        quota: NoteQuota | None = None,
     ):
         self.uow = uow
         self.note_repository = note_repository
         self.id_provider = id_provider
-
-    async def _check_exists(self, note_id: NoteId) -> DBNote:
-        """Raises NoteNotExists if note with given id is not exists"""
-
-        note: DBNote | None = await self.note_repository.get(note_id)
-
-        if not note:
-            raise NoteNotExistsError()
-
-        return note
+        self.note_cache = note_cache
+        self.search_cache = search_cache
+        self.quota = quota or NoteQuota()
 
     async def _get_note(self, note_id: NoteId) -> DBNote:
         """
@@ -49,24 +64,86 @@ class NoteInteractor:
 
         1. Is note exists
         2. Is user are author of this note
-        """
 
-        note: DBNote = await self._check_exists(note_id)
+        Both the repository and the cache look only among the notes of
+        the user, ids of notes on different shards may be equal. A cached
+        note is used only at the generation it was read at, which is one
+        read of the counters row instead of reading the note.
+        """
 
         user_id: UserId = await self.id_provider.get_user_id()
+        # read before the note, so it is never cached under a newer generation
+        generation = await self.note_repository.get_generation(user_id)
+
+        note: DBNote | None = self.note_cache.get(user_id, note_id, generation)
+
+        if not note:
+            note = await self.note_repository.get(note_id, user_id)
+
+            if not note:
+                await self._raise_not_changed(note_id, user_id)
+
+            self.note_cache.put(note, generation)
 
         if not note.has_access(user_id):
             raise NoteAccessDeniedError()
 
         return note
 
-    async def create(self, data: CreateNoteInputDTO) -> DBNoteDTO:
-        user_id: UserId = await self.id_provider.get_user_id()
-
+    @staticmethod
+    def _make_note(
+        data: CreateNoteInputDTO | UpdateNoteInputDTO, author_id: UserId,
+    ) -> Note:
         title = NoteTitle(data.title)
         text = NoteText(data.text) if data.text else None
 
-        note: Note = Note(title, user_id, text)
+        return Note(title, author_id, text)
+
+    async def _check_quota(
+        self,
+        user_id: UserId,
+        created: list[Note],
+        updated: list[tuple[NoteId, Note]] | None = None,
+    ) -> None:
+        """
+        Check the created notes and the grown texts against the counters.
+
+        The counters are locked until the commit, so concurrent writes of
+        one author cannot both squeeze into the last free place.
+        """
+
+        if not self.quota.is_limited:
+            return
+
+        grown = [
+            (note_id, note)
+            for note_id, note in updated or []
+            if note.text and self.quota.max_text_bytes is not None
+        ]
+
+        if not created and not grown:
+            return
+
+        stats = await self.note_repository.get_stats(user_id, lock=True)
+        text_bytes = sum(note_text_bytes(note) for note in created)
+
+        if grown:
+            stored = await self.note_repository.get_text_bytes(
+                user_id, [note_id for note_id, _ in grown],
+            )
+            text_bytes += sum(
+                note_text_bytes(note) - stored[note_id.to_raw()]
+                for note_id, note in grown
+                if note_id.to_raw() in stored
+            )
+
+        self.quota.check(stats, len(created), text_bytes)
+
+    async def create(self, data: CreateNoteInputDTO) -> DBNoteDTO:
+        user_id: UserId = await self.id_provider.get_user_id()
+
+        note: Note = self._make_note(data, user_id)
+        await self._check_quota(user_id, [note])
 
         note_dto = await self.note_repository.create(note)
         await self.uow.commit()
@@ -82,30 +159,107 @@ class NoteInteractor:
             title=note.title.to_raw(),
             text=note.text.to_raw() if note.text else None,
             note_id=note.note_id.to_raw(),
+            version=note.version.to_raw(),
         )
 
-    async def update(self, data: UpdateNoteInputDTO) -> DBNoteDTO:
-        note: DBNote = await self._get_note(NoteId(data.note_id))
+    @staticmethod
+    def _not_changed_error(
+        author_id: UserId | None, user_id: UserId,
+    ) -> NoteNotExistsError | NoteAccessDeniedError:
+        if author_id is not None and author_id != user_id:
+            return NoteAccessDeniedError()
 
-        title = NoteTitle(data.title)
-        text = NoteText(data.text) if data.text else None
+        return NoteNotExistsError()
+
+    async def _raise_not_changed(
+        self, note_id: NoteId, user_id: UserId, version: NoteVersion | None = None,
+    ) -> NoReturn:
+        """
+        Explain why the author-scoped query did not find the note.
 
-        new_note: Note = Note(title, note.author_id, text)
-        updated_note: DBNote = note.merge(new_note)
+        Runs only when the query missed, so the common path is one statement.
+        """
+
+        author_id: UserId | None = await self.note_repository.get_author_id(note_id)
+
+        if version is not None and author_id == user_id:
+            raise NoteVersionConflictError("Заметка уже изменена!")
+
+        raise self._not_changed_error(author_id, user_id)
+
+    async def update(self, data: UpdateNoteInputDTO) -> DBNoteDTO:
+        user_id: UserId = await self.id_provider.get_user_id()
+        note_id = NoteId(data.note_id)
+        version = NoteVersion(data.version) if data.version is not None else None
+
+        new_note: Note = self._make_note(data, user_id)
+        await self._check_quota(user_id, [], [(note_id, new_note)])
 
         updated_db_note = await self.note_repository.update(
-            NoteId(data.note_id), updated_note,
+            note_id, new_note, version,
         )
 
         if not updated_db_note:
-            raise NoteNotExistsError()
+            await self._raise_not_changed(note_id, user_id, version)
 
         await self.uow.commit()
+        self.note_cache.invalidate(user_id, note_id)
 
         return updated_db_note
 
+    async def export(
+        self, data: ExportNotesInputDTO,
+    ) -> AsyncIterator[list[ExportNoteDTO]]:
+        """
+        Export all notes of the user.
+
+        The user is resolved here, the notes are read only while iterating.
+        """
+
+        user_id: UserId = await self.id_provider.get_user_id()
+
+        return self.note_repository.export(user_id)
+
+    async def _search(
+        self, user_id: UserId, generation: int, data: ListNotesInputDTO,
+    ) -> ListNotesDTO:
+        """
+        Search through the cache.
+
+        The generation is read before the search, so a page is never
+        cached under a generation newer than its notes.
+        """
+
+        data = replace(data, search=normalize_query(data.search or ""))
+
+        cached = self.search_cache.get(user_id, generation, data)
+
+        if cached is not None:
+            return cached
+
+        dto = await self.note_repository.search(
+            author_id=user_id,
+            query=data.search or "",
+            limit=data.limit,
+            offset=data.offset,
+            cursor=data.cursor,
+            mode=data.search_mode,
+            fields=data.fields,
+            preview_chars=data.preview_chars,
+        )
+        self.search_cache.put(user_id, generation, data, dto)
+
+        return dto
+
     async def list(self, data: ListNotesInputDTO) -> ListNotesDTO:
+        """
+        Totals come from the counters, the notes are never counted.
+
+        The generation is read before the page, so it is never newer.
+        """
+
         user_id: UserId = await self.id_provider.get_user_id()
+        stats = await self.note_repository.get_stats(user_id)
 
         offset: int = data.offset
         limit: int = data.limit
@@ -115,19 +269,129 @@ class NoteInteractor:
                 author_id=user_id,
                 limit=limit,
                 offset=offset,
+                cursor=data.cursor,
+                fields=data.fields,
+                preview_chars=data.preview_chars,
             )
         else:
-            dto: ListNotesDTO = await self.note_repository.search(  # type:ignore
-                author_id=user_id,
-                query=data.search,
-                limit=limit,
-                offset=offset,
+            dto = await self._search(user_id, stats.generation, data)
+
+        return ListNotesDTO(
+            notes=dto.notes,
+            has_next=dto.has_next,
+            next_cursor=dto.next_cursor,
+            total=stats.note_count,
+            bytes_used=stats.text_bytes,
+            generation=stats.generation,
+        )
+
+    async def delete(self, data: DeleteNoteInputDTO) -> None:
+        user_id: UserId = await self.id_provider.get_user_id()
+        note_id = NoteId(data.note_id)
+
+        is_deleted = await self.note_repository.delete(note_id, user_id)
+
+        if not is_deleted:
+            await self._raise_not_changed(note_id, user_id)
+
+        await self.uow.commit()
+        self.note_cache.invalidate(user_id, note_id)
+
+    async def batch(self, data: BatchNotesInputDTO) -> BatchNotesResultDTO:
+        """
+        Run many operations in one transaction.
+
+        Each kind of operation is a single statement: creates run first,
+        then updates, then deletes. Invalid items are reported and skipped.
+        """
+
+        if len(data.operations) > self.MAX_BATCH_SIZE:
+            raise TooManyNoteOperationsError(
+                f"Не больше {self.MAX_BATCH_SIZE} операций за раз!",
             )
 
-        return ListNotesDTO(notes=dto.notes, has_next=dto.has_next)
+        user_id: UserId = await self.id_provider.get_user_id()
 
-    async def delete(self, data: DeleteNoteInputDTO) -> None:
-        await self._get_note(NoteId(data.note_id))
+        results: dict[int, BatchNoteResultDTO] = {}
+        creates: list[tuple[int, Note]] = []
+        updates: dict[int, tuple[int, Note]] = {}
+        deletes: dict[int, int] = {}
+
+        for index, operation in enumerate(data.operations):
+            try:
+                if isinstance(operation, CreateNoteInputDTO):
+                    creates.append((index, self._make_note(operation, user_id)))
+                elif operation.note_id in updates or operation.note_id in deletes:
+                    raise NoteDataError("Повторная операция над заметкой!")
+                elif isinstance(operation, UpdateNoteInputDTO):
+                    note = self._make_note(operation, user_id)
+                    updates[operation.note_id] = (index, note)
+                else:
+                    deletes[operation.note_id] = index
+            except NoteDataError as exc:
+                results[index] = BatchNoteResultDTO(
+                    index=index,
+                    status=BatchNoteStatus.INVALID,
+                    error=exc.message,
+                )
+
+        await self._check_quota(
+            user_id,
+            [note for _, note in creates],
+            [(NoteId(note_id), note) for note_id, (_, note) in updates.items()],
+        )
+
+        created = await self.note_repository.create_many(
+            [note for _, note in creates],
+        )
+        updated = await self.note_repository.update_many(
+            user_id,
+            [(NoteId(note_id), note) for note_id, (_, note) in updates.items()],
+        )
+        deleted = await self.note_repository.delete_many(
+            user_id, [NoteId(note_id) for note_id in deletes],
+        )
+
+        for (index, _), note_dto in zip(creates, created, strict=True):
+            results[index] = BatchNoteResultDTO(
+                index=index, status=BatchNoteStatus.OK, note=note_dto,
+            )
+
+        for note_dto in updated:
+            index, _ = updates.pop(note_dto.note_id)
+            results[index] = BatchNoteResultDTO(
+                index=index, status=BatchNoteStatus.OK, note=note_dto,
+            )
+
+        for note_id in deleted:
+            index = deletes.pop(note_id)
+            results[index] = BatchNoteResultDTO(
+                index=index, status=BatchNoteStatus.OK,
+            )
+
+        missed = {note_id: index for note_id, (index, _) in updates.items()}
+        missed.update(deletes)
+
+        authors = await self.note_repository.get_author_ids(
+            [NoteId(note_id) for note_id in missed],
+        )
+
+        for note_id, index in missed.items():
+            error = self._not_changed_error(authors.get(note_id), user_id)
+            status = (
+                BatchNoteStatus.ACCESS_DENIED
+                if isinstance(error, NoteAccessDeniedError)
+                else BatchNoteStatus.NOT_FOUND
+            )
+            results[index] = BatchNoteResultDTO(index=index, status=status)
 
-        await self.note_repository.delete(NoteId(data.note_id))
         await self.uow.commit()
+
+        for note_dto in updated:
+            self.note_cache.invalidate(user_id, NoteId(note_dto.note_id))
+        for note_id in deleted:
+            self.note_cache.invalidate(user_id, NoteId(note_id))
+
+        return BatchNotesResultDTO(
+            results=[results[index] for index in sorted(results)],
+        )
@@ -0,0 +1,4 @@
+def normalize_query(query: str) -> str:
+    """Trigrams and tsquery ignore case and extra spaces, caches should too"""
+
+    return " ".join(query.lower().split())
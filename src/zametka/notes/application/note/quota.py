@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+
+from zametka.notes.application.note.dto import AuthorNotesStatsDTO
+from zametka.notes.domain.entities.note import Note
+from zametka.notes.domain.exceptions.note import NoteQuotaExceededError
+
+
+def note_text_bytes(note: Note) -> int:
+    """New texts are counted uncompressed, so the checks err on the safe side"""
+
+    return len(note.text.to_raw().encode()) if note.text else 0
+
+
+@dataclass(frozen=True, kw_only=True)
+class NoteQuota:
+    """Limits per author, None is no limit"""
+
+    max_notes: int | None = None
+    max_text_bytes: int | None = None
+
+    @property
+    def is_limited(self) -> bool:
+        return self.max_notes is not None or self.max_text_bytes is not None
+
+    def check(
+        self, stats: AuthorNotesStatsDTO, notes: int = 0, text_bytes: int = 0,
+    ) -> None:
+        """Raise if the counters grown by notes and text_bytes go over a limit"""
+
+        if self.max_notes is not None and notes > 0:
+            if stats.note_count + notes > self.max_notes:
+                raise NoteQuotaExceededError(
+                    f"Не больше {self.max_notes} заметок!",
+                )
+
+        if self.max_text_bytes is not None and text_bytes > 0:
+            if stats.text_bytes + text_bytes > self.max_text_bytes:
+                raise NoteQuotaExceededError("Превышен объём хранилища заметок!")
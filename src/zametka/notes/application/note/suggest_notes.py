@@ -0,0 +1,47 @@
+from zametka.notes.application.common.id_provider import IdProvider
+from zametka.notes.application.common.interactor import Interactor
+from zametka.notes.application.common.repository import NoteRepository
+from zametka.notes.application.common.suggestion_cache import SuggestionCache
+from zametka.notes.application.note.dto import (
+    NoteSuggestionsDTO,
+    SuggestNotesInputDTO,
+)
+from zametka.notes.application.note.query import normalize_query
+from zametka.notes.domain.value_objects.user.user_id import UserId
+
+
+class SuggestNotes(Interactor[SuggestNotesInputDTO, NoteSuggestionsDTO]):
+    """
+    Search-as-you-type over the titles of the user notes.
+
+    Returns at most LIMIT nearest titles. Results are cached per user for
+    a short time, so new notes may be suggested a bit later.
+    """
+
+    LIMIT = 8
+
+    def __init__(
+        self,
+        note_repository: NoteRepository,
+        id_provider: IdProvider,
+        suggestion_cache: SuggestionCache,
+    ):
+        self.note_repository = note_repository
+        self.id_provider = id_provider
+        self.suggestion_cache = suggestion_cache
+
+    async def __call__(self, data: SuggestNotesInputDTO) -> NoteSuggestionsDTO:
+        user_id: UserId = await self.id_provider.get_user_id()
+
+        query = normalize_query(data.query)
+
+        if not query:
+            return NoteSuggestionsDTO(notes=[])
+
+        notes = self.suggestion_cache.get(user_id, query)
+
+        if notes is None:
+            notes = await self.note_repository.suggest(user_id, query, self.LIMIT)
+            self.suggestion_cache.put(user_id, query, notes)
+
+        return NoteSuggestionsDTO(notes=notes)
@@ -9,6 +9,7 @@ from zametka.notes.domain.value_objects.note.note_created_at import (
 from zametka.notes.domain.value_objects.note.note_id import NoteId
 from zametka.notes.domain.value_objects.note.note_text import NoteText
 from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.domain.value_objects.note.note_version import NoteVersion
 from zametka.notes.domain.value_objects.user.user_id import UserId
 
 
@@ -51,7 +52,7 @@ class Note:
 
 
 class DBNote(Note):
-    __slots__ = ("note_id",)
+    __slots__ = ("note_id", "version")
 
     def __init__(
         self,
@@ -60,6 +61,7 @@ class DBNote(Note):
         note_id: NoteId,
         text: NoteText | None = None,
         created_at: NoteCreatedAt | None = None,
+        version: NoteVersion | None = None,
     ) -> None:
         super().__init__(
             title=title,
@@ -68,6 +70,7 @@ class DBNote(Note):
             created_at=created_at,
         )
         self.note_id = note_id
+        self.version = version or NoteVersion(1)
 
     def merge(self, other: Note) -> DBNote:
         merged = super().merge(other)
@@ -77,6 +80,7 @@ class DBNote(Note):
             note_id=self.note_id,
             text=merged.text,
             created_at=merged.created_at,
+            version=self.version,
         )
 
     def __eq__(self, other: DBNote | Any) -> bool:
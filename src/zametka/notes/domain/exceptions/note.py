@@ -13,9 +13,29 @@ class NoteAccessDeniedError(DomainError):
     pass
 
 
+class NoteVersionConflictError(DomainError):
+    pass
+
+
 class InvalidNoteTextError(NoteDataError):
     pass
 
 
 class InvalidNoteTitleError(NoteDataError):
     pass
+
+
+class InvalidNoteCursorError(NoteDataError):
+    pass
+
+
+class TooManyNoteOperationsError(NoteDataError):
+    pass
+
+
+class NotesNotSavedError(NoteDataError):
+    pass
+
+
+class NoteQuotaExceededError(DomainError):
+    pass
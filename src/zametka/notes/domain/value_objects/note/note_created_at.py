@@ -4,6 +4,6 @@ from datetime import datetime
 from zametka.notes.domain.common.value_objects.base import ValueObject
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NoteCreatedAt(ValueObject[datetime]):
     value: datetime
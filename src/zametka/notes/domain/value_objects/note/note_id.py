@@ -3,6 +3,6 @@ from dataclasses import dataclass
 from zametka.notes.domain.common.value_objects.base import ValueObject
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NoteId(ValueObject[int]):
     value: int
@@ -4,7 +4,7 @@ from zametka.notes.domain.common.value_objects.base import ValueObject
 from zametka.notes.domain.exceptions.note import InvalidNoteTextError
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NoteText(ValueObject[str]):
     value: str
 
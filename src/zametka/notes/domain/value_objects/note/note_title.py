@@ -4,7 +4,7 @@ from zametka.notes.domain.common.value_objects.base import ValueObject
 from zametka.notes.domain.exceptions.note import InvalidNoteTitleError
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NoteTitle(ValueObject[str]):
     value: str
 
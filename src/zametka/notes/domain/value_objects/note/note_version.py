@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+from zametka.notes.domain.common.value_objects.base import ValueObject
+
+
+@dataclass(frozen=True, slots=True)
+class NoteVersion(ValueObject[int]):
+    value: int
@@ -7,7 +7,7 @@ from uuid import UUID
 from zametka.notes.domain.common.value_objects.base import ValueObject
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserId(ValueObject[UUID]):
     value: UUID
 
@@ -4,7 +4,7 @@ from datetime import date, datetime
 from zametka.notes.domain.common.value_objects.base import ValueObject
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserJoinedAt(ValueObject[datetime]):
     value: datetime
 
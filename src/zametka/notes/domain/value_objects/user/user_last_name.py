@@ -5,7 +5,7 @@ from zametka.notes.domain.common.value_objects.base import ValueObject
 from zametka.notes.domain.exceptions.user import InvalidUserLastNameError
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserLastName(ValueObject[str]):
     value: str
 
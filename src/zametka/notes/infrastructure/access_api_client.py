@@ -1,20 +1,20 @@
-
-import aiohttp
+from uuid import UUID
 
 from zametka.notes.domain.exceptions.user import IsNotAuthorizedError
 from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.access_transport import AccessTransport
 
 
 class AccessAPIClient:
     def __init__(
         self,
         access_token: str,
-        session: aiohttp.ClientSession,
+        transport: AccessTransport,
         csrf_token: str | None = None,
     ) -> None:
         self.access_token = access_token
         self.csrf_token = csrf_token
-        self.session = session
+        self.transport = transport
 
     def get_access_cookies(self) -> dict[str, str | None]:
         return {
@@ -23,21 +23,21 @@ class AccessAPIClient:
         }
 
     async def get_identity(self) -> UserId:
-        async with self.session.get(
-            "http://access_service/me/", cookies=self.get_access_cookies(),
-        ) as response:
-            json = await response.json()
+        status, json = await self.transport.get(
+            "/me/", cookies=self.get_access_cookies(),
+        )
 
-            if response.status == 200:
-                return UserId(json.with_id("identity_id"))
-            else:
-                raise IsNotAuthorizedError()
+        if status == 200:
+            return UserId(UUID(json["identity_id"]))
+        else:
+            raise IsNotAuthorizedError()
 
     async def ensure_can_edit(self, headers: dict[str, str | None]) -> None:
-        async with self.session.get(
-            "http://access_service/ensure-can-edit/",
+        status, _ = await self.transport.get(
+            "/ensure-can-edit/",
             headers=headers,
             cookies=self.get_access_cookies(),
-        ) as response:
-            if response.status != 200:
-                raise IsNotAuthorizedError()
+        )
+
+        if status != 200:
+            raise IsNotAuthorizedError()
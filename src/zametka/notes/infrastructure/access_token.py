@@ -0,0 +1,66 @@
+import hmac
+from typing import Any
+from uuid import UUID
+
+import jwt
+
+from zametka.notes.domain.exceptions.user import IsNotAuthorizedError
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.config_loader import AccessTokenConfig
+
+
+class AccessTokenVerifier:
+    """
+    Checks the tokens of the access service without asking it.
+
+    An access token is a JWT of {"sub": {"uid", "token_id"}, "exp"}, its
+    CSRF token is a JWT with the token_id as sub. Deactivated users keep
+    access until their token expires.
+    """
+
+    def __init__(self, config: AccessTokenConfig):
+        self._key = config.key
+        self._algorithms = [config.algorithm]
+
+    def _decode(self, token: str) -> dict[str, Any]:
+        try:
+            return jwt.decode(token, self._key, algorithms=self._algorithms)
+        except jwt.PyJWTError as exc:
+            raise IsNotAuthorizedError() from exc
+
+    def _get_subject(self, access_token: str) -> tuple[UUID, UUID]:
+        """The user and the token ids"""
+
+        payload = self._decode(access_token)
+
+        try:
+            sub = payload["sub"]
+            return UUID(sub["uid"]), UUID(sub["token_id"])
+        except (KeyError, ValueError, TypeError) as exc:
+            raise IsNotAuthorizedError() from exc
+
+    def get_identity(self, access_token: str) -> UserId:
+        uid, _ = self._get_subject(access_token)
+
+        return UserId(uid)
+
+    def ensure_can_edit(
+        self, access_token: str, csrf_token: str | None, csrf_header: str | None,
+    ) -> None:
+        """Double submit, the CSRF cookie is the header and of the access token"""
+
+        if not csrf_token or not csrf_header:
+            raise IsNotAuthorizedError()
+
+        if not hmac.compare_digest(csrf_token, csrf_header):
+            raise IsNotAuthorizedError()
+
+        try:
+            csrf_session_id = UUID(self._decode(csrf_token)["sub"])
+        except (KeyError, ValueError, TypeError) as exc:
+            raise IsNotAuthorizedError() from exc
+
+        _, token_id = self._get_subject(access_token)
+
+        if csrf_session_id != token_id:
+            raise IsNotAuthorizedError()
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import partial
+from types import SimpleNamespace
+from typing import Any, TypeVar
+
+from aiohttp import (
+    BaseConnector,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionQueuedEndParams,
+    TraceConnectionQueuedStartParams,
+    UnixConnector,
+)
+
+from zametka.notes.infrastructure.config_loader import AccessClientConfig
+
+T = TypeVar("T")
+
+
+@dataclass
+class AccessPoolStats:
+    in_use: int = 0  # requests holding a connection
+    queued: int = 0  # requests waiting for a free connection
+    requests: int = 0
+    timeouts: int = 0
+    hedged: int = 0
+
+
+def pool_trace_config(stats: AccessPoolStats) -> TraceConfig:
+    """Counts the requests waiting for and holding the pool connections"""
+
+    trace_config = TraceConfig()
+
+    async def on_queued_start(
+        _session: ClientSession,
+        ctx: SimpleNamespace,
+        _params: TraceConnectionQueuedStartParams,
+    ) -> None:
+        ctx.queued = True
+        stats.queued += 1
+
+    async def on_queued_end(
+        _session: ClientSession,
+        ctx: SimpleNamespace,
+        _params: TraceConnectionQueuedEndParams,
+    ) -> None:
+        ctx.queued = False
+        stats.queued -= 1
+
+    async def on_acquired(
+        _session: ClientSession, ctx: SimpleNamespace, _params: Any,
+    ) -> None:
+        ctx.acquired = True
+        stats.in_use += 1
+
+    async def on_finished(
+        _session: ClientSession, ctx: SimpleNamespace, _params: Any,
+    ) -> None:
+        stats.requests += 1
+
+        # a waiter that timed out or was cancelled gets no queued end
+        if getattr(ctx, "queued", False):
+            ctx.queued = False
+            stats.queued -= 1
+
+        if getattr(ctx, "acquired", False):
+            ctx.acquired = False
+            stats.in_use -= 1
+
+    trace_config.on_connection_queued_start.append(on_queued_start)
+    trace_config.on_connection_queued_end.append(on_queued_end)
+    trace_config.on_connection_create_end.append(on_acquired)
+    trace_config.on_connection_reuseconn.append(on_acquired)
+    trace_config.on_request_end.append(on_finished)
+    trace_config.on_request_exception.append(on_finished)
+
+    return trace_config
+
+
+class AccessTransport:
+    """
+    Pooled HTTP transport to the access service.
+
+    Only idempotent GETs are sent, so a slow one may be hedged: sent once
+    more after the hedge percentile of the recent latencies, the first
+    answer wins and the other request is cancelled.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        config: AccessClientConfig,
+        stats: AccessPoolStats | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.session = session
+        self.url = config.url
+        self.stats = stats or AccessPoolStats()
+
+        self._hedge_percentile = config.hedge_percentile
+        self._hedge_min_samples = config.hedge_min_samples
+        self._latencies: deque[float] = deque(maxlen=config.hedge_window)
+        self._clock = clock
+
+    def hedge_delay(self) -> float | None:
+        """None until there are enough latencies or when hedging is off"""
+
+        if self._hedge_percentile is None:
+            return None
+
+        if len(self._latencies) < self._hedge_min_samples:
+            return None
+
+        latencies = sorted(self._latencies)
+
+        return latencies[int(self._hedge_percentile * (len(latencies) - 1))]
+
+    async def get(
+        self,
+        path: str,
+        cookies: dict[str, str | None],
+        headers: dict[str, str | None] | None = None,
+    ) -> tuple[int, Any]:
+        """Status and JSON of a successful response, None for the others"""
+
+        request = partial(self._get, path, cookies, headers)
+        delay = self.hedge_delay()
+
+        try:
+            if delay is None:
+                return await request()
+
+            return await self._hedged(request, delay)
+        except TimeoutError:
+            self.stats.timeouts += 1
+            raise
+
+    async def _get(
+        self,
+        path: str,
+        cookies: dict[str, str | None],
+        headers: dict[str, str | None] | None,
+    ) -> tuple[int, Any]:
+        started = self._clock()
+
+        async with self.session.get(
+            self.url + path, cookies=cookies, headers=headers,
+        ) as response:
+            json = await response.json() if response.status == 200 else None
+
+        self._latencies.append(self._clock() - started)
+
+        return response.status, json
+
+    async def _hedged(self, request: Callable[[], Awaitable[T]], delay: float) -> T:
+        pending = {asyncio.ensure_future(request())}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+
+            if not done:
+                self.stats.hedged += 1
+                pending.add(asyncio.ensure_future(request()))
+
+            while True:
+                if not done:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED,
+                    )
+
+                answered = [task for task in done if task.exception() is None]
+
+                if answered or not pending:
+                    return (answered or list(done))[0].result()
+
+                done = set()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+@asynccontextmanager
+async def create_access_transport(
+    config: AccessClientConfig,
+) -> AsyncIterator[AccessTransport]:
+    """A session with a bounded keep-alive pool and timeouts, closed on exit"""
+
+    connector: BaseConnector
+
+    if config.unix_socket:
+        connector = UnixConnector(
+            path=config.unix_socket,
+            limit=config.limit,
+            limit_per_host=config.limit_per_host,
+            keepalive_timeout=config.keepalive_timeout_seconds,
+        )
+    else:
+        connector = TCPConnector(
+            limit=config.limit,
+            limit_per_host=config.limit_per_host,
+            keepalive_timeout=config.keepalive_timeout_seconds,
+            ttl_dns_cache=config.dns_cache_ttl_seconds,
+        )
+
+    stats = AccessPoolStats()
+    timeout = ClientTimeout(
+        total=config.total_timeout_seconds,
+        connect=config.connect_timeout_seconds,
+        sock_read=config.read_timeout_seconds,
+    )
+
+    async with ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[pool_trace_config(stats)],
+    ) as session:
+        try:
+            yield AccessTransport(session, config, stats)
+        finally:
+            logging.info("Access service pool: %s", stats)
@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
+
+import jwt
+
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.cache.lru import CacheStats, TTLLRUCache
+from zametka.notes.infrastructure.config_loader import IdentityCacheConfig
+
+
+def token_key(access_token: str) -> bytes:
+    """The tokens themselves are not kept in memory"""
+
+    return hashlib.sha256(access_token.encode()).digest()
+
+
+def token_expires_at(access_token: str) -> float | None:
+    """
+    The exp of the token, not verified.
+
+    It only bounds the TTL, the identity itself comes from the access service.
+    """
+
+    try:
+        payload = jwt.decode(access_token, options={"verify_signature": False})
+        return float(payload["exp"])
+    except (jwt.PyJWTError, KeyError, ValueError, TypeError):
+        return None
+
+
+class IdentityCache:
+    """
+    Process-local cache of the identities of the access tokens.
+
+    An entry lives at most until its token expires. Concurrent misses of one
+    token share one request to the access service, a failed request is not
+    cached. stats show the hit ratio, upstream_calls_per_second the load
+    left on the access service.
+    """
+
+    def __init__(
+        self,
+        config: IdentityCacheConfig,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._cache: TTLLRUCache[bytes, UserId] = TTLLRUCache(
+            max_entries=config.max_entries,
+            ttl_seconds=config.ttl_seconds,
+            clock=clock,
+        )
+        self._ttl_seconds = config.ttl_seconds
+        self._clock = clock
+        self._started_at = clock()
+        self._in_flight: dict[bytes, asyncio.Task[UserId]] = {}
+        self.upstream_calls = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    @property
+    def upstream_calls_per_second(self) -> float:
+        elapsed = self._clock() - self._started_at
+
+        if elapsed <= 0:
+            return 0.0
+
+        return self.upstream_calls / elapsed
+
+    async def get_identity(
+        self, access_token: str, fetch: Callable[[], Awaitable[UserId]],
+    ) -> UserId:
+        key = token_key(access_token)
+        user_id = self._cache.get(key)
+
+        if user_id is not None:
+            return user_id
+
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, access_token, fetch))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+
+        # a cancelled request does not cancel the others waiting for it
+        return await asyncio.shield(task)
+
+    def _done(self, key: bytes, task: asyncio.Task[UserId]) -> None:
+        self._in_flight.pop(key, None)
+
+        if not task.cancelled():
+            task.exception()  # retrieved even if every waiter was cancelled
+
+    async def _fetch(
+        self,
+        key: bytes,
+        access_token: str,
+        fetch: Callable[[], Awaitable[UserId]],
+    ) -> UserId:
+        self.upstream_calls += 1
+        user_id = await fetch()
+
+        ttl_seconds = self._ttl_seconds
+        expires_at = token_expires_at(access_token)
+
+        if expires_at is not None:
+            ttl_seconds = min(ttl_seconds, expires_at - self._clock())
+
+        if ttl_seconds > 0:
+            self._cache.put(key, user_id, ttl_seconds)
+
+        return user_id
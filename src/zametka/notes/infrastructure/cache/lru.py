@@ -0,0 +1,119 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+
+        if not lookups:
+            return 0.0
+
+        return self.hits / lookups
+
+
+@dataclass(frozen=True)
+class _Entry(Generic[V]):
+    value: V
+    expires_at: float
+    size: int
+
+
+class TTLLRUCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache with per-entry TTL.
+
+    Evicts least recently used entries when there are more than max_entries
+    of them or when their total size exceeds max_bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: int | None = None,
+        sizeof: Callable[[V], int] = lambda _: 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+
+    def get(
+        self, key: K, is_valid: Callable[[V], bool] | None = None,
+    ) -> V | None:
+        """An expired entry or one that is not is_valid is removed and missed"""
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.expires_at <= self._clock() or (
+            is_valid is not None and not is_valid(entry.value)
+        ):
+            self._remove(key)
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+
+        return entry.value
+
+    def put(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        size = self._sizeof(value)
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+
+        self._remove(key)
+        self._entries[key] = _Entry(value, self._clock() + ttl_seconds, size)
+        self.stats.size_bytes += size
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.stats.size_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+        self.stats.entries = len(self._entries)
+
+    def invalidate(self, key: K) -> None:
+        self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats.entries = 0
+        self.stats.size_bytes = 0
+
+    def _remove(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self.stats.size_bytes -= entry.size
+            self.stats.entries = len(self._entries)
@@ -0,0 +1,65 @@
+import sys
+from uuid import UUID
+
+from zametka.notes.application.common.note_cache import NoteCache
+from zametka.notes.domain.entities.note import DBNote
+from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.cache.lru import CacheStats, TTLLRUCache
+from zametka.notes.infrastructure.config_loader import NoteCacheConfig
+
+
+# the entity, its value objects, the key and the LRU bookkeeping of an entry,
+# about 800 bytes measured with tracemalloc on CPython 3.11
+NOTE_ENTRY_OVERHEAD_BYTES = 1024
+
+
+def note_sizeof(entry: tuple[int, DBNote]) -> int:
+    _, note = entry
+    size = NOTE_ENTRY_OVERHEAD_BYTES + sys.getsizeof(note.title.to_raw())
+
+    if note.text:
+        size += sys.getsizeof(note.text.to_raw())
+
+    return size
+
+
+class LRUNoteCache(NoteCache):
+    """
+    Process-local cache of hydrated notes.
+
+    An entry is replaced by the next put of the note, so a note takes
+    one entry whatever the generation. An entry of an older generation
+    is dropped and counted as a miss.
+    """
+
+    def __init__(self, config: NoteCacheConfig):
+        self._cache: TTLLRUCache[tuple[UUID, int], tuple[int, DBNote]] = (
+            TTLLRUCache(
+                max_entries=config.max_entries,
+                ttl_seconds=config.ttl_seconds,
+                max_bytes=config.max_bytes,
+                sizeof=note_sizeof,
+            )
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def get(
+        self, author_id: UserId, note_id: NoteId, generation: int,
+    ) -> DBNote | None:
+        entry = self._cache.get(
+            (author_id.to_raw(), note_id.to_raw()),
+            is_valid=lambda entry: entry[0] == generation,
+        )
+
+        return entry[1] if entry else None
+
+    def put(self, note: DBNote, generation: int) -> None:
+        key = (note.author_id.to_raw(), note.note_id.to_raw())
+        self._cache.put(key, (generation, note))
+
+    def invalidate(self, author_id: UserId, note_id: NoteId) -> None:
+        self._cache.invalidate((author_id.to_raw(), note_id.to_raw()))
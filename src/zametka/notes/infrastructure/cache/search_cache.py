@@ -0,0 +1,59 @@
+import sys
+from collections.abc import Hashable
+
+from zametka.notes.application.common.search_cache import SearchCache
+from zametka.notes.application.note.dto import (
+    ListNoteDetailsDTO,
+    ListNotesDTO,
+    ListNotesInputDTO,
+)
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.cache.lru import CacheStats, TTLLRUCache
+from zametka.notes.infrastructure.config_loader import SearchCacheConfig
+
+
+def list_notes_sizeof(notes: ListNotesDTO) -> int:
+    size = sys.getsizeof(notes.notes)
+
+    for note in notes.notes:
+        size += sys.getsizeof(note) + sys.getsizeof(note.title)
+
+        if isinstance(note, ListNoteDetailsDTO) and note.preview:
+            size += sys.getsizeof(note.preview)
+
+    return size
+
+
+class LRUSearchCache(SearchCache):
+    """
+    Process-local cache of search pages.
+
+    Pages of old generations are never looked up again and leave
+    by LRU order or TTL, stats show the hit ratio and the memory used.
+    """
+
+    def __init__(self, config: SearchCacheConfig):
+        self._cache: TTLLRUCache[Hashable, ListNotesDTO] = TTLLRUCache(
+            max_entries=config.max_entries,
+            ttl_seconds=config.ttl_seconds,
+            max_bytes=config.max_bytes,
+            sizeof=list_notes_sizeof,
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def get(
+        self, user_id: UserId, generation: int, data: ListNotesInputDTO,
+    ) -> ListNotesDTO | None:
+        return self._cache.get((user_id.to_raw(), generation, data))
+
+    def put(
+        self,
+        user_id: UserId,
+        generation: int,
+        data: ListNotesInputDTO,
+        notes: ListNotesDTO,
+    ) -> None:
+        self._cache.put((user_id.to_raw(), generation, data), notes)
@@ -0,0 +1,32 @@
+from uuid import UUID
+
+from zametka.notes.application.common.suggestion_cache import SuggestionCache
+from zametka.notes.application.note.dto import ListNoteDTO
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.cache.lru import CacheStats, TTLLRUCache
+from zametka.notes.infrastructure.config_loader import SuggestionCacheConfig
+
+
+class LRUSuggestionCache(SuggestionCache):
+    """
+    Process-local cache of title suggestions.
+
+    Entries are not invalidated on writes, the short TTL bounds how long
+    a new or renamed note is not suggested.
+    """
+
+    def __init__(self, config: SuggestionCacheConfig):
+        self._cache: TTLLRUCache[tuple[UUID, str], list[ListNoteDTO]] = TTLLRUCache(
+            max_entries=config.max_entries,
+            ttl_seconds=config.ttl_seconds,
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def get(self, user_id: UserId, query: str) -> list[ListNoteDTO] | None:
+        return self._cache.get((user_id.to_raw(), query))
+
+    def put(self, user_id: UserId, query: str, notes: list[ListNoteDTO]) -> None:
+        self._cache.put((user_id.to_raw(), query), notes)
@@ -1,6 +1,7 @@
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from typing import TypeVar
 
 
 @dataclass
@@ -20,12 +21,30 @@ class BaseDB:
 class DB(BaseDB):
     """App database config"""
 
+    application_name: str = "zametka-notes"
+    statement_timeout_ms: int = 30000
+    jit: bool = False
+    trgm_similarity_threshold: float = 0.2
+
+    def get_server_settings(self) -> dict[str, str]:
+        """Session settings applied once to every new connection"""
+
+        return {
+            "application_name": self.application_name,
+            "statement_timeout": str(self.statement_timeout_ms),
+            "jit": "on" if self.jit else "off",
+            "pg_trgm.similarity_threshold": str(self.trgm_similarity_threshold),
+        }
+
 
 @dataclass
 class AlembicDB(BaseDB):
     """Alembic database config"""
 
 
+DBT = TypeVar("DBT", bound=BaseDB)
+
+
 @dataclass
 class CORSSettings:
     """CORS Allowed Domains Settings"""
@@ -33,12 +52,190 @@ class CORSSettings:
     frontend_url: str
 
 
+@dataclass
+class AccessTokenConfig:
+    """
+    Verification of the access service tokens in the notes service.
+
+    The key is the one the access service signs with, or its public key.
+    """
+
+    key: str
+    algorithm: str = "HS256"
+
+
+@dataclass
+class AccessClientConfig:
+    """
+    Connections of the notes service to the access service.
+
+    With unix_socket set the requests go through it, the url is kept for
+    the Host header. With hedge_percentile set a GET slower than that
+    percentile of the last hedge_window ones is sent again.
+    """
+
+    url: str = "http://access_service"
+    unix_socket: str | None = None
+    limit: int = 100
+    limit_per_host: int = 100
+    connect_timeout_seconds: float = 1
+    read_timeout_seconds: float = 2
+    total_timeout_seconds: float = 3
+    keepalive_timeout_seconds: float = 30
+    dns_cache_ttl_seconds: int = 60
+    hedge_percentile: float | None = None
+    hedge_window: int = 200
+    hedge_min_samples: int = 20
+
+
+@dataclass
+class NoteCacheConfig:
+    """Read-through note cache settings"""
+
+    max_entries: int = 10000
+    max_bytes: int = 64 * 1024 * 1024
+    ttl_seconds: float = 60
+
+
+@dataclass
+class SearchCacheConfig:
+    """Per-user cache of the search pages, keyed by the notes generation"""
+
+    max_entries: int = 10000
+    max_bytes: int = 32 * 1024 * 1024
+    ttl_seconds: float = 300
+
+
+@dataclass
+class SuggestionCacheConfig:
+    """Per-user cache of the title suggestions"""
+
+    max_entries: int = 10000
+    ttl_seconds: float = 5
+
+
+@dataclass
+class IdentityCacheConfig:
+    """Identities of the access tokens, an entry never outlives its token"""
+
+    max_entries: int = 10000
+    ttl_seconds: float = 60
+
+
+@dataclass
+class NoteStorageConfig:
+    """
+    Storage of the note texts.
+
+    Texts over compress_threshold_bytes are kept Brotli-compressed, None turns it off.
+    Compressed texts are not covered by the full-text search.
+    With asyncpg_reads the hot reads skip SQLAlchemy, see AsyncpgNoteRepository.
+    """
+
+    compress_threshold_bytes: int | None = None
+    brotli_quality: int = 5
+    asyncpg_reads: bool = False
+
+
+@dataclass
+class NoteQuotaConfig:
+    """Limits per author, checked against the counters on writes, None is none"""
+
+    max_notes: int | None = None
+    max_text_bytes: int | None = None
+
+
+@dataclass
+class ShardingConfig:
+    """
+    The notes databases, an author lives on one of them.
+
+    The first one also keeps the directory of the moved authors,
+    lookups in it are cached for directory_ttl_seconds.
+    """
+
+    shards: list[DB]
+    directory_ttl_seconds: float = 30
+
+
+@dataclass
+class ReplicaConfig:
+    """
+    Read replicas of the shards, replicas[i] belong to the shard i.
+
+    Read-only requests go to a replica that lags at most max_lag_seconds,
+    unless the user has written within sticky_seconds to this process.
+    Other processes wait for the replica to replay such a write.
+    """
+
+    replicas: list[list[DB]]
+    max_lag_seconds: float = 1
+    sticky_seconds: float = 5
+    check_interval_seconds: float = 1
+
+
 @dataclass
 class Settings:
     """App settings"""
 
     db: DB
+    sharding: ShardingConfig
+    replicas: ReplicaConfig
     cors: CORSSettings
+    access_token: AccessTokenConfig | None
+    access_client: AccessClientConfig
+    note_cache: NoteCacheConfig
+    note_storage: NoteStorageConfig
+    note_quota: NoteQuotaConfig
+    search_cache: SearchCacheConfig
+    suggestion_cache: SuggestionCacheConfig
+    identity_cache: IdentityCacheConfig
+
+
+def load_shards(db: DBT) -> list[DBT]:
+    """
+    NOTES_SHARDS is a comma-separated list of [host/]database, db is the first.
+
+    Shards share the credentials, databases without a host are on DB_HOST.
+    """
+
+    shards = [db]
+
+    for shard in os.environ.get("NOTES_SHARDS", "").split(","):
+        if not shard.strip():
+            continue
+
+        host, _, db_name = shard.strip().rpartition("/")
+        shards.append(replace(db, host=host or db.host, db_name=db_name))
+
+    return shards
+
+
+def load_replicas(shards: list[DB]) -> list[list[DB]]:
+    """
+    NOTES_REPLICAS lists [host/]database of the shards in order, separated by ';'.
+
+    Replicas of one shard are comma-separated, the database defaults to the
+    one of the shard, e.g. "replica-1,replica-2;replica-3/notes_2".
+    """
+
+    replicas: list[list[DB]] = [[] for _ in shards]
+    groups = os.environ.get("NOTES_REPLICAS", "").split(";")
+
+    if len(groups) > len(shards):
+        raise ValueError("NOTES_REPLICAS lists more groups than there are shards")
+
+    for shard, (db, group) in enumerate(zip(shards, groups)):
+        for replica in group.split(","):
+            if not replica.strip():
+                continue
+
+            host, _, db_name = replica.strip().partition("/")
+            replicas[shard].append(
+                replace(db, host=host, db_name=db_name or db.db_name),
+            )
+
+    return replicas
 
 
 def load_settings() -> Settings:
@@ -49,24 +246,120 @@ def load_settings() -> Settings:
         host=os.environ["DB_HOST"],
         password=os.environ["POSTGRES_PASSWORD"],
         user=os.environ["POSTGRES_USER"],
+        statement_timeout_ms=int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", 30000)),
+        trgm_similarity_threshold=float(
+            os.environ.get("NOTES_TRGM_SIMILARITY_THRESHOLD", 0.2),
+        ),
     )
 
     cors = CORSSettings(frontend_url=os.environ["FRONTEND"])
 
+    jwt_key = os.environ.get("NOTES_JWT_KEY")
+    access_token = (
+        AccessTokenConfig(
+            key=jwt_key, algorithm=os.environ.get("NOTES_JWT_ALGORITHM", "HS256"),
+        )
+        if jwt_key
+        else None
+    )
+
+    unix_socket = os.environ.get("NOTES_ACCESS_UNIX_SOCKET")
+    hedge_percentile = os.environ.get("NOTES_ACCESS_HEDGE_PERCENTILE")
+    access_client = AccessClientConfig(
+        url=os.environ.get("NOTES_ACCESS_URL", "http://access_service"),
+        unix_socket=unix_socket or None,
+        limit=int(os.environ.get("NOTES_ACCESS_POOL_LIMIT", 100)),
+        limit_per_host=int(
+            os.environ.get("NOTES_ACCESS_POOL_LIMIT_PER_HOST", 100),
+        ),
+        connect_timeout_seconds=float(
+            os.environ.get("NOTES_ACCESS_CONNECT_TIMEOUT_SECONDS", 1),
+        ),
+        read_timeout_seconds=float(
+            os.environ.get("NOTES_ACCESS_READ_TIMEOUT_SECONDS", 2),
+        ),
+        total_timeout_seconds=float(
+            os.environ.get("NOTES_ACCESS_TOTAL_TIMEOUT_SECONDS", 3),
+        ),
+        keepalive_timeout_seconds=float(
+            os.environ.get("NOTES_ACCESS_KEEPALIVE_SECONDS", 30),
+        ),
+        hedge_percentile=float(hedge_percentile) if hedge_percentile else None,
+    )
+
+    sharding = ShardingConfig(
+        shards=load_shards(db),
+        directory_ttl_seconds=float(
+            os.environ.get("NOTES_SHARD_DIRECTORY_TTL_SECONDS", 30),
+        ),
+    )
+
+    replicas = ReplicaConfig(
+        replicas=load_replicas(sharding.shards),
+        max_lag_seconds=float(os.environ.get("NOTES_REPLICA_MAX_LAG_SECONDS", 1)),
+        sticky_seconds=float(os.environ.get("NOTES_REPLICA_STICKY_SECONDS", 5)),
+    )
+
+    note_cache = NoteCacheConfig(
+        max_bytes=int(os.environ.get("NOTES_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+        ttl_seconds=float(os.environ.get("NOTES_CACHE_TTL_SECONDS", 60)),
+    )
+
+    search_cache = SearchCacheConfig(
+        max_bytes=int(os.environ.get("NOTES_SEARCH_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+        ttl_seconds=float(os.environ.get("NOTES_SEARCH_CACHE_TTL_SECONDS", 300)),
+    )
+
+    suggestion_cache = SuggestionCacheConfig(
+        ttl_seconds=float(os.environ.get("NOTES_SUGGEST_CACHE_TTL_SECONDS", 5)),
+    )
+
+    identity_cache = IdentityCacheConfig(
+        ttl_seconds=float(os.environ.get("NOTES_IDENTITY_CACHE_TTL_SECONDS", 60)),
+    )
+
+    compress_threshold_bytes = os.environ.get("NOTES_COMPRESS_THRESHOLD_BYTES")
+    note_storage = NoteStorageConfig(
+        compress_threshold_bytes=(
+            int(compress_threshold_bytes) if compress_threshold_bytes else None
+        ),
+        brotli_quality=int(os.environ.get("NOTES_BROTLI_QUALITY", 5)),
+        asyncpg_reads=os.environ.get("NOTES_ASYNCPG_READS", "") == "1",
+    )
+
+    max_notes = os.environ.get("NOTES_MAX_NOTES")
+    max_text_bytes = os.environ.get("NOTES_MAX_TEXT_BYTES")
+    note_quota = NoteQuotaConfig(
+        max_notes=int(max_notes) if max_notes else None,
+        max_text_bytes=int(max_text_bytes) if max_text_bytes else None,
+    )
+
     logging.info("Notes config was loaded")
 
     return Settings(
         db=db,
+        sharding=sharding,
+        replicas=replicas,
         cors=cors,
+        access_token=access_token,
+        access_client=access_client,
+        note_cache=note_cache,
+        note_storage=note_storage,
+        note_quota=note_quota,
+        search_cache=search_cache,
+        suggestion_cache=suggestion_cache,
+        identity_cache=identity_cache,
     )
 
 
-def load_alembic_settings() -> AlembicDB:
-    """Get alembic settings"""
+def load_alembic_settings() -> list[AlembicDB]:
+    """Get alembic settings, one per shard"""
 
-    return AlembicDB(
+    db = AlembicDB(
         db_name=os.environ["NOTES_POSTGRES_DB"],
         host=os.environ["DB_HOST"],
         password=os.environ["POSTGRES_PASSWORD"],
         user=os.environ["POSTGRES_USER"],
     )
+
+    return load_shards(db)
@@ -32,10 +32,10 @@ target_metadata = Base.metadata
 # ... etc.
 
 
-def get_url() -> str:
-    settings = load_alembic_settings()
+def get_urls() -> list[str]:
+    """Every shard has the same schema"""
 
-    return settings.get_connection_url()
+    return [settings.get_connection_url() for settings in load_alembic_settings()]
 
 
 def run_migrations_offline() -> None:
@@ -50,7 +50,7 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = get_url()
+    url = get_urls()[0]
     context.configure(
         url=url,
         target_metadata=target_metadata,
@@ -76,18 +76,20 @@ async def run_async_migrations() -> None:
     """
 
     configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = get_url()  # type:ignore
 
-    connectable = async_engine_from_config(
-        configuration,  # type:ignore
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    for url in get_urls():
+        configuration["sqlalchemy.url"] = url  # type:ignore
+
+        connectable = async_engine_from_config(
+            configuration,  # type:ignore
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
+        )
 
-    async with connectable.connect() as connection:
-        await connection.run_sync(do_run_migrations)
+        async with connectable.connect() as connection:
+            await connection.run_sync(do_run_migrations)
 
-    await connectable.dispose()
+        await connectable.dispose()
 
 
 def run_migrations_online() -> None:
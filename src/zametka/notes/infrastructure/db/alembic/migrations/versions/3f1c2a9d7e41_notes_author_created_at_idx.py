@@ -0,0 +1,31 @@
+"""notes author created_at index
+
+Revision ID: 3f1c2a9d7e41
+Revises: 5b9db61f86b5
+Create Date: 2026-10-17 10:12:31.418204
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f1c2a9d7e41"
+down_revision = "5b9db61f86b5"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "notes_author_created_at_idx"
+
+
+def upgrade() -> None:
+    # covers keyset pagination of the notes list, so it is an index-only scan
+    op.create_index(
+        INDEX_NAME,
+        "notes",
+        ["author_id", "created_at", "note_id"],
+        postgresql_include=["title"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="notes")
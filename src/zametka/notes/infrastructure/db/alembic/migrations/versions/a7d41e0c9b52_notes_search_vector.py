@@ -0,0 +1,45 @@
+"""notes search vector
+
+Revision ID: a7d41e0c9b52
+Revises: 3f1c2a9d7e41
+Create Date: 2026-10-17 11:02:54.730913
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from zametka.notes.infrastructure.db.models.note import SEARCH_VECTOR_EXPRESSION
+
+# revision identifiers, used by Alembic.
+revision = "a7d41e0c9b52"
+down_revision = "3f1c2a9d7e41"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "notes_search_vector_idx"
+
+
+def upgrade() -> None:
+    # adding a stored generated column rewrites the whole table
+    op.add_column(
+        "notes",
+        sa.Column(
+            "search_vector",
+            TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        INDEX_NAME,
+        "notes",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="notes")
+    op.drop_column("notes", "search_vector")
@@ -0,0 +1,34 @@
+"""notes title gist index
+
+Revision ID: b4e8a2f6c1d9
+Revises: f7b3d9e2a6c4
+Create Date: 2026-10-17 19:12:45.207390
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b4e8a2f6c1d9"
+down_revision = "f7b3d9e2a6c4"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "notes_author_title_trgm_gist_idx"
+
+
+def upgrade() -> None:
+    # GiST opclasses for the scalar author_id
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    op.create_index(
+        INDEX_NAME,
+        "notes",
+        ["author_id", "title"],
+        postgresql_using="gist",
+        postgresql_ops={"title": "gist_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="notes")
@@ -0,0 +1,115 @@
+"""notes search vector of plain text
+
+Revision ID: b6f1c8e3d5a2
+Revises: e8b2d4f6a1c3
+Create Date: 2026-10-17 23:58:12.184206
+
+"""
+
+from uuid import UUID
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from zametka.notes.infrastructure.db.models.note import (
+    SEARCH_VECTOR_EXPRESSION,
+    search_vector,
+)
+from zametka.notes.infrastructure.repositories.text_codec import decode_text
+
+# revision identifiers, used by Alembic.
+revision = "b6f1c8e3d5a2"
+down_revision = "e8b2d4f6a1c3"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "notes_search_vector_idx"
+BATCH_SIZE = 1000
+
+notes = sa.table(
+    "notes",
+    sa.column("note_id", sa.Integer),
+    sa.column("author_id", sa.Uuid),
+    sa.column("title", sa.String),
+    sa.column("text_compressed", sa.LargeBinary),
+    sa.column("text_codec", sa.String),
+    sa.column("search_vector", TSVECTOR),
+)
+
+
+def upgrade() -> None:
+    # the stored vectors are kept, no table rewrite
+    op.execute("ALTER TABLE notes ALTER COLUMN search_vector DROP EXPRESSION")
+
+    # the generated vectors of the compressed texts miss the text
+    connection = op.get_bind()
+    connection.execute(sa.text("SET LOCAL zametka.moving = 'on'"))
+    last: tuple[int, UUID] | None = None
+
+    while True:
+        q = (
+            sa.select(
+                notes.c.note_id,
+                notes.c.author_id,
+                notes.c.title,
+                notes.c.text_compressed,
+                notes.c.text_codec,
+            )
+            .where(notes.c.text_codec.is_not(None))
+            .order_by(notes.c.note_id, notes.c.author_id)
+            .limit(BATCH_SIZE)
+        )
+
+        if last is not None:
+            after = sa.tuple_(notes.c.note_id, notes.c.author_id) > sa.tuple_(*last)
+            q = q.where(after)
+
+        rows = connection.execute(q).all()
+
+        if not rows:
+            break
+
+        connection.execute(
+            notes.update()
+            .where(notes.c.note_id == sa.bindparam("row_note_id"))
+            .where(notes.c.author_id == sa.bindparam("row_author_id"))
+            .values(
+                search_vector=search_vector(
+                    sa.bindparam("row_title", type_=sa.String),
+                    sa.bindparam("row_text", type_=sa.String),
+                ),
+            ),
+            [
+                {
+                    "row_note_id": row.note_id,
+                    "row_author_id": row.author_id,
+                    "row_title": row.title,
+                    "row_text": decode_text(None, row.text_compressed, row.text_codec),
+                }
+                for row in rows
+            ],
+        )
+
+        last = (rows[-1].note_id, rows[-1].author_id)
+
+
+def downgrade() -> None:
+    # adding a stored generated column rewrites the whole table
+    op.drop_index(INDEX_NAME, table_name="notes")
+    op.drop_column("notes", "search_vector")
+    op.add_column(
+        "notes",
+        sa.Column(
+            "search_vector",
+            TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        INDEX_NAME,
+        "notes",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
@@ -0,0 +1,32 @@
+"""notes text compression
+
+Revision ID: c2e8f5a1d3b7
+Revises: a7d41e0c9b52
+Create Date: 2026-10-17 14:21:08.402715
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c2e8f5a1d3b7"
+down_revision = "a7d41e0c9b52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # nullable columns without defaults, no table rewrite
+    op.add_column(
+        "notes", sa.Column("text_compressed", sa.LargeBinary(), nullable=True),
+    )
+    op.add_column(
+        "notes", sa.Column("text_codec", sa.String(length=16), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    # run `zametka notes compress --decompress` first, compressed texts are lost here
+    op.drop_column("notes", "text_codec")
+    op.drop_column("notes", "text_compressed")
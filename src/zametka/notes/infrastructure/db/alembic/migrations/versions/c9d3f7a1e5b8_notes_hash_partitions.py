@@ -0,0 +1,118 @@
+"""notes hash partitions
+
+Revision ID: c9d3f7a1e5b8
+Revises: b4e8a2f6c1d9
+Create Date: 2026-10-17 20:31:09.581342
+
+"""
+
+from alembic import op
+
+from zametka.notes.infrastructure.db.models.note import SEARCH_VECTOR_EXPRESSION
+
+# revision identifiers, used by Alembic.
+revision = "c9d3f7a1e5b8"
+down_revision = "b4e8a2f6c1d9"
+branch_labels = None
+depends_on = None
+
+# Copies the table under an exclusive lock, fine for small databases.
+# Large ones follow the online procedure of DEPLOYMENT.md and then
+# `alembic stamp` this revision.
+
+PARTITIONS = 16
+OLD_TABLE = "notes_unpartitioned"
+SEQUENCE_NAME = "notes_note_id_seq"
+
+COLUMNS = (
+    "note_id, title, text, text_compressed, text_codec, created_at, version, author_id"
+)
+
+CREATE_TABLE = f"""
+CREATE TABLE notes (
+    note_id INTEGER NOT NULL DEFAULT nextval('{SEQUENCE_NAME}'),
+    title VARCHAR(50) NOT NULL,
+    text VARCHAR(60000),
+    text_compressed BYTEA,
+    text_codec VARCHAR(16),
+    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    author_id UUID NOT NULL REFERENCES users (identity_id),
+    search_vector TSVECTOR GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED,
+    {{primary_key}}
+){{partition_by}}
+"""
+
+# created on the parent, so every partition gets its own copy
+INDEXES = (
+    "CREATE INDEX notes_author_created_at_idx "
+    "ON notes (author_id, created_at, note_id) INCLUDE (title)",
+    "CREATE INDEX notes_search_vector_idx ON notes USING gin (search_vector)",
+    "CREATE INDEX notes_title_trgm_idx "
+    "ON notes USING gin ((coalesce(title, '')) gin_trgm_ops)",
+    "CREATE INDEX notes_author_title_trgm_gist_idx "
+    "ON notes USING gist (author_id, title gist_trgm_ops)",
+)
+
+# statement-level triggers of the parent see the rows of all partitions
+TRIGGERS = {
+    "notes_insert_author_stats": "AFTER INSERT ON notes "
+    "REFERENCING NEW TABLE AS new_notes",
+    "notes_update_author_stats": "AFTER UPDATE ON notes "
+    "REFERENCING OLD TABLE AS old_notes NEW TABLE AS new_notes",
+    "notes_delete_author_stats": "AFTER DELETE ON notes "
+    "REFERENCING OLD TABLE AS old_notes",
+}
+
+
+def rebuild_notes(primary_key: str, partition_by: str) -> None:
+    """Move the rows into a new notes table, keeping ids, indexes and triggers"""
+
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON notes")
+
+    op.execute(f"ALTER TABLE notes RENAME TO {OLD_TABLE}")
+    # the new primary key takes the name of the index
+    op.execute(
+        f"ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT notes_pkey TO {OLD_TABLE}_pkey",
+    )
+    op.execute(f"ALTER SEQUENCE {SEQUENCE_NAME} OWNED BY NONE")
+    op.execute(
+        CREATE_TABLE.format(primary_key=primary_key, partition_by=partition_by),
+    )
+
+    if partition_by:
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f"CREATE TABLE notes_p{remainder:02} PARTITION OF notes "
+                f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})",
+            )
+
+    op.execute(
+        f"INSERT INTO notes ({COLUMNS}) SELECT {COLUMNS} FROM {OLD_TABLE}",
+    )
+    op.execute(f"DROP TABLE {OLD_TABLE}")
+    op.execute(f"ALTER SEQUENCE {SEQUENCE_NAME} OWNED BY notes.note_id")
+
+    for index in INDEXES:
+        op.execute(index)
+
+    for name, event in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {event} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION notes_bump_author_stats()",
+        )
+
+    op.execute("ANALYZE notes")
+
+
+def upgrade() -> None:
+    # the partition key has to be a part of every unique index
+    rebuild_notes(
+        primary_key="PRIMARY KEY (note_id, author_id)",
+        partition_by=" PARTITION BY HASH (author_id)",
+    )
+
+
+def downgrade() -> None:
+    rebuild_notes(primary_key="PRIMARY KEY (note_id)", partition_by="")
@@ -0,0 +1,102 @@
+"""author shards
+
+Revision ID: d1f5b9c3a7e2
+Revises: c9d3f7a1e5b8
+Create Date: 2026-10-17 22:08:51.914027
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d1f5b9c3a7e2"
+down_revision = "c9d3f7a1e5b8"
+branch_labels = None
+depends_on = None
+
+# The check runs after the upsert has locked the stats rows. The shard
+# mover holds that lock while it fences the author, so a write that was
+# waiting for it sees the fence and fails instead of landing on the old
+# shard. The mover itself sets zametka.moving to delete the moved notes.
+FENCED_BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION notes_bump_author_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    authors uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT author_id) INTO authors FROM new_notes;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT author_id) INTO authors FROM old_notes;
+    ELSE
+        SELECT array_agg(author_id) INTO authors FROM (
+            SELECT author_id FROM new_notes UNION SELECT author_id FROM old_notes
+        ) AS changed;
+    END IF;
+
+    INSERT INTO author_note_stats AS stats (author_id, generation)
+    SELECT author_id, nextval('author_note_generation_seq')
+    FROM unnest(authors) AS author_id
+    ON CONFLICT (author_id) DO UPDATE SET generation = excluded.generation;
+
+    IF coalesce(current_setting('zametka.moving', true), '') <> 'on'
+        AND EXISTS (SELECT 1 FROM moved_authors WHERE author_id = ANY (authors))
+    THEN
+        RAISE EXCEPTION 'notes of the author were moved to another shard';
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION notes_bump_author_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO author_note_stats AS stats (author_id, generation)
+        SELECT author_id, nextval('author_note_generation_seq')
+        FROM (SELECT DISTINCT author_id FROM new_notes) AS changed
+        ON CONFLICT (author_id) DO UPDATE SET generation = excluded.generation;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO author_note_stats AS stats (author_id, generation)
+        SELECT author_id, nextval('author_note_generation_seq')
+        FROM (SELECT DISTINCT author_id FROM old_notes) AS changed
+        ON CONFLICT (author_id) DO UPDATE SET generation = excluded.generation;
+    ELSE
+        INSERT INTO author_note_stats AS stats (author_id, generation)
+        SELECT author_id, nextval('author_note_generation_seq')
+        FROM (
+            SELECT author_id FROM new_notes UNION SELECT author_id FROM old_notes
+        ) AS changed
+        ON CONFLICT (author_id) DO UPDATE SET generation = excluded.generation;
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    # the directory is read only on the first shard, the fence on every one
+    op.create_table(
+        "author_shards",
+        sa.Column("author_id", sa.Uuid(), nullable=False),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("author_id"),
+    )
+    op.create_table(
+        "moved_authors",
+        sa.Column("author_id", sa.Uuid(), nullable=False),
+        sa.PrimaryKeyConstraint("author_id"),
+    )
+    op.execute(FENCED_BUMP_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute(BUMP_FUNCTION)
+    op.drop_table("moved_authors")
+    op.drop_table("author_shards")
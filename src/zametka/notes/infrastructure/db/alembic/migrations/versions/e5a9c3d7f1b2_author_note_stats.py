@@ -0,0 +1,96 @@
+"""author note stats
+
+Revision ID: e5a9c3d7f1b2
+Revises: c2e8f5a1d3b7
+Create Date: 2026-10-17 16:40:12.118230
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5a9c3d7f1b2"
+down_revision = "c2e8f5a1d3b7"
+branch_labels = None
+depends_on = None
+
+SEQUENCE_NAME = "author_note_generation_seq"
+
+# Statement-level, so a batch or a COPY of many notes bumps the
+# generation of every touched author once. Transition tables can not be
+# shared between events, hence one trigger per event and TG_OP here.
+# Generations come from one sequence, so a value names the notes of
+# exactly one author at one moment.
+BUMP_FUNCTION = f"""
+CREATE FUNCTION notes_bump_author_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO author_note_stats AS stats (author_id, generation)
+        SELECT author_id, nextval('{SEQUENCE_NAME}')
+        FROM (SELECT DISTINCT author_id FROM new_notes) AS changed
+        ON CONFLICT (author_id) DO UPDATE SET generation = excluded.generation;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO author_note_stats AS stats (author_id, generation)
+        SELECT author_id, nextval('{SEQUENCE_NAME}')
+        FROM (SELECT DISTINCT author_id FROM old_notes) AS changed
+        ON CONFLICT (author_id) DO UPDATE SET generation = excluded.generation;
+    ELSE
+        INSERT INTO author_note_stats AS stats (author_id, generation)
+        SELECT author_id, nextval('{SEQUENCE_NAME}')
+        FROM (
+            SELECT author_id FROM new_notes UNION SELECT author_id FROM old_notes
+        ) AS changed
+        ON CONFLICT (author_id) DO UPDATE SET generation = excluded.generation;
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = {
+    "notes_insert_author_stats": "AFTER INSERT ON notes "
+    "REFERENCING NEW TABLE AS new_notes",
+    "notes_update_author_stats": "AFTER UPDATE ON notes "
+    "REFERENCING OLD TABLE AS old_notes NEW TABLE AS new_notes",
+    "notes_delete_author_stats": "AFTER DELETE ON notes "
+    "REFERENCING OLD TABLE AS old_notes",
+}
+
+
+def upgrade() -> None:
+    op.execute(f"CREATE SEQUENCE {SEQUENCE_NAME}")
+    op.create_table(
+        "author_note_stats",
+        sa.Column("author_id", sa.Uuid(), nullable=False),
+        sa.Column("generation", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["author_id"],
+            ["users.identity_id"],
+        ),
+        sa.PrimaryKeyConstraint("author_id"),
+    )
+
+    op.execute(
+        "INSERT INTO author_note_stats (author_id, generation) "
+        f"SELECT author_id, nextval('{SEQUENCE_NAME}') "
+        "FROM (SELECT DISTINCT author_id FROM notes) AS authors",
+    )
+    op.execute(BUMP_FUNCTION)
+
+    for name, event in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {event} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION notes_bump_author_stats()",
+        )
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name} ON notes")
+
+    op.execute("DROP FUNCTION notes_bump_author_stats()")
+    op.drop_table("author_note_stats")
+    op.execute(f"DROP SEQUENCE {SEQUENCE_NAME}")
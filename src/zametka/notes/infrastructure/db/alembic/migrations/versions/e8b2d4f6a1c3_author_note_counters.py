@@ -0,0 +1,130 @@
+"""author note counters
+
+Revision ID: e8b2d4f6a1c3
+Revises: d1f5b9c3a7e2
+Create Date: 2026-10-17 23:41:05.502119
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e8b2d4f6a1c3"
+down_revision = "d1f5b9c3a7e2"
+branch_labels = None
+depends_on = None
+
+# the stored size of the text, compressed or not, the title is not counted
+TEXT_BYTES = (
+    "coalesce(octet_length(text), 0) + coalesce(octet_length(text_compressed), 0)"
+)
+
+INSERTED = (
+    f"SELECT author_id, 1 AS note_count, {TEXT_BYTES} AS text_bytes FROM new_notes"
+)
+DELETED = (
+    "SELECT author_id, -1 AS note_count, "
+    f"-({TEXT_BYTES}) AS text_bytes FROM old_notes"
+)
+
+# Adds the deltas of every author touched by the statement in one upsert,
+# an update of a text changes only text_bytes
+UPSERT_DELTAS = """
+        WITH upserted AS (
+            INSERT INTO author_note_stats AS stats
+                (author_id, generation, note_count, text_bytes)
+            SELECT author_id, nextval('author_note_generation_seq'),
+                   sum(note_count), sum(text_bytes)
+            FROM ({changed}) AS changed
+            GROUP BY author_id
+            ON CONFLICT (author_id) DO UPDATE SET
+                generation = excluded.generation,
+                note_count = stats.note_count + excluded.note_count,
+                text_bytes = stats.text_bytes + excluded.text_bytes
+            RETURNING author_id
+        )
+        SELECT array_agg(author_id) INTO authors FROM upserted;"""
+
+COUNTING_BUMP_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notes_bump_author_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    authors uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN{UPSERT_DELTAS.format(changed=INSERTED)}
+    ELSIF TG_OP = 'DELETE' THEN{UPSERT_DELTAS.format(changed=DELETED)}
+    ELSE{UPSERT_DELTAS.format(changed=f"{INSERTED} UNION ALL {DELETED}")}
+    END IF;
+
+    IF coalesce(current_setting('zametka.moving', true), '') <> 'on'
+        AND EXISTS (SELECT 1 FROM moved_authors WHERE author_id = ANY (authors))
+    THEN
+        RAISE EXCEPTION 'notes of the author were moved to another shard';
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+FENCED_BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION notes_bump_author_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    authors uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT author_id) INTO authors FROM new_notes;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT author_id) INTO authors FROM old_notes;
+    ELSE
+        SELECT array_agg(author_id) INTO authors FROM (
+            SELECT author_id FROM new_notes UNION SELECT author_id FROM old_notes
+        ) AS changed;
+    END IF;
+
+    INSERT INTO author_note_stats AS stats (author_id, generation)
+    SELECT author_id, nextval('author_note_generation_seq')
+    FROM unnest(authors) AS author_id
+    ON CONFLICT (author_id) DO UPDATE SET generation = excluded.generation;
+
+    IF coalesce(current_setting('zametka.moving', true), '') <> 'on'
+        AND EXISTS (SELECT 1 FROM moved_authors WHERE author_id = ANY (authors))
+    THEN
+        RAISE EXCEPTION 'notes of the author were moved to another shard';
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "author_note_stats",
+        sa.Column("note_count", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "author_note_stats",
+        sa.Column("text_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+    # writes wait until the counters are filled and counted by the new function
+    op.execute("LOCK TABLE notes IN SHARE MODE")
+    op.execute(
+        "INSERT INTO author_note_stats AS stats "
+        "(author_id, generation, note_count, text_bytes) "
+        "SELECT author_id, nextval('author_note_generation_seq'), count(*), "
+        f"sum({TEXT_BYTES}) FROM notes GROUP BY author_id "
+        "ON CONFLICT (author_id) DO UPDATE SET "
+        "note_count = excluded.note_count, text_bytes = excluded.text_bytes",
+    )
+    op.execute(COUNTING_BUMP_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute(FENCED_BUMP_FUNCTION)
+    op.drop_column("author_note_stats", "text_bytes")
+    op.drop_column("author_note_stats", "note_count")
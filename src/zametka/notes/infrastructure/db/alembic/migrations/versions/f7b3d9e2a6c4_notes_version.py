@@ -0,0 +1,28 @@
+"""notes version
+
+Revision ID: f7b3d9e2a6c4
+Revises: e5a9c3d7f1b2
+Create Date: 2026-10-17 18:05:37.640211
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f7b3d9e2a6c4"
+down_revision = "e5a9c3d7f1b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # a constant default is kept in the catalog, no table rewrite
+    op.add_column(
+        "notes",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("notes", "version")
@@ -17,6 +17,8 @@ async def get_engine(settings: DB) -> AsyncGenerator[AsyncEngine, None]:
     engine = create_async_engine(
         settings.get_connection_url(),
         future=True,
+        # asyncpg sends these in the startup packet, no extra round trip
+        connect_args={"server_settings": settings.get_server_settings()},
     )
 
     logging.info("Engine was created.")
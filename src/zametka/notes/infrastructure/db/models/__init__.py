@@ -1,5 +1,7 @@
+from .author_note_stats import AuthorNoteStats
+from .author_shard import AuthorShard, MovedAuthor
 from .base import Base
 from .note import Note
 from .user import User
 
-__all__ = ["Base", "Note", "User"]
+__all__ = ["AuthorNoteStats", "AuthorShard", "Base", "MovedAuthor", "Note", "User"]
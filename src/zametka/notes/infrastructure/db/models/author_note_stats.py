@@ -0,0 +1,27 @@
+from uuid import UUID
+
+from sqlalchemy import BigInteger, ForeignKey, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from zametka.notes.infrastructure.db.models.base import Base
+
+
+class AuthorNoteStats(Base):
+    """Per-author counters kept by triggers on notes and the shard mover"""
+
+    __tablename__ = "author_note_stats"
+
+    author_id: Mapped[UUID] = mapped_column(
+        Uuid, ForeignKey("users.identity_id"), primary_key=True,
+    )
+    # taken from a sequence by every statement that changes notes of the author,
+    # an author without the row has never had notes
+    generation: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # counted by the same triggers, so quotas and totals need no scan
+    note_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0",
+    )
+    # stored bytes of the texts, compressed ones count compressed
+    text_bytes: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0",
+    )
@@ -0,0 +1,28 @@
+from uuid import UUID
+
+from sqlalchemy import SmallInteger, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from zametka.notes.infrastructure.db.models.base import Base
+
+
+class AuthorShard(Base):
+    """Directory of the authors moved off their home shard, kept on the first one"""
+
+    __tablename__ = "author_shards"
+
+    author_id: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+
+class MovedAuthor(Base):
+    """
+    Authors whose notes were moved off this shard.
+
+    Writes to their notes here fail, so a worker with a stale directory
+    can not write to the old shard.
+    """
+
+    __tablename__ = "moved_authors"
+
+    author_id: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
@@ -1,22 +1,110 @@
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Uuid
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Uuid,
+    func,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from zametka.notes.infrastructure.db.models.base import Base
 
+FTS_CONFIG = "russian"
+
+# search_vector was generated by this before compressed texts were searchable
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{FTS_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{FTS_CONFIG}', coalesce(text, '')), 'B')"
+)
+
 
 class Note(Base):
     """The user notes"""
 
     __tablename__ = "notes"
+    __table_args__ = (
+        Index(
+            "notes_author_created_at_idx",
+            "author_id",
+            "created_at",
+            "note_id",
+            postgresql_include=["title"],
+        ),
+        Index(
+            "notes_search_vector_idx",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        # KNN `<<->` over the titles of one author, author_id needs btree_gist
+        Index(
+            "notes_author_title_trgm_gist_idx",
+            "author_id",
+            "title",
+            postgresql_using="gist",
+            postgresql_ops={"title": "gist_trgm_ops"},
+        ),
+        # the partitions notes_p00..notes_p15 are created by the migration
+        {"postgresql_partition_by": "HASH (author_id)"},
+    )
 
     note_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(50), nullable=False)
     text: Mapped[str | None] = mapped_column(String(60000), nullable=True)
+    # large texts may be kept compressed instead, then text is NULL
+    text_compressed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    text_codec: Mapped[str | None] = mapped_column(String(16), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # bumped by every update, for optimistic concurrency control
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1",
+    )
+    # set by the repository from the plain text, see search_vector()
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, deferred=True)
 
+    # a part of the primary key, as the partition key has to be
     author_id: Mapped[UUID] = mapped_column(
-        Uuid, ForeignKey("users.identity_id"), nullable=False,
+        Uuid, ForeignKey("users.identity_id"), primary_key=True,
     )
+
+
+def _weighted_vector(value: Any, weight: str) -> ColumnElement[Any]:
+    return func.setweight(
+        func.to_tsvector(
+            literal_column(f"'{FTS_CONFIG}'::regconfig"), func.coalesce(value, ""),
+        ),
+        literal_column(f"'{weight}'"),
+        type_=TSVECTOR,
+    )
+
+
+def search_vector(title: Any, text: Any) -> ColumnElement[Any]:
+    """
+    The search vector of a note, text is the plain text however it is stored.
+
+    The text goes first, so its positions do not depend on the title and
+    retitled_search_vector() can swap the title alone.
+    """
+
+    return _weighted_vector(text, "B").op("||", return_type=TSVECTOR)(
+        _weighted_vector(title, "A"),
+    )
+
+
+def retitled_search_vector(title: Any) -> ColumnElement[Any]:
+    """The stored search vector with a new title, the text is kept as is"""
+
+    text_vector = func.ts_filter(
+        Note.search_vector, literal_column("'{b}'::\"char\"[]"), type_=TSVECTOR,
+    )
+
+    return text_vector.op("||", return_type=TSVECTOR)(_weighted_vector(title, "A"))
@@ -1,7 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from zametka.notes.infrastructure.db.uow import SAUnitOfWork
+from zametka.notes.infrastructure.repositories.asyncpg_note import (
+    AsyncpgNoteRepository,
+)
 from zametka.notes.infrastructure.repositories.note import NoteRepositoryImpl
+from zametka.notes.infrastructure.repositories.text_codec import NoteTextCodec
 from zametka.notes.infrastructure.repositories.user import UserRepositoryImpl
 
 
@@ -9,8 +13,15 @@ def get_uow(session: AsyncSession) -> SAUnitOfWork:
     return SAUnitOfWork(session=session)
 
 
-def get_note_repository(session: AsyncSession) -> NoteRepositoryImpl:
-    return NoteRepositoryImpl(session=session)
+def get_note_repository(
+    session: AsyncSession,
+    text_codec: NoteTextCodec | None = None,
+    asyncpg_reads: bool = False,
+) -> NoteRepositoryImpl:
+    if asyncpg_reads:
+        return AsyncpgNoteRepository(session=session, text_codec=text_codec)
+
+    return NoteRepositoryImpl(session=session, text_codec=text_codec)
 
 
 def get_user_repository(session: AsyncSession) -> UserRepositoryImpl:
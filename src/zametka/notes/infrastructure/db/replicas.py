@@ -0,0 +1,164 @@
+import logging
+import re
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# zero when everything received is replayed, an idle primary is not lag;
+# NULL, so stale, when the WAL receiver does not stream: nothing new arrives
+# and the received WAL is always replayed
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN NOT EXISTS ("
+    "SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'"
+    ") THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END",
+)
+REPLAYED_QUERY = text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)")
+# on the shard after a commit, the commit record is written up to here
+WRITTEN_LSN_QUERY = text("SELECT pg_current_wal_lsn()::text")
+
+LSN_PATTERN = re.compile(r"[0-9A-F]{1,8}/[0-9A-F]{1,8}")
+
+
+@dataclass(frozen=True)
+class WrittenLSN:
+    """Where the last write of a user ended in the WAL of their shard"""
+
+    shard: int
+    lsn: str
+
+    def to_cookie(self) -> str:
+        return f"{self.shard}:{self.lsn}"
+
+    @classmethod
+    def from_cookie(cls, value: str | None) -> "WrittenLSN | None":
+        """None for a missing or malformed cookie"""
+
+        shard, _, lsn = (value or "").partition(":")
+
+        if not shard.isdigit() or not LSN_PATTERN.fullmatch(lsn):
+            return None
+
+        return cls(int(shard), lsn)
+
+
+class ReadYourWrites:
+    """
+    The last write of a user, kept by the client between requests.
+
+    Any worker may serve the next request of the user, so it reads from
+    the replicas that have replayed that write. remember is called with
+    the position of a new write to hand it back to the client.
+    """
+
+    def __init__(
+        self,
+        written: WrittenLSN | None = None,
+        remember: Callable[[WrittenLSN], None] | None = None,
+    ):
+        self.written = written
+        self._remember = remember
+
+    def wrote(self, written: WrittenLSN) -> None:
+        self.written = written
+
+        if self._remember is not None:
+            self._remember(written)
+
+
+class Replica:
+    """
+    A read replica of one shard.
+
+    Its lag is checked at most once per check_interval_seconds, a replica
+    that lags more than max_lag_seconds or does not answer is not read.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_lag_seconds: float = 1,
+        check_interval_seconds: float = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.session_factory = session_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+
+        self._clock = clock
+        self._fresh = False
+        self._checked_at: float | None = None
+
+    async def is_fresh(self) -> bool:
+        now = self._clock()
+
+        if self._checked_at is not None:
+            if now - self._checked_at < self.check_interval_seconds:
+                return self._fresh
+
+        self._checked_at = now
+        self._fresh = await self._check()
+
+        return self._fresh
+
+    async def _check(self) -> bool:
+        try:
+            async with self.session_factory() as session:
+                lag = await session.scalar(REPLICA_LAG_QUERY)
+        except (SQLAlchemyError, OSError):
+            logging.warning("Replica lag check failed", exc_info=True)
+            return False
+
+        if lag is None or lag > self.max_lag_seconds:
+            logging.warning("Replica lags %s seconds", lag)
+            return False
+
+        return True
+
+    async def has_replayed(self, lsn: str) -> bool:
+        """Whether a write that ended at lsn on the shard is visible here"""
+
+        try:
+            async with self.session_factory() as session:
+                replayed = await session.scalar(REPLAYED_QUERY, {"lsn": lsn})
+        except (SQLAlchemyError, OSError):
+            logging.warning("Replica replay check failed", exc_info=True)
+            return False
+
+        return bool(replayed)
+
+
+async def pick_replica(
+    replicas: Sequence[Replica], author_id: UUID, written_lsn: str | None = None,
+) -> Replica | None:
+    """
+    The first fresh replica, starting from the one of the author.
+
+    An author keeps reading from one replica while it is fresh, so two reads
+    of one request do not see the data of different moments. With
+    written_lsn only the replicas that have replayed it are fresh.
+    """
+
+    if not replicas:
+        return None
+
+    start = author_id.int % len(replicas)
+
+    for shift in range(len(replicas)):
+        replica = replicas[(start + shift) % len(replicas)]
+
+        if not await replica.is_fresh():
+            continue
+
+        if written_lsn is None or await replica.has_replayed(written_lsn):
+            return replica
+
+    return None
@@ -0,0 +1,324 @@
+import hashlib
+import logging
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Row, delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from zametka.notes.infrastructure.cache.lru import TTLLRUCache
+from zametka.notes.infrastructure.config_loader import (
+    DB,
+    ReplicaConfig,
+    ShardingConfig,
+)
+from zametka.notes.infrastructure.db.main import get_async_sessionmaker, get_engine
+from zametka.notes.infrastructure.db.models import (
+    AuthorNoteStats,
+    AuthorShard,
+    MovedAuthor,
+    Note,
+    User,
+)
+from zametka.notes.infrastructure.db.replicas import (
+    WRITTEN_LSN_QUERY,
+    Replica,
+    WrittenLSN,
+    pick_replica,
+)
+
+DIRECTORY_MAX_ENTRIES = 100000
+STICKY_MAX_ENTRIES = 100000
+MOVE_BATCH_SIZE = 1000
+
+# search_vector too, it can not be built from a compressed text in SQL
+NOTE_COPY_COLUMNS = tuple(Note.__table__.c)
+
+
+def home_shard(author_id: UUID, shards: int) -> int:
+    """The shard of an author that was never moved, stable across processes"""
+
+    digest = hashlib.blake2b(author_id.bytes, digest_size=8).digest()
+
+    return int.from_bytes(digest, "big") % shards
+
+
+class ShardRouter:
+    """
+    Routes the notes of an author to their shard.
+
+    An author lives on the home shard unless the directory on the first
+    shard says otherwise, its answers are cached for directory_ttl_seconds.
+    Reads go to a fresh replica of the shard, if any, until the author
+    writes, then to the shard itself for sticky_seconds. Reads that know
+    the last write of the author go to a replica that has replayed it.
+    """
+
+    def __init__(
+        self,
+        session_factories: list[async_sessionmaker[AsyncSession]],
+        directory_ttl_seconds: float = 30,
+        replicas: list[list[Replica]] | None = None,
+        sticky_seconds: float = 5,
+    ):
+        self.session_factories = session_factories
+        self.replicas = replicas or [[] for _ in session_factories]
+        self._directory: TTLLRUCache[UUID, int] = TTLLRUCache(
+            max_entries=DIRECTORY_MAX_ENTRIES,
+            ttl_seconds=directory_ttl_seconds,
+        )
+        self._sticky: TTLLRUCache[UUID, bool] = TTLLRUCache(
+            max_entries=STICKY_MAX_ENTRIES,
+            ttl_seconds=sticky_seconds,
+        )
+
+    async def shard_of(self, author_id: UUID) -> int:
+        if len(self.session_factories) == 1:
+            return 0
+
+        shard = self._directory.get(author_id)
+
+        if shard is None:
+            async with self.session_factories[0]() as session:
+                moved_to = await session.scalar(
+                    select(AuthorShard.shard).where(AuthorShard.author_id == author_id),
+                )
+
+            if moved_to is None:
+                shard = home_shard(author_id, len(self.session_factories))
+            else:
+                shard = moved_to
+
+            self._directory.put(author_id, shard)
+
+        return shard
+
+    async def session_factory(
+        self, author_id: UUID,
+    ) -> async_sessionmaker[AsyncSession]:
+        return self.session_factories[await self.shard_of(author_id)]
+
+    async def read_session_factory(
+        self, author_id: UUID, written: WrittenLSN | None = None,
+    ) -> async_sessionmaker[AsyncSession]:
+        shard = await self.shard_of(author_id)
+
+        # a write to another shard says nothing about the replicas of this one
+        moved = written is not None and written.shard != shard
+
+        if self._sticky.get(author_id) is None and not moved:
+            replica = await pick_replica(
+                self.replicas[shard], author_id, written.lsn if written else None,
+            )
+
+            if replica is not None:
+                return replica.session_factory
+
+        return self.session_factories[shard]
+
+    async def written_lsn(
+        self, author_id: UUID, session: AsyncSession,
+    ) -> WrittenLSN | None:
+        """Position of the writes committed in the session, None without replicas"""
+
+        shard = await self.shard_of(author_id)
+
+        if not self.replicas[shard]:
+            return None
+
+        return WrittenLSN(shard, await session.scalar(WRITTEN_LSN_QUERY))
+
+    def stick_to_primary(self, author_id: UUID) -> None:
+        """Let the author read their own writes"""
+
+        self._sticky.put(author_id, True)
+
+    def forget(self, author_id: UUID) -> None:
+        self._directory.invalidate(author_id)
+
+
+@asynccontextmanager
+async def create_shard_router(
+    config: ShardingConfig, replica_config: ReplicaConfig | None = None,
+) -> AsyncIterator[ShardRouter]:
+    """One engine per shard and replica, disposed on exit"""
+
+    async with AsyncExitStack() as stack:
+
+        async def open_database(db: DB) -> async_sessionmaker[AsyncSession]:
+            engines = get_engine(db)
+            engine = await anext(engines)
+            stack.push_async_callback(anext, engines, None)
+
+            return await get_async_sessionmaker(engine)
+
+        session_factories = [await open_database(shard) for shard in config.shards]
+        replica_config = replica_config or ReplicaConfig(replicas=[])
+        replicas: list[list[Replica]] = [[] for _ in config.shards]
+
+        for shard, shard_replicas in enumerate(replica_config.replicas):
+            for replica in shard_replicas:
+                replicas[shard].append(
+                    Replica(
+                        await open_database(replica),
+                        max_lag_seconds=replica_config.max_lag_seconds,
+                        check_interval_seconds=replica_config.check_interval_seconds,
+                    ),
+                )
+
+        yield ShardRouter(
+            session_factories,
+            config.directory_ttl_seconds,
+            replicas=replicas,
+            sticky_seconds=replica_config.sticky_seconds,
+        )
+
+
+async def move_author(router: ShardRouter, author_id: UUID, target: int) -> int:
+    """
+    Move the user and the notes of the author to the target shard.
+
+    The source keeps the author stats row locked from the fence until
+    the notes are deleted there, so writers queue behind the move and then
+    fail on the fence instead of writing to the old shard. Safe to re-run:
+    a source without the user and the notes was emptied by an earlier run
+    that failed before the directory write, only the directory is written.
+    """
+
+    source = await router.shard_of(author_id)
+
+    if source == target:
+        return 0
+
+    async with router.session_factories[source]() as source_session:
+        await source_session.execute(text("SET LOCAL zametka.moving = 'on'"))
+        await source_session.execute(
+            pg_insert(MovedAuthor)
+            .values(author_id=author_id)
+            .on_conflict_do_nothing(),
+        )
+
+        user = (
+            await source_session.execute(
+                select(*User.__table__.c).where(User.identity_id == author_id),
+            )
+        ).one_or_none()
+
+        if user is not None:
+            await _lock_author(source_session, author_id)
+
+        # a heavy author does not fit in memory, the notes go over in batches
+        result = await source_session.stream(
+            select(*NOTE_COPY_COLUMNS)
+            .where(Note.author_id == author_id)
+            .execution_options(yield_per=MOVE_BATCH_SIZE),
+        )
+        batches = result.partitions()
+        first_batch = await anext(batches, None)
+        moved = 0
+
+        if user is not None or first_batch:
+            async with router.session_factories[target]() as target_session:
+                moved = await _copy_author(
+                    target_session, author_id, user, first_batch, batches,
+                )
+                await target_session.commit()
+
+            await source_session.execute(
+                delete(Note).where(Note.author_id == author_id),
+            )
+            await source_session.execute(
+                delete(AuthorNoteStats).where(AuthorNoteStats.author_id == author_id),
+            )
+            await source_session.execute(
+                delete(User).where(User.identity_id == author_id),
+            )
+
+        await source_session.commit()
+
+    async with router.session_factories[0]() as directory_session:
+        if target == home_shard(author_id, len(router.session_factories)):
+            await directory_session.execute(
+                delete(AuthorShard).where(AuthorShard.author_id == author_id),
+            )
+        else:
+            await directory_session.execute(
+                pg_insert(AuthorShard)
+                .values(author_id=author_id, shard=target)
+                .on_conflict_do_update(
+                    index_elements=[AuthorShard.author_id],
+                    set_={"shard": target},
+                ),
+            )
+
+        await directory_session.commit()
+
+    router.forget(author_id)
+
+    logging.info("Author %s was moved from shard %s to %s", author_id, source, target)
+
+    return moved
+
+
+async def _lock_author(session: AsyncSession, author_id: UUID) -> None:
+    # the same row the notes triggers upsert, a bump is harmless
+    await session.execute(
+        pg_insert(AuthorNoteStats)
+        .values(
+            author_id=author_id,
+            generation=func.nextval("author_note_generation_seq"),
+        )
+        .on_conflict_do_update(
+            index_elements=[AuthorNoteStats.author_id],
+            set_={"generation": func.nextval("author_note_generation_seq")},
+        ),
+    )
+
+
+async def _copy_author(
+    session: AsyncSession,
+    author_id: UUID,
+    user: Row[Any] | None,
+    first_batch: Sequence[Row[Any]] | None,
+    batches: AsyncIterator[Sequence[Row[Any]]],
+) -> int:
+    """The count of the copied notes"""
+
+    await session.execute(text("SET LOCAL zametka.moving = 'on'"))
+    await session.execute(
+        delete(MovedAuthor).where(MovedAuthor.author_id == author_id),
+    )
+
+    if first_batch:
+        # a copy of an earlier failed run, replaced by the full one
+        await session.execute(delete(Note).where(Note.author_id == author_id))
+
+    if user is not None:
+        await session.execute(
+            pg_insert(User).values(**user._mapping).on_conflict_do_nothing(),
+        )
+
+    copied = 0
+    max_note_id = 0
+    batch = first_batch
+
+    while batch:
+        await session.execute(insert(Note), [dict(note._mapping) for note in batch])
+        copied += len(batch)
+        max_note_id = max(max_note_id, *(note.note_id for note in batch))
+        batch = await anext(batches, None)
+
+    if copied:
+        # later notes of the author must not reuse the moved ids
+        await session.execute(
+            text(
+                "SELECT setval('notes_note_id_seq', "
+                "greatest(:note_id, (SELECT last_value FROM notes_note_id_seq)))",
+            ),
+            {"note_id": max_note_id},
+        )
+
+    return copied
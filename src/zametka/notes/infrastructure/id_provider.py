@@ -1,6 +1,8 @@
 from zametka.notes.application.common.id_provider import IdProvider
 from zametka.notes.domain.value_objects.user.user_id import UserId
 from zametka.notes.infrastructure.access_api_client import AccessAPIClient
+from zametka.notes.infrastructure.access_token import AccessTokenVerifier
+from zametka.notes.infrastructure.cache.identity_cache import IdentityCache
 
 
 class RawIdProvider(IdProvider):
@@ -12,10 +14,39 @@ class RawIdProvider(IdProvider):
 
 
 class TokenIdProvider(IdProvider):
-    def __init__(self, api_client: AccessAPIClient):
+    """Created per request, asks the access service once or the identity cache"""
+
+    def __init__(
+        self,
+        api_client: AccessAPIClient,
+        identity_cache: IdentityCache | None = None,
+    ):
         self._api_client = api_client
+        self._identity_cache = identity_cache
+        self._user_id: UserId | None = None
 
     async def get_user_id(self) -> UserId:
-        user_id = await self._api_client.get_identity()
+        if self._user_id is None:
+            if self._identity_cache is None:
+                self._user_id = await self._api_client.get_identity()
+            else:
+                self._user_id = await self._identity_cache.get_identity(
+                    self._api_client.access_token, self._api_client.get_identity,
+                )
+
+        return self._user_id
+
+
+class JWTIdProvider(IdProvider):
+    """Created per request, verifies the access token here instead of asking"""
 
-        return user_id
+    def __init__(self, verifier: AccessTokenVerifier, access_token: str):
+        self._verifier = verifier
+        self._access_token = access_token
+        self._user_id: UserId | None = None
+
+    async def get_user_id(self) -> UserId:
+        if self._user_id is None:
+            self._user_id = self._verifier.get_identity(self._access_token)
+
+        return self._user_id
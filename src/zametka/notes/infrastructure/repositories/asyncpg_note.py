@@ -0,0 +1,224 @@
+from dataclasses import dataclass
+from typing import Any
+
+from asyncpg import Connection, Record
+from sqlalchemy import DateTime, Executable, Integer, bindparam, select, tuple_
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from zametka.notes.application.note.dto import (
+    AuthorNotesStatsDTO,
+    ListNoteDTO,
+    ListNotesDTO,
+    NoteListField,
+)
+from zametka.notes.domain.entities.note import DBNote
+from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.db.models.author_note_stats import AuthorNoteStats
+from zametka.notes.infrastructure.db.models.note import Note
+from zametka.notes.infrastructure.repositories.converters.note import (
+    note_record_to_db_note_entity,
+)
+from zametka.notes.infrastructure.repositories.cursor import (
+    ListCursor,
+    decode_list_cursor,
+    encode_list_cursor,
+)
+from zametka.notes.infrastructure.repositories.note import (
+    STORED_TEXT_COLUMNS,
+    NoteRepositoryImpl,
+)
+
+ASYNCPG_DIALECT = asyncpg_dialect()
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledQuery:
+    """A statement compiled once to asyncpg SQL, its binds are passed by name"""
+
+    sql: str
+    params: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, statement: Executable) -> "CompiledQuery":
+        compiled = statement.compile(dialect=ASYNCPG_DIALECT)
+
+        return cls(sql=compiled.string, params=tuple(compiled.positiontup or ()))
+
+    def args(self, **values: Any) -> list[Any]:
+        return [values[name] for name in self.params]
+
+
+# asyncpg prepares each of them once per connection and then only binds
+GET_NOTE = CompiledQuery.compile(
+    select(
+        Note.note_id, Note.title, *STORED_TEXT_COLUMNS, Note.created_at, Note.version,
+    )
+    .where(Note.note_id == bindparam("note_id"))
+    .where(Note.author_id == bindparam("author_id")),
+)
+
+LIST_NOTES = CompiledQuery.compile(
+    select(Note.title, Note.note_id, Note.created_at)
+    .where(Note.author_id == bindparam("author_id"))
+    .order_by(Note.created_at, Note.note_id)
+    .limit(bindparam("limit", type_=Integer))
+    .offset(bindparam("offset", type_=Integer)),
+)
+
+LIST_NOTES_AFTER = CompiledQuery.compile(
+    select(Note.title, Note.note_id, Note.created_at)
+    .where(Note.author_id == bindparam("author_id"))
+    .where(
+        tuple_(Note.created_at, Note.note_id)
+        > tuple_(
+            bindparam("created_at", type_=DateTime),
+            bindparam("note_id", type_=Integer),
+        ),
+    )
+    .order_by(Note.created_at, Note.note_id)
+    .limit(bindparam("limit", type_=Integer)),
+)
+
+GET_GENERATION = CompiledQuery.compile(
+    select(AuthorNoteStats.generation).where(
+        AuthorNoteStats.author_id == bindparam("author_id"),
+    ),
+)
+
+GET_STATS = CompiledQuery.compile(
+    select(
+        AuthorNoteStats.generation,
+        AuthorNoteStats.note_count,
+        AuthorNoteStats.text_bytes,
+    ).where(AuthorNoteStats.author_id == bindparam("author_id")),
+)
+
+
+class AsyncpgNoteRepository(NoteRepositoryImpl):
+    """
+    Runs the hot reads straight on the asyncpg connection of the session.
+
+    Skips compiling the statements and processing the rows, the records
+    become entities and DTOs as is. The rest is done by NoteRepositoryImpl
+    in the same transaction.
+    """
+
+    async def _connection(self) -> Connection:
+        """
+        The asyncpg connection, in the transaction of the session.
+
+        SQLAlchemy sends BEGIN only with its first statement, raw reads
+        before it would run outside of the transaction, so a statement
+        of its own starts the transaction once per session.
+        """
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection: Connection = raw_connection.driver_connection  # type:ignore
+
+        if not driver_connection.is_in_transaction():
+            await connection.exec_driver_sql("SELECT 1")
+
+        return driver_connection
+
+    async def get(self, note_id: NoteId, author_id: UserId) -> DBNote | None:
+        """Get by id, the author prunes the scan to one partition"""
+
+        connection = await self._connection()
+        note: Record | None = await connection.fetchrow(
+            GET_NOTE.sql,
+            *GET_NOTE.args(note_id=note_id.to_raw(), author_id=author_id.to_raw()),
+        )
+
+        if note is None:
+            return None
+
+        return note_record_to_db_note_entity(note, author_id)
+
+    async def get_generation(self, author_id: UserId) -> int:
+        """Kept by the triggers on notes"""
+
+        connection = await self._connection()
+        generation: int | None = await connection.fetchval(
+            GET_GENERATION.sql, *GET_GENERATION.args(author_id=author_id.to_raw()),
+        )
+
+        return generation or 0
+
+    async def get_stats(
+        self, author_id: UserId, lock: bool = False,
+    ) -> AuthorNotesStatsDTO:
+        """Read with every list, the locking read is left to NoteRepositoryImpl"""
+
+        if lock:
+            return await super().get_stats(author_id, lock)
+
+        connection = await self._connection()
+        stats: Record | None = await connection.fetchrow(
+            GET_STATS.sql, *GET_STATS.args(author_id=author_id.to_raw()),
+        )
+
+        if stats is None:
+            return AuthorNotesStatsDTO()
+
+        return AuthorNotesStatsDTO(
+            generation=stats["generation"],
+            note_count=stats["note_count"],
+            text_bytes=stats["text_bytes"],
+        )
+
+    async def list(
+        self,
+        limit: int,
+        offset: int,
+        author_id: UserId,
+        cursor: str | None = None,
+        fields: frozenset[NoteListField] = frozenset(),
+        preview_chars: int = 100,
+    ) -> ListNotesDTO:
+        """List, the pages with details are left to NoteRepositoryImpl"""
+
+        if fields:
+            return await super().list(
+                limit, offset, author_id, cursor, fields, preview_chars,
+            )
+
+        connection = await self._connection()
+
+        if cursor:
+            after = decode_list_cursor(cursor)
+            query = LIST_NOTES_AFTER
+            args = query.args(
+                author_id=author_id.to_raw(),
+                created_at=after.created_at,
+                note_id=after.note_id,
+                limit=limit + 1,
+            )
+        else:
+            query = LIST_NOTES
+            args = query.args(
+                author_id=author_id.to_raw(), limit=limit + 1, offset=offset,
+            )
+
+        db_notes: list[Record] = await connection.fetch(query.sql, *args)
+
+        has_next = len(db_notes) > limit
+        db_notes = db_notes[:limit]
+
+        next_cursor = None
+
+        if has_next and db_notes:
+            last = db_notes[-1]
+            next_cursor = encode_list_cursor(
+                ListCursor(created_at=last["created_at"], note_id=last["note_id"]),
+            )
+
+        return ListNotesDTO(
+            notes=[
+                ListNoteDTO(title=note["title"], note_id=note["note_id"])
+                for note in db_notes
+            ],
+            has_next=has_next,
+            next_cursor=next_cursor,
+        )
@@ -1,8 +1,16 @@
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any
 
 from sqlalchemy import Row
 
-from zametka.notes.application.note.dto import DBNoteDTO, ListNoteDTO
+from zametka.notes.application.note.dto import (
+    DBNoteDTO,
+    ExportNoteDTO,
+    ListNoteDetailsDTO,
+    ListNoteDTO,
+    NoteListField,
+)
 from zametka.notes.domain.entities.note import DBNote
 from zametka.notes.domain.entities.note import Note as NoteEntity
 from zametka.notes.domain.value_objects.note.note_created_at import (
@@ -11,35 +19,66 @@ from zametka.notes.domain.value_objects.note.note_created_at import (
 from zametka.notes.domain.value_objects.note.note_id import NoteId
 from zametka.notes.domain.value_objects.note.note_text import NoteText
 from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.domain.value_objects.note.note_version import NoteVersion
 from zametka.notes.domain.value_objects.user.user_id import UserId
 from zametka.notes.infrastructure.db.models.note import Note
+from zametka.notes.infrastructure.repositories.text_codec import (
+    NoteTextCodec,
+    decode_text,
+)
 
 
 def note_db_data_to_db_note_dto(
-    note: tuple[int, str, str | None],
+    note: tuple[int, str, str | None, bytes | None, str | None, int],
 ) -> DBNoteDTO:
     return DBNoteDTO(
         note_id=note[0],
         title=note[1],
-        text=note[2],
+        text=decode_text(note[2], note[3], note[4]),
+        version=note[5],
     )
 
 
-def note_db_model_to_db_note_dto(note: Note) -> DBNoteDTO:
-    return DBNoteDTO(
-        title=note.title,
-        text=note.text,
-        note_id=note.note_id,
+def note_db_data_to_export_note_dto(
+    note: Row[tuple[int, str, str | None, bytes | None, str | None, datetime]],
+) -> ExportNoteDTO:
+    return ExportNoteDTO(
+        note_id=note[0],
+        title=note[1],
+        text=decode_text(note[2], note[3], note[4]),
+        created_at=note[5],
     )
 
 
 def note_db_model_to_db_note_entity(note: Note) -> DBNote:
+    """The stored values were validated on the way in, they are not checked again"""
+
+    text = decode_text(note.text, note.text_compressed, note.text_codec)
+
     return DBNote(
-        note_id=NoteId(note.note_id),
-        title=NoteTitle(note.title),
-        text=NoteText(note.text) if note.text else None,
-        author_id=UserId(note.author_id),
-        created_at=NoteCreatedAt(note.created_at),
+        note_id=NoteId.from_trusted(note.note_id),
+        title=NoteTitle.from_trusted(note.title),
+        text=NoteText.from_trusted(text) if text else None,
+        author_id=UserId.from_trusted(note.author_id),
+        created_at=NoteCreatedAt.from_trusted(note.created_at),
+        version=NoteVersion.from_trusted(note.version),
+    )
+
+
+def note_record_to_db_note_entity(
+    note: Mapping[str, Any], author_id: UserId,
+) -> DBNote:
+    """Same for an asyncpg record of the author"""
+
+    text = decode_text(note["text"], note["text_compressed"], note["text_codec"])
+
+    return DBNote(
+        note_id=NoteId.from_trusted(note["note_id"]),
+        title=NoteTitle.from_trusted(note["title"]),
+        text=NoteText.from_trusted(text) if text else None,
+        author_id=author_id,
+        created_at=NoteCreatedAt.from_trusted(note["created_at"]),
+        version=NoteVersion.from_trusted(note["version"]),
     )
 
 
@@ -50,16 +89,62 @@ def note_db_model_to_list_note_dto(note: Row[tuple[str, int]]) -> ListNoteDTO:
     )
 
 
-def notes_to_dto(notes: Sequence[Row[tuple[str, int]]]) -> list[ListNoteDTO]:
-    return [note_db_model_to_list_note_dto(note) for note in notes]
+def note_db_data_to_list_note_details_dto(
+    note: Row[Any], fields: frozenset[NoteListField], preview_chars: int,
+) -> ListNoteDetailsDTO:
+    """Compressed texts come whole in text_compressed and are cut here"""
+
+    text = None
+
+    if getattr(note, "text_codec", None) is not None:
+        text = decode_text(None, note.text_compressed, note.text_codec)
+
+    preview = None
+    text_length = None
 
+    if NoteListField.PREVIEW in fields:
+        preview = text[:preview_chars] if text is not None else note.preview
+    if NoteListField.TEXT_LENGTH in fields:
+        text_length = len(text) if text is not None else note.text_length
 
-def note_entity_to_db_model(note: NoteEntity) -> Note:
-    db_note = Note(
-        title=note.title.to_raw(),
-        text=note.text.to_raw() if note.text else None,
-        created_at=note.created_at.to_raw(),
-        author_id=note.author_id.to_raw(),
+    return ListNoteDetailsDTO(
+        title=note.title,
+        note_id=note.note_id,
+        preview=preview,
+        created_at=note.created_at if NoteListField.CREATED_AT in fields else None,
+        text_length=text_length,
     )
 
-    return db_note
+
+def notes_to_dto(
+    notes: Sequence[Row[Any]],
+    fields: frozenset[NoteListField] = frozenset(),
+    preview_chars: int = 100,
+) -> list[ListNoteDTO]:
+    if not fields:
+        return [note_db_model_to_list_note_dto(note) for note in notes]
+
+    return [
+        note_db_data_to_list_note_details_dto(note, fields, preview_chars)
+        for note in notes
+    ]
+
+
+def note_entity_to_db_record(
+    note: NoteEntity, text_codec: NoteTextCodec,
+) -> tuple[Any, ...]:
+    """Ordered like COPY_COLUMNS of the repository"""
+
+    plain_text = note.text.to_raw() if note.text else None
+    text = text_codec.encode(plain_text)
+
+    return (
+        note.title.to_raw(),
+        text.text,
+        text.compressed,
+        text.codec,
+        note.created_at.to_raw(),
+        note.author_id.to_raw(),
+        # the search vector is built from it, a text kept as is is not repeated
+        plain_text if text.codec is not None else None,
+    )
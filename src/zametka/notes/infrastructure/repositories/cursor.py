@@ -0,0 +1,90 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from zametka.notes.domain.exceptions.note import InvalidNoteCursorError
+
+LIST_CURSOR_KIND = "list"
+SEARCH_CURSOR_KIND = "search"
+FULLTEXT_CURSOR_KIND = "fulltext"
+
+
+@dataclass(frozen=True)
+class ListCursor:
+    """Position of the last note of a page ordered by (created_at, note_id)"""
+
+    created_at: datetime
+    note_id: int
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """Position of the last note of a page ordered by score DESC, created_at, note_id"""
+
+    score: float
+    created_at: datetime
+    note_id: int
+
+
+def _encode(kind: str, values: list[Any]) -> str:
+    raw = json.dumps([kind, *values], separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(kind: str, cursor: str) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidNoteCursorError("Некорректный курсор!") from exc
+
+    if not isinstance(data, list) or not data or data[0] != kind:
+        raise InvalidNoteCursorError("Некорректный курсор!")
+
+    return data[1:]
+
+
+def encode_list_cursor(cursor: ListCursor) -> str:
+    return _encode(LIST_CURSOR_KIND, [cursor.created_at.isoformat(), cursor.note_id])
+
+
+def decode_list_cursor(cursor: str) -> ListCursor:
+    values = _decode(LIST_CURSOR_KIND, cursor)
+
+    try:
+        created_at, note_id = values
+        return ListCursor(
+            created_at=datetime.fromisoformat(created_at),
+            note_id=int(note_id),
+        )
+    except (TypeError, ValueError) as exc:
+        raise InvalidNoteCursorError("Некорректный курсор!") from exc
+
+
+def encode_search_cursor(
+    cursor: SearchCursor, kind: str = SEARCH_CURSOR_KIND,
+) -> str:
+    return _encode(
+        kind,
+        [cursor.score, cursor.created_at.isoformat(), cursor.note_id],
+    )
+
+
+def decode_search_cursor(
+    cursor: str, kind: str = SEARCH_CURSOR_KIND,
+) -> SearchCursor:
+    values = _decode(kind, cursor)
+
+    try:
+        score, created_at, note_id = values
+        return SearchCursor(
+            score=float(score),
+            created_at=datetime.fromisoformat(created_at),
+            note_id=int(note_id),
+        )
+    except (TypeError, ValueError) as exc:
+        raise InvalidNoteCursorError("Некорректный курсор!") from exc
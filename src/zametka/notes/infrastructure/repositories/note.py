@@ -1,30 +1,146 @@
 
-from sqlalchemy import delete, func, select, text, update
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID
+
+from asyncpg import PostgresError
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    LargeBinary,
+    String,
+    Uuid,
+    bindparam,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    table,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from zametka.notes.application.common.repository import NoteRepository
-from zametka.notes.application.note.dto import DBNoteDTO, ListNotesDTO
+from zametka.notes.application.note.dto import (
+    AuthorNotesStatsDTO,
+    DBNoteDTO,
+    ExportNoteDTO,
+    ListNoteDTO,
+    ListNotesDTO,
+    NoteListField,
+    SearchMode,
+)
 from zametka.notes.domain.entities.note import DBNote
 from zametka.notes.domain.entities.note import Note as NoteEntity
+from zametka.notes.domain.exceptions.note import NotesNotSavedError
 from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.note.note_version import NoteVersion
 from zametka.notes.domain.value_objects.user.user_id import UserId
-from zametka.notes.infrastructure.db.models.note import Note
+from zametka.notes.infrastructure.db.models.author_note_stats import AuthorNoteStats
+from zametka.notes.infrastructure.db.models.note import (
+    FTS_CONFIG,
+    Note,
+    retitled_search_vector,
+    search_vector,
+)
 from zametka.notes.infrastructure.repositories.converters.note import (
     note_db_data_to_db_note_dto,
-    note_db_model_to_db_note_dto,
+    note_db_data_to_export_note_dto,
     note_db_model_to_db_note_entity,
-    note_entity_to_db_model,
+    note_entity_to_db_record,
     notes_to_dto,
 )
+from zametka.notes.infrastructure.repositories.cursor import (
+    FULLTEXT_CURSOR_KIND,
+    SEARCH_CURSOR_KIND,
+    ListCursor,
+    SearchCursor,
+    decode_list_cursor,
+    decode_search_cursor,
+    encode_list_cursor,
+    encode_search_cursor,
+)
+from zametka.notes.infrastructure.repositories.text_codec import (
+    NoteTextCodec,
+    StoredText,
+    decode_text,
+)
+
+
+EXPORT_YIELD_PER = 1000
+# 1 - word_similarity, farther titles are not suggested
+SUGGEST_MAX_DISTANCE = 0.7
+COPY_COLUMNS = (
+    "title",
+    "text",
+    "text_compressed",
+    "text_codec",
+    "created_at",
+    "author_id",
+    "search_text",
+)
+# COPY can not build the search vectors, the rows are loaded here first;
+# a temporary table is not written to the WAL
+IMPORT_TABLE = "notes_import"
+CREATE_IMPORT_TABLE = f"""
+CREATE TEMPORARY TABLE IF NOT EXISTS {IMPORT_TABLE} (
+    title text,
+    text text,
+    text_compressed bytea,
+    text_codec text,
+    created_at timestamp,
+    author_id uuid,
+    search_text text
+) ON COMMIT DELETE ROWS
+"""
+
+STORED_TEXT_COLUMNS = (Note.text, Note.text_compressed, Note.text_codec)
+# in the order note_db_data_to_db_note_dto expects
+DB_NOTE_COLUMNS = (Note.note_id, Note.title, *STORED_TEXT_COLUMNS, Note.version)
+
+
+def detail_columns(
+    fields: frozenset[NoteListField], preview_chars: int,
+) -> list[Any]:
+    """Columns of the requested list fields, created_at is always selected"""
+
+    columns: list[Any] = []
+
+    if NoteListField.PREVIEW in fields:
+        columns.append(func.left(Note.text, preview_chars).label("preview"))
+    if NoteListField.TEXT_LENGTH in fields:
+        columns.append(
+            func.coalesce(func.char_length(Note.text), 0).label("text_length"),
+        )
+    if columns:
+        # SQL can not cut compressed texts, they are NULL for the others
+        columns.extend((Note.text_compressed, Note.text_codec))
+
+    return columns
 
 
 class NoteRepositoryImpl(NoteRepository):
     """Repository of notes part of app"""
 
     session: AsyncSession
+    text_codec: NoteTextCodec
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self, session: AsyncSession, text_codec: NoteTextCodec | None = None,
+    ):
         self.session = session
+        self.text_codec = text_codec or NoteTextCodec()
 
     async def create(
         self,
@@ -32,17 +148,100 @@ class NoteRepositoryImpl(NoteRepository):
     ) -> DBNoteDTO:
         """Create"""
 
-        db_note = note_entity_to_db_model(note)
+        return (await self.create_many([note]))[0]
+
+    async def create_many(self, notes: list[NoteEntity]) -> list[DBNoteDTO]:
+        """Create in one statement selecting from the new values"""
+
+        if not notes:
+            return []
+
+        batch = values(
+            column("ordinal", Integer),
+            column("title", String),
+            column("text", String),
+            column("text_compressed", LargeBinary),
+            column("text_codec", String),
+            column("created_at", DateTime),
+            column("author_id", Uuid),
+            column("search_text", String),
+            name="batch",
+        ).data(
+            [
+                (ordinal, *note_entity_to_db_record(note, self.text_codec))
+                for ordinal, note in enumerate(notes)
+            ],
+        )
 
-        self.session.add(db_note)
-        await self.session.flush(objects=[db_note])
+        q = (
+            insert(Note)
+            .from_select(
+                [*COPY_COLUMNS[:-1], "search_vector"],
+                select(
+                    batch.c.title,
+                    batch.c.text,
+                    # VALUES of only NULLs are resolved as text, not bytea
+                    cast(batch.c.text_compressed, LargeBinary),
+                    batch.c.text_codec,
+                    batch.c.created_at,
+                    batch.c.author_id,
+                    search_vector(
+                        batch.c.title,
+                        func.coalesce(batch.c.search_text, batch.c.text),
+                    ),
+                ).order_by(batch.c.ordinal),
+            )
+            .returning(*DB_NOTE_COLUMNS)
+        )
 
-        return note_db_model_to_db_note_dto(db_note)
+        res = await self.session.execute(q)
+        # the ids are drawn in the order of the rows
+        created = sorted(res.all(), key=lambda note: note.note_id)
+
+        return [note_db_data_to_db_note_dto(note) for note in created]  # type:ignore
+
+    async def copy_many(self, notes: list[NoteEntity]) -> None:
+        """Load with COPY through the asyncpg connection of the session"""
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        imported = table(IMPORT_TABLE, *(column(name) for name in COPY_COLUMNS))
+
+        try:
+            await driver_connection.execute(CREATE_IMPORT_TABLE)
+            await driver_connection.copy_records_to_table(
+                IMPORT_TABLE,
+                records=[
+                    note_entity_to_db_record(note, self.text_codec) for note in notes
+                ],
+                columns=COPY_COLUMNS,
+            )
+            await self.session.execute(
+                insert(Note).from_select(
+                    [*COPY_COLUMNS[:-1], "search_vector"],
+                    select(
+                        *(imported.c[name] for name in COPY_COLUMNS[:-1]),
+                        search_vector(
+                            imported.c.title,
+                            func.coalesce(imported.c.search_text, imported.c.text),
+                        ),
+                    ),
+                ),
+            )
+            # emptied by the commit too, this is for the next chunk of the same one
+            await driver_connection.execute(f"TRUNCATE {IMPORT_TABLE}")
+        except (PostgresError, DBAPIError) as exc:
+            raise NotesNotSavedError("Не удалось сохранить заметки!") from exc
 
-    async def get(self, note_id: NoteId) -> DBNote | None:
-        """Get by id"""
+    async def get(self, note_id: NoteId, author_id: UserId) -> DBNote | None:
+        """Get by id, the author prunes the scan to one partition"""
 
-        q = select(Note).where(Note.note_id == note_id.to_raw())
+        q = (
+            select(Note)
+            .where(Note.note_id == note_id.to_raw())
+            .where(Note.author_id == author_id.to_raw())
+        )
 
         res = await self.session.execute(q)
 
@@ -53,96 +252,506 @@ class NoteRepositoryImpl(NoteRepository):
 
         return note_db_model_to_db_note_entity(note)
 
+    async def get_author_id(self, note_id: NoteId) -> UserId | None:
+        """
+        Get author of the note without loading it.
+
+        Probes the primary key of every partition, so it is only used
+        to explain why an author-scoped query missed.
+        """
+
+        q = select(Note.author_id).where(Note.note_id == note_id.to_raw())
+
+        res = await self.session.execute(q)
+        author_id = res.scalar()
+
+        if author_id is None:
+            return None
+
+        return UserId(author_id)
+
+    async def get_author_ids(self, note_ids: list[NoteId]) -> dict[int, UserId]:
+        """Like get_author_id, for the misses of a batch"""
+
+        if not note_ids:
+            return {}
+
+        q = select(Note.note_id, Note.author_id).where(
+            Note.note_id.in_([note_id.to_raw() for note_id in note_ids]),
+        )
+
+        res = await self.session.execute(q)
+
+        return {note_id: UserId(author_id) for note_id, author_id in res.all()}
+
     async def update(
-        self, note_id: NoteId, updated_note: DBNote,
+        self,
+        note_id: NoteId,
+        updated_note: NoteEntity,
+        version: NoteVersion | None = None,
     ) -> DBNoteDTO | None:
-        """Update"""
+        """Update, a stale version misses like a foreign note in the same statement"""
+
+        title = bindparam("new_title", updated_note.title.to_raw(), String)
+        values: dict[str, Any] = {
+            "title": title,
+            "version": Note.version + 1,
+            "search_vector": retitled_search_vector(title),
+        }
+
+        if updated_note.text:
+            plain_text = bindparam("new_text", updated_note.text.to_raw(), String)
+            text = self.text_codec.encode(updated_note.text.to_raw())
+            # a bound value used twice is sent once
+            values["text"] = plain_text if text.codec is None else None
+            values["text_compressed"] = text.compressed
+            values["text_codec"] = text.codec
+            values["search_vector"] = search_vector(title, plain_text)
 
         q = (
             update(Note)
             .where(Note.note_id == note_id.to_raw())
+            .where(Note.author_id == updated_note.author_id.to_raw())
+            .values(**values)
+            .returning(*DB_NOTE_COLUMNS)
+        )
+
+        if version is not None:
+            q = q.where(Note.version == version.to_raw())
+
+        res = await self.session.execute(q)
+
+        note: tuple[int, str, str | None, bytes | None, str | None, int] | None = (
+            res.first()  # type:ignore
+        )
+
+        if not note:
+            return None
+
+        return note_db_data_to_db_note_dto(note)
+
+    async def update_many(
+        self, author_id: UserId, notes: list[tuple[NoteId, NoteEntity]],
+    ) -> list[DBNoteDTO]:
+        """Update in one statement joined with the new values"""
+
+        if not notes:
+            return []
+
+        rows = []
+
+        for note_id, note in notes:
+            plain_text = note.text.to_raw() if note.text else None
+            text = self.text_codec.encode(plain_text)
+            rows.append(
+                (
+                    note_id.to_raw(),
+                    note.title.to_raw(),
+                    note.text is not None,
+                    text.text,
+                    text.compressed,
+                    text.codec,
+                    plain_text if text.codec is not None else None,
+                ),
+            )
+
+        batch = values(
+            column("note_id", Integer),
+            column("title", String),
+            column("has_text", Boolean),
+            column("text", String),
+            column("text_compressed", LargeBinary),
+            column("text_codec", String),
+            column("search_text", String),
+            name="batch",
+        ).data(rows)
+
+        q = (
+            update(Note)
+            .where(Note.note_id == batch.c.note_id)
+            .where(Note.author_id == author_id.to_raw())
             .values(
-                title=updated_note.title.to_raw(),
-                text=updated_note.text.to_raw() if updated_note.text else None,
+                # the stored text is replaced as a whole or kept as a whole
+                title=batch.c.title,
+                text=case((batch.c.has_text, batch.c.text), else_=Note.text),
+                # VALUES of only NULLs are resolved as text, not bytea
+                text_compressed=case(
+                    (batch.c.has_text, cast(batch.c.text_compressed, LargeBinary)),
+                    else_=Note.text_compressed,
+                ),
+                text_codec=case(
+                    (batch.c.has_text, batch.c.text_codec),
+                    else_=Note.text_codec,
+                ),
+                search_vector=case(
+                    (
+                        batch.c.has_text,
+                        search_vector(
+                            batch.c.title,
+                            func.coalesce(batch.c.search_text, batch.c.text),
+                        ),
+                    ),
+                    else_=retitled_search_vector(batch.c.title),
+                ),
+                version=Note.version + 1,
             )
-            .returning(
-                Note.note_id,
-                Note.title,
-                Note.text,
+            .returning(*DB_NOTE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+
+        res = await self.session.execute(q)
+
+        return [note_db_data_to_db_note_dto(note) for note in res.all()]  # type:ignore
+
+    async def delete_many(
+        self, author_id: UserId, note_ids: list[NoteId],
+    ) -> list[int]:
+        """Delete in one statement"""
+
+        if not note_ids:
+            return []
+
+        q = (
+            delete(Note)
+            .where(Note.note_id.in_([note_id.to_raw() for note_id in note_ids]))
+            .where(Note.author_id == author_id.to_raw())
+            .returning(Note.note_id)
+            .execution_options(synchronize_session=False)
+        )
+
+        res = await self.session.execute(q)
+
+        return list(res.scalars().all())
+
+    async def get_generation(self, author_id: UserId) -> int:
+        """Kept by the triggers on notes"""
+
+        q = select(AuthorNoteStats.generation).where(
+            AuthorNoteStats.author_id == author_id.to_raw(),
+        )
+
+        res = await self.session.execute(q)
+
+        return res.scalar() or 0
+
+    async def get_stats(
+        self, author_id: UserId, lock: bool = False,
+    ) -> AuthorNotesStatsDTO:
+        """Kept by the triggers on notes, locking waits for the running writes"""
+
+        q = select(
+            AuthorNoteStats.generation,
+            AuthorNoteStats.note_count,
+            AuthorNoteStats.text_bytes,
+        ).where(AuthorNoteStats.author_id == author_id.to_raw())
+
+        if lock:
+            # a missing row locks nothing, the first writes would not queue
+            await self.session.execute(
+                pg_insert(AuthorNoteStats)
+                .values(
+                    author_id=author_id.to_raw(),
+                    generation=func.nextval("author_note_generation_seq"),
+                )
+                .on_conflict_do_nothing(),
             )
+            q = q.with_for_update()
+
+        res = await self.session.execute(q)
+        stats = res.one_or_none()
+
+        if stats is None:
+            return AuthorNotesStatsDTO()
+
+        return AuthorNotesStatsDTO(
+            generation=stats.generation,
+            note_count=stats.note_count,
+            text_bytes=stats.text_bytes,
+        )
+
+    async def get_text_bytes(
+        self, author_id: UserId, note_ids: list[NoteId],
+    ) -> dict[int, int]:
+        """Counted like the triggers count them, compressed texts are compressed"""
+
+        if not note_ids:
+            return {}
+
+        q = select(
+            Note.note_id,
+            func.coalesce(func.octet_length(Note.text), 0)
+            + func.coalesce(func.octet_length(Note.text_compressed), 0),
+        ).where(
+            Note.author_id == author_id.to_raw(),
+            Note.note_id.in_([note_id.to_raw() for note_id in note_ids]),
         )
 
         res = await self.session.execute(q)
 
-        note: tuple[int, str, str | None] | None = res.first()  # type:ignore
+        return {note_id: text_bytes for note_id, text_bytes in res.all()}
 
-        if not note:
+    async def recode_texts(
+        self,
+        after: tuple[int, UUID] | None,
+        limit: int,
+        decompress: bool = False,
+    ) -> tuple[tuple[int, UUID], int] | None:
+        """
+        Store the next batch of texts with the codec, or back as is when decompress.
+
+        For the background migration, returns the last visited (note_id,
+        author_id) and how many texts were changed, None when nothing is left.
+        Moved notes keep their ids, so a note_id alone is not unique in a shard.
+        """
+
+        q = (
+            select(Note.note_id, Note.author_id, *STORED_TEXT_COLUMNS)
+            .order_by(Note.note_id, Note.author_id)
+            .limit(limit)
+            .with_for_update()
+        )
+
+        if after is not None:
+            q = q.where(tuple_(Note.note_id, Note.author_id) > tuple_(*after))
+
+        if decompress:
+            q = q.where(Note.text_codec.is_not(None))
+        elif self.text_codec.threshold_bytes is not None:
+            q = q.where(Note.text_codec.is_(None)).where(
+                func.octet_length(Note.text) > self.text_codec.threshold_bytes,
+            )
+        else:
             return None
 
-        return note_db_data_to_db_note_dto(note)
+        notes = (await self.session.execute(q)).all()
+
+        if not notes:
+            return None
+
+        rows = []
+
+        for note_id, author_id, *stored in notes:
+            text = decode_text(*stored)
+            new = StoredText(text=text) if decompress else self.text_codec.encode(text)
+
+            if new.codec != stored[2]:
+                rows.append((note_id, author_id, new.text, new.compressed, new.codec))
+
+        if rows:
+            batch = values(
+                column("note_id", Integer),
+                column("author_id", Uuid),
+                column("text", String),
+                column("text_compressed", LargeBinary),
+                column("text_codec", String),
+                name="batch",
+            ).data(rows)
+
+            await self.session.execute(
+                update(Note)
+                .where(Note.note_id == batch.c.note_id)
+                .where(Note.author_id == batch.c.author_id)
+                .values(
+                    text=batch.c.text,
+                    text_compressed=cast(batch.c.text_compressed, LargeBinary),
+                    text_codec=batch.c.text_codec,
+                )
+                .execution_options(synchronize_session=False),
+            )
+
+        last = notes[-1]
+
+        return (last.note_id, last.author_id), len(rows)
+
+    async def suggest(
+        self, author_id: UserId, query: str, limit: int,
+    ) -> list[ListNoteDTO]:
+        """
+        KNN by the word similarity distance `<<->`.
+
+        The GiST index on (author_id, title) yields the nearest titles first,
+        so only limit rows are read however many titles match a little.
+        """
+
+        distance = literal(query, String).op("<<->", return_type=Float)(Note.title)
+
+        q = (
+            select(Note.title, Note.note_id, distance.label("distance"))
+            .where(Note.author_id == author_id.to_raw())
+            .order_by(distance)
+            .limit(limit)
+        )
+
+        res = await self.session.execute(q)
+
+        return [
+            ListNoteDTO(title=note.title, note_id=note.note_id)
+            for note in res.all()
+            if note.distance <= SUGGEST_MAX_DISTANCE
+        ]
+
+    async def export(self, author_id: UserId) -> AsyncIterator[list[ExportNoteDTO]]:
+        """Stream through a server-side cursor, EXPORT_YIELD_PER rows at a time"""
 
-    async def list(self, limit: int, offset: int, author_id: UserId) -> ListNotesDTO:
+        q = (
+            select(
+                Note.note_id,
+                Note.title,
+                *STORED_TEXT_COLUMNS,
+                Note.created_at,
+            )
+            .where(Note.author_id == author_id.to_raw())
+            .order_by(Note.created_at, Note.note_id)
+            .execution_options(yield_per=EXPORT_YIELD_PER)
+        )
+
+        res = await self.session.stream(q)
+
+        async for notes in res.partitions():
+            yield [
+                note_db_data_to_export_note_dto(note)  # type:ignore
+                for note in notes
+            ]
+
+    async def list(
+        self,
+        limit: int,
+        offset: int,
+        author_id: UserId,
+        cursor: str | None = None,
+        fields: frozenset[NoteListField] = frozenset(),
+        preview_chars: int = 100,
+    ) -> ListNotesDTO:
         """List"""
 
         q = (
-            select(Note.title, Note.note_id)
+            select(
+                Note.title,
+                Note.note_id,
+                Note.created_at,
+                *detail_columns(fields, preview_chars),
+            )
             .where(Note.author_id == author_id.to_raw())
             .limit(limit + 1)
-            .offset(offset)
-            .order_by(Note.created_at)
+            .order_by(Note.created_at, Note.note_id)
         )
 
+        if cursor:
+            after = decode_list_cursor(cursor)
+            q = q.where(
+                tuple_(Note.created_at, Note.note_id)
+                > tuple_(after.created_at, after.note_id),
+            )
+        else:
+            q = q.offset(offset)
+
         res = await self.session.execute(q)
         db_notes = res.all()
 
-        notes = notes_to_dto(db_notes)
+        has_next = len(db_notes) > limit
+        db_notes = db_notes[:limit]
 
-        has_next = False
+        next_cursor = None
 
-        if len(notes) > limit:
-            has_next = True
-
-            notes.pop()
+        if has_next and db_notes:
+            last = db_notes[-1]
+            next_cursor = encode_list_cursor(
+                ListCursor(created_at=last.created_at, note_id=last.note_id),
+            )
 
-        return ListNotesDTO(notes=notes, has_next=has_next)
+        return ListNotesDTO(
+            notes=notes_to_dto(db_notes, fields, preview_chars),
+            has_next=has_next,
+            next_cursor=next_cursor,
+        )
 
     async def search(
-        self, query: str, limit: int, offset: int, author_id: UserId,
+        self,
+        query: str,
+        limit: int,
+        offset: int,
+        author_id: UserId,
+        cursor: str | None = None,
+        mode: SearchMode = SearchMode.FUZZY,
+        fields: frozenset[NoteListField] = frozenset(),
+        preview_chars: int = 100,
     ) -> ListNotesDTO:
         """FTS"""
 
-        columns = func.coalesce(Note.title, "")
-        columns = columns.self_group()  # type:ignore
-
-        await self.session.execute(text("SET pg_trgm.similarity_threshold=0.2"))
+        if mode is SearchMode.FULLTEXT:
+            ts_query = func.websearch_to_tsquery(
+                literal_column(f"'{FTS_CONFIG}'::regconfig"), query,
+            )
+            score = func.ts_rank_cd(Note.search_vector, ts_query, type_=Float)
+            match = Note.search_vector.bool_op("@@")(ts_query)
+            cursor_kind = FULLTEXT_CURSOR_KIND
+        else:
+            columns = func.coalesce(Note.title, "")
+            columns = columns.self_group()  # type:ignore
+            score = func.similarity(columns, query, type_=Float)
+            match = columns.bool_op("%")(query)
+            # `%` uses pg_trgm.similarity_threshold of the connection (see DB config)
+            cursor_kind = SEARCH_CURSOR_KIND
 
         q = (
-            select(Note.title, Note.note_id, func.similarity(columns, query))
+            select(
+                Note.title,
+                Note.note_id,
+                Note.created_at,
+                score.label("score"),
+                *detail_columns(fields, preview_chars),
+            )
             .where(Note.author_id == author_id.to_raw())
-            .where(columns.bool_op("%")(query))
+            .where(match)
             .limit(limit + 1)
-            .offset(offset)
-            .order_by(func.similarity(columns, query).desc())
-            .order_by(Note.created_at)
+            .order_by(score.desc(), Note.created_at, Note.note_id)
         )
 
+        if cursor:
+            after = decode_search_cursor(cursor, cursor_kind)
+            # (-score, created_at, note_id) grows the same way as the ordering
+            q = q.where(
+                tuple_(-score, Note.created_at, Note.note_id)
+                > tuple_(-after.score, after.created_at, after.note_id),
+            )
+        else:
+            q = q.offset(offset)
+
         res = await self.session.execute(q)
         db_notes = res.all()
 
-        notes = notes_to_dto(db_notes)
+        has_next = len(db_notes) > limit
+        db_notes = db_notes[:limit]
 
-        has_next = False
+        next_cursor = None
 
-        if len(notes) > limit:
-            has_next = True
-
-            notes.pop()
+        if has_next and db_notes:
+            last = db_notes[-1]
+            next_cursor = encode_search_cursor(
+                SearchCursor(
+                    score=last.score,
+                    created_at=last.created_at,
+                    note_id=last.note_id,
+                ),
+                cursor_kind,
+            )
 
-        return ListNotesDTO(notes=notes, has_next=has_next)
+        return ListNotesDTO(
+            notes=notes_to_dto(db_notes, fields, preview_chars),
+            has_next=has_next,
+            next_cursor=next_cursor,
+        )
 
-    async def delete(self, note_id: NoteId) -> None:
+    async def delete(self, note_id: NoteId, author_id: UserId) -> bool:
         """Delete"""
 
-        q = delete(Note).where(Note.note_id == note_id.to_raw())
+        q = (
+            delete(Note)
+            .where(Note.note_id == note_id.to_raw())
+            .where(Note.author_id == author_id.to_raw())
+            .returning(Note.note_id)
+        )
+
+        res = await self.session.execute(q)
 
-        await self.session.execute(q)
+        return res.first() is not None
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+
+import brotli
+
+BROTLI_CODEC = "br"
+
+
+@dataclass(frozen=True, slots=True)
+class StoredText:
+    """The note text as it is kept in the text, text_compressed and text_codec"""
+
+    text: str | None = None
+    compressed: bytes | None = None
+    codec: str | None = None
+
+
+class NoteTextCodec:
+    """
+    Storage codec of the note text.
+
+    Texts longer than threshold_bytes are kept Brotli-compressed,
+    no threshold means texts are always kept as is.
+    """
+
+    def __init__(self, threshold_bytes: int | None = None, quality: int = 5):
+        self.threshold_bytes = threshold_bytes
+        self.quality = quality
+
+    def encode(self, text: str | None) -> StoredText:
+        if not text or self.threshold_bytes is None:
+            return StoredText(text=text)
+
+        raw = text.encode()
+
+        if len(raw) <= self.threshold_bytes:
+            return StoredText(text=text)
+
+        compressed = brotli.compress(raw, mode=brotli.MODE_TEXT, quality=self.quality)
+
+        if len(compressed) >= len(raw):
+            return StoredText(text=text)
+
+        return StoredText(compressed=compressed, codec=BROTLI_CODEC)
+
+
+def decode_text(
+    text: str | None, compressed: bytes | None, codec: str | None,
+) -> str | None:
+    if codec is None:
+        return text
+    if codec == BROTLI_CODEC and compressed is not None:
+        return brotli.decompress(compressed).decode()
+
+    raise ValueError(f"Unknown note text codec {codec}")
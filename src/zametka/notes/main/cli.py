@@ -0,0 +1,217 @@
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from aiohttp import ClientError
+
+from zametka.notes.application.note.dto import ImportNotesInputDTO
+from zametka.notes.application.note.import_notes import ImportNotes
+from zametka.notes.application.note.quota import NoteQuota
+from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.access_api_client import AccessAPIClient
+from zametka.notes.infrastructure.access_token import AccessTokenVerifier
+from zametka.notes.infrastructure.access_transport import create_access_transport
+from zametka.notes.infrastructure.cache.identity_cache import IdentityCache
+from zametka.notes.infrastructure.config_loader import Settings, load_settings
+from zametka.notes.infrastructure.db.provider import get_note_repository, get_uow
+from zametka.notes.infrastructure.db.sharding import create_shard_router, move_author
+from zametka.notes.infrastructure.id_provider import (
+    JWTIdProvider,
+    RawIdProvider,
+    TokenIdProvider,
+)
+from zametka.notes.infrastructure.repositories.text_codec import NoteTextCodec
+from zametka.notes.presentation.note_import import ImportFormat, read_notes
+
+FILE_CHUNK_SIZE = 1024 * 1024
+RECODE_BATCH_SIZE = 1000
+BENCHMARK_PAGE_SIZE = 50
+
+
+def get_text_codec(settings: Settings) -> NoteTextCodec:
+    return NoteTextCodec(
+        threshold_bytes=settings.note_storage.compress_threshold_bytes,
+        quality=settings.note_storage.brotli_quality,
+    )
+
+
+def get_note_quota(settings: Settings) -> NoteQuota:
+    return NoteQuota(
+        max_notes=settings.note_quota.max_notes,
+        max_text_bytes=settings.note_quota.max_text_bytes,
+    )
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+async def import_notes(
+    path: Path, author_id: UUID, import_format: ImportFormat,
+) -> None:
+    settings = load_settings()
+
+    async with create_shard_router(settings.sharding) as shard_router:
+        session_factory = await shard_router.session_factory(author_id)
+
+        async with session_factory() as session:
+            interactor = ImportNotes(
+                note_repository=get_note_repository(session, get_text_codec(settings)),
+                uow=get_uow(session),
+                id_provider=RawIdProvider(UserId(author_id)),
+                quota=get_note_quota(settings),
+            )
+            rows = read_notes(read_file(path), import_format)
+
+            async for progress in await interactor(ImportNotesInputDTO(notes=rows)):
+                for error in progress.errors:
+                    print(f">> Line {error.line}: {error.error}")
+
+                print(f">> Imported: {progress.imported}, failed: {progress.failed}")
+
+
+async def recode_notes(decompress: bool) -> None:
+    """Compress the stored texts over the threshold, or decompress all of them"""
+
+    settings = load_settings()
+    text_codec = get_text_codec(settings)
+
+    if not decompress and text_codec.threshold_bytes is None:
+        print(">> NOTES_COMPRESS_THRESHOLD_BYTES is not set.")
+        return
+
+    async with create_shard_router(settings.sharding) as shard_router:
+        for shard, session_factory in enumerate(shard_router.session_factories):
+            async with session_factory() as session:
+                note_repository = get_note_repository(session, text_codec)
+                last: tuple[int, UUID] | None = None
+                recoded = 0
+
+                while batch := await note_repository.recode_texts(
+                    last, RECODE_BATCH_SIZE, decompress,
+                ):
+                    last, batch_recoded = batch
+                    recoded += batch_recoded
+                    await session.commit()
+
+                    print(
+                        f">> Shard {shard}, recoded: {recoded}, "
+                        f"last note id: {last[0]}",
+                    )
+
+                await session.commit()
+
+
+async def move_notes(author_id: UUID, target: int) -> None:
+    """Move the author to another shard, see DEPLOYMENT.md"""
+
+    settings = load_settings()
+
+    if not 0 <= target < len(settings.sharding.shards):
+        print(f">> There are {len(settings.sharding.shards)} shards.")
+        return
+
+    async with create_shard_router(settings.sharding) as shard_router:
+        moved = await move_author(shard_router, author_id, target)
+
+    print(f">> Moved notes: {moved}")
+
+
+async def _measure(
+    name: str, call: Callable[[], Awaitable[Any]], seconds: float,
+) -> None:
+    count = 0
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+
+    while time.perf_counter() - started < seconds:
+        await call()
+        count += 1
+
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    print(
+        f">> {name}: {count / elapsed:.0f} req/s, "
+        f"{elapsed / count * 1000:.3f} ms/req, "
+        f"{count / cpu:.0f} req/s per CPU second of this process",
+    )
+
+
+async def benchmark_repositories(author_id: UUID, seconds: float) -> None:
+    """The hot reads of the author one after another, with and without asyncpg"""
+
+    settings = load_settings()
+    user_id = UserId(author_id)
+
+    async with create_shard_router(settings.sharding) as shard_router:
+        session_factory = await shard_router.session_factory(author_id)
+
+        for name, asyncpg_reads in (("sqlalchemy", False), ("asyncpg", True)):
+            async with session_factory() as session:
+                note_repository = get_note_repository(
+                    session, get_text_codec(settings), asyncpg_reads,
+                )
+                page = await note_repository.list(BENCHMARK_PAGE_SIZE, 0, user_id)
+
+                if not page.notes:
+                    print(">> The author has no notes.")
+                    return
+
+                note_id = NoteId(page.notes[0].note_id)
+
+                await _measure(
+                    f"{name} list",
+                    partial(note_repository.list, BENCHMARK_PAGE_SIZE, 0, user_id),
+                    seconds,
+                )
+                await _measure(
+                    f"{name} read",
+                    partial(note_repository.get, note_id, user_id),
+                    seconds,
+                )
+
+
+async def benchmark_auth(access_token: str, seconds: float) -> None:
+    """Resolving the user of a request, by the access service and locally"""
+
+    settings = load_settings()
+
+    if settings.access_token is None:
+        print(">> Set NOTES_JWT_KEY to verify the tokens locally.")
+        return
+
+    verifier = AccessTokenVerifier(settings.access_token)
+
+    async with create_access_transport(settings.access_client) as transport:
+        api_client = AccessAPIClient(access_token, transport)
+
+        identity_cache = IdentityCache(settings.identity_cache)
+
+        try:
+            await _measure(
+                "access service",
+                lambda: TokenIdProvider(api_client).get_user_id(),
+                seconds,
+            )
+            await _measure(
+                "access service, cached",
+                lambda: TokenIdProvider(api_client, identity_cache).get_user_id(),
+                seconds,
+            )
+        except (ClientError, TimeoutError) as exc:
+            print(f">> The access service is not reachable: {exc!r}")
+
+        print(f">> Pool: {transport.stats}")
+
+    await _measure(
+        "local",
+        lambda: JWTIdProvider(verifier, access_token).get_user_id(),
+        seconds,
+    )
@@ -1,10 +1,16 @@
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from zametka.notes.application.common.id_provider import IdProvider
+from zametka.notes.application.common.note_cache import NoteCache
+from zametka.notes.application.common.search_cache import SearchCache
+from zametka.notes.application.common.suggestion_cache import SuggestionCache
+from zametka.notes.application.note.import_notes import ImportNotes
 from zametka.notes.application.note.note_interactor import NoteInteractor
+from zametka.notes.application.note.quota import NoteQuota
+from zametka.notes.application.note.suggest_notes import SuggestNotes
 from zametka.notes.application.user.create_user import CreateUser
 from zametka.notes.application.user.get_user import GetUser
 from zametka.notes.domain.services.note_service import NoteService
@@ -14,6 +20,9 @@ from zametka.notes.infrastructure.db.provider import (
     get_uow,
     get_user_repository,
 )
+from zametka.notes.infrastructure.db.replicas import ReadYourWrites
+from zametka.notes.infrastructure.db.sharding import ShardRouter
+from zametka.notes.infrastructure.repositories.text_codec import NoteTextCodec
 from zametka.notes.presentation.interactor_factory import (
     GInputDTO,
     GOutputDTO,
@@ -26,16 +35,74 @@ from zametka.notes.presentation.interactor_factory import (
 class IoC(InteractorFactory):
     def __init__(
         self,
-        session_factory: async_sessionmaker[AsyncSession],
+        shard_router: ShardRouter,
+        note_cache: NoteCache,
+        text_codec: NoteTextCodec,
+        search_cache: SearchCache,
+        suggestion_cache: SuggestionCache,
+        asyncpg_reads: bool = False,
+        quota: NoteQuota | None = None,
     ):
-        self._session_factory = session_factory
+        self._shard_router = shard_router
+        self._note_cache = note_cache
+        self._text_codec = text_codec
+        self._search_cache = search_cache
+        self._suggestion_cache = suggestion_cache
+        self._asyncpg_reads = asyncpg_reads
+        self._quota = quota
         self._note_service = NoteService()
         self._user_service = UserService()
 
+    @asynccontextmanager
+    async def _session(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncIterator[AsyncSession]:
+        """
+        A session on the shard of the user.
+
+        The user then reads from the shard a while in this process, and from
+        the replicas that have replayed the writes in any other.
+        """
+
+        user_id = (await id_provider.get_user_id()).to_raw()
+        session_factory = await self._shard_router.session_factory(user_id)
+
+        try:
+            async with session_factory() as session:
+                yield session
+
+                if read_your_writes is not None:
+                    written = await self._shard_router.written_lsn(user_id, session)
+
+                    if written is not None:
+                        read_your_writes.wrote(written)
+        finally:
+            self._shard_router.stick_to_primary(user_id)
+
+    @asynccontextmanager
+    async def _read_session(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncIterator[AsyncSession]:
+        """A session on a replica of the shard of the user, if it is fresh"""
+
+        user_id = (await id_provider.get_user_id()).to_raw()
+        session_factory = await self._shard_router.read_session_factory(
+            user_id, read_your_writes.written if read_your_writes else None,
+        )
+
+        async with session_factory() as session:
+            yield session
+
     def _construct_note_interactor(
         self, session: AsyncSession, id_provider: IdProvider,
     ) -> NoteInteractor:
-        note_repository = get_note_repository(session)
+        note_repository = get_note_repository(
+            session, self._text_codec, self._asyncpg_reads,
+        )
         uow = get_uow(session)
 
         note_service = self._note_service
@@ -45,6 +112,9 @@ class IoC(InteractorFactory):
             uow=uow,
             note_service=note_service,
             id_provider=id_provider,
+            note_cache=self._note_cache,
+            search_cache=self._search_cache,
+            quota=self._quota,
         )
 
     @asynccontextmanager
@@ -52,14 +122,61 @@ class IoC(InteractorFactory):
         self,
         id_provider: IdProvider,
         picker: InteractorPicker[GInputDTO, GOutputDTO],
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncIterator[InteractorCallable[GInputDTO, GOutputDTO]]:
+        async with self._session(id_provider, read_your_writes) as session:
+            interactor = self._construct_note_interactor(session, id_provider)
+            yield picker(interactor)
+
+    @asynccontextmanager
+    async def pick_note_reader(
+        self,
+        id_provider: IdProvider,
+        picker: InteractorPicker[GInputDTO, GOutputDTO],
+        read_your_writes: ReadYourWrites | None = None,
     ) -> AsyncIterator[InteractorCallable[GInputDTO, GOutputDTO]]:
-        async with self._session_factory() as session:
+        async with self._read_session(id_provider, read_your_writes) as session:
             interactor = self._construct_note_interactor(session, id_provider)
             yield picker(interactor)
 
     @asynccontextmanager
-    async def create_user(self, id_provider: IdProvider) -> AsyncIterator[CreateUser]:
-        async with self._session_factory() as session:
+    async def import_notes(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncIterator[ImportNotes]:
+        async with self._session(id_provider, read_your_writes) as session:
+            interactor = ImportNotes(
+                note_repository=get_note_repository(session, self._text_codec),
+                uow=get_uow(session),
+                id_provider=id_provider,
+                quota=self._quota,
+            )
+
+            yield interactor
+
+    @asynccontextmanager
+    async def suggest_notes(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncIterator[SuggestNotes]:
+        async with self._read_session(id_provider, read_your_writes) as session:
+            interactor = SuggestNotes(
+                note_repository=get_note_repository(session, self._text_codec),
+                id_provider=id_provider,
+                suggestion_cache=self._suggestion_cache,
+            )
+
+            yield interactor
+
+    @asynccontextmanager
+    async def create_user(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncIterator[CreateUser]:
+        async with self._session(id_provider, read_your_writes) as session:
             interactor = CreateUser(
                 user_repository=get_user_repository(session),
                 uow=get_uow(session),
@@ -70,8 +187,12 @@ class IoC(InteractorFactory):
             yield interactor
 
     @asynccontextmanager
-    async def get_user(self, id_provider: IdProvider) -> AsyncIterator[GetUser]:
-        async with self._session_factory() as session:
+    async def get_user(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncIterator[GetUser]:
+        async with self._read_session(id_provider, read_your_writes) as session:
             interactor = GetUser(
                 user_repository=get_user_repository(session),
                 id_provider=id_provider,
@@ -1,25 +1,38 @@
 import logging
 
+from aiohttp import ClientError
 from asyncpg import UniqueViolationError
 from fastapi import FastAPI
 
+from zametka.notes.application.common.id_provider import IdProvider
 from zametka.notes.domain.exceptions.note import (
     NoteAccessDeniedError,
     NoteDataError,
     NoteNotExistsError,
+    NoteQuotaExceededError,
+    NoteVersionConflictError,
 )
 from zametka.notes.domain.exceptions.user import (
     IsNotAuthorizedError,
     UserDataError,
     UserIsNotExistsError,
 )
+from zametka.notes.infrastructure.access_token import AccessTokenVerifier
+from zametka.notes.infrastructure.config_loader import AccessTokenConfig
+from zametka.notes.presentation.web_api.dependencies import (
+    get_jwt_id_provider,
+    get_token_id_provider,
+)
 from zametka.notes.presentation.web_api.endpoints import note, user
 from zametka.notes.presentation.web_api.exception_handlers.note import (
     note_access_denied_exception_handler,
     note_data_exception_handler,
     note_not_exists_exception_handler,
+    note_quota_exceeded_exception_handler,
+    note_version_conflict_exception_handler,
 )
 from zametka.notes.presentation.web_api.exception_handlers.user import (
+    access_service_unavailable_exception_handler,
     is_not_authorized_exception_handler,
     unique_exception_handler,
     user_data_exception_handler,
@@ -36,6 +49,25 @@ def include_routers(app: FastAPI) -> None:
     app.include_router(user.router)
 
 
+def include_id_provider(
+    app: FastAPI, access_token: AccessTokenConfig | None,
+) -> None:
+    """Verify the access tokens locally if configured, else ask the access service"""
+
+    if access_token is None:
+        logging.info("Access tokens are checked by the access service.")
+
+        app.dependency_overrides[IdProvider] = get_token_id_provider
+        return
+
+    logging.info("Access tokens are verified locally.")
+
+    verifier = AccessTokenVerifier(access_token)
+
+    app.dependency_overrides[AccessTokenVerifier] = lambda: verifier
+    app.dependency_overrides[IdProvider] = get_jwt_id_provider
+
+
 def include_exception_handlers(app: FastAPI) -> None:
     """Include exceptions handlers to the bootstrap app"""
 
@@ -46,9 +78,22 @@ def include_exception_handlers(app: FastAPI) -> None:
     )
     app.add_exception_handler(NoteNotExistsError, note_not_exists_exception_handler)
     app.add_exception_handler(NoteDataError, note_data_exception_handler)
+    app.add_exception_handler(
+        NoteVersionConflictError, note_version_conflict_exception_handler,
+    )
+    app.add_exception_handler(
+        NoteQuotaExceededError, note_quota_exceeded_exception_handler,
+    )
     app.add_exception_handler(UserDataError, user_data_exception_handler)
     app.add_exception_handler(
         UserIsNotExistsError, user_is_not_exists_exception_handler,
     )
     app.add_exception_handler(IsNotAuthorizedError, is_not_authorized_exception_handler)
     app.add_exception_handler(UniqueViolationError, unique_exception_handler)
+    # the access service is slow or down, the request may be retried
+    app.add_exception_handler(
+        TimeoutError, access_service_unavailable_exception_handler,
+    )
+    app.add_exception_handler(
+        ClientError, access_service_unavailable_exception_handler,
+    )
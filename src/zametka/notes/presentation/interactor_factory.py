@@ -3,9 +3,12 @@ from collections.abc import Awaitable, Callable
 from typing import AsyncContextManager, TypeAlias, TypeVar
 
 from zametka.notes.application.common.id_provider import IdProvider
+from zametka.notes.application.note.import_notes import ImportNotes
 from zametka.notes.application.note.note_interactor import NoteInteractor
+from zametka.notes.application.note.suggest_notes import SuggestNotes
 from zametka.notes.application.user.create_user import CreateUser
 from zametka.notes.application.user.get_user import GetUser
+from zametka.notes.infrastructure.db.replicas import ReadYourWrites
 
 # G means generic
 GInputDTO = TypeVar("GInputDTO")
@@ -18,18 +21,59 @@ InteractorPicker: TypeAlias = Callable[
 
 
 class InteractorFactory(ABC):
+    """
+    read_your_writes carries the last write of the user between requests,
+    the writing methods update it and the reading ones wait for it.
+    """
+
     @abstractmethod
     def pick_note_interactor(
         self,
         id_provider: IdProvider,
         picker: InteractorPicker[GInputDTO, GOutputDTO],
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncContextManager[InteractorCallable[GInputDTO, GOutputDTO]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def pick_note_reader(
+        self,
+        id_provider: IdProvider,
+        picker: InteractorPicker[GInputDTO, GOutputDTO],
+        read_your_writes: ReadYourWrites | None = None,
     ) -> AsyncContextManager[InteractorCallable[GInputDTO, GOutputDTO]]:
+        """Same for the methods that only read, they may be served by a replica"""
+
         raise NotImplementedError
 
     @abstractmethod
-    def create_user(self, id_provider: IdProvider) -> AsyncContextManager[CreateUser]:
+    def import_notes(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncContextManager[ImportNotes]:
         raise NotImplementedError
 
     @abstractmethod
-    def get_user(self, id_provider: IdProvider) -> AsyncContextManager[GetUser]:
+    def suggest_notes(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncContextManager[SuggestNotes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_user(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncContextManager[CreateUser]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_user(
+        self,
+        id_provider: IdProvider,
+        read_your_writes: ReadYourWrites | None = None,
+    ) -> AsyncContextManager[GetUser]:
         raise NotImplementedError
@@ -0,0 +1,136 @@
+"""Readers of the note import formats, shared by the CLI and the web API"""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from zametka.notes.application.note.dto import ImportNoteDTO, ImportNoteErrorDTO
+
+INVALID_ROW_ERROR = "Некорректная строка!"
+
+ImportRow = ImportNoteDTO | ImportNoteErrorDTO
+
+
+class ImportFormat(Enum):
+    NDJSON = "ndjson"  # {"title": ..., "text": ..., "created_at": ...} per line
+    CSV = "csv"  # header with title, text and created_at columns
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split an utf-8 byte stream into lines without the line breaks"""
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    tail = ""
+
+    async for chunk in chunks:
+        *lines, tail = (tail + decoder.decode(chunk)).split("\n")
+
+        for line in lines:
+            yield line.removesuffix("\r")
+
+    tail += decoder.decode(b"", final=True)
+
+    if tail:
+        yield tail.removesuffix("\r")
+
+
+def _parse_created_at(value: Any) -> datetime | None:
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(value)
+
+    created_at = datetime.fromisoformat(value)
+
+    if created_at.tzinfo:
+        # notes are stored in naive local time
+        created_at = created_at.astimezone().replace(tzinfo=None)
+
+    return created_at
+
+
+def _to_row(line: int, raw: Any) -> ImportRow:
+    if not isinstance(raw, dict):
+        return ImportNoteErrorDTO(line=line, error=INVALID_ROW_ERROR)
+
+    title = raw.get("title")
+    text = raw.get("text") or None
+
+    if not isinstance(title, str) or not isinstance(text, str | None):
+        return ImportNoteErrorDTO(line=line, error=INVALID_ROW_ERROR)
+
+    try:
+        created_at = _parse_created_at(raw.get("created_at"))
+    except ValueError:
+        return ImportNoteErrorDTO(line=line, error="Некорректная дата создания!")
+
+    return ImportNoteDTO(line=line, title=title, text=text, created_at=created_at)
+
+
+async def read_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[ImportRow]:
+    line_number = 0
+
+    async for line in lines:
+        line_number += 1
+
+        if not line.strip():
+            continue
+
+        try:
+            raw = json.loads(line)
+        except ValueError:
+            yield ImportNoteErrorDTO(line=line_number, error=INVALID_ROW_ERROR)
+            continue
+
+        yield _to_row(line_number, raw)
+
+
+async def read_csv(lines: AsyncIterable[str]) -> AsyncIterator[ImportRow]:
+    header: list[str] | None = None
+    record: list[str] = []
+    quotes = 0
+    line_number = 0
+    start = 0
+
+    async for line in lines:
+        line_number += 1
+
+        if not record:
+            start = line_number
+
+        # a quoted field may span several lines, wait until the quotes are closed
+        record.append(line)
+        quotes += line.count('"')
+
+        if quotes % 2:
+            continue
+
+        try:
+            values = next(csv.reader(["\n".join(record)]), [])
+        except csv.Error:
+            values = None
+
+        record, quotes = [], 0
+
+        if values is None:
+            yield ImportNoteErrorDTO(line=start, error=INVALID_ROW_ERROR)
+        elif header is None:
+            header = values
+        elif values:
+            yield _to_row(start, dict(zip(header, values, strict=False)))
+
+    if record:
+        yield ImportNoteErrorDTO(line=start, error=INVALID_ROW_ERROR)
+
+
+def read_notes(
+    chunks: AsyncIterable[bytes], import_format: ImportFormat,
+) -> AsyncIterator[ImportRow]:
+    if import_format is ImportFormat.CSV:
+        return read_csv(iter_lines(chunks))
+
+    return read_ndjson(iter_lines(chunks))
@@ -1,3 +1,3 @@
-from .id_provider import get_token_id_provider
+from .id_provider import get_jwt_id_provider, get_token_id_provider
 
-__all__ = ["get_token_id_provider"]
+__all__ = ["get_jwt_id_provider", "get_token_id_provider"]
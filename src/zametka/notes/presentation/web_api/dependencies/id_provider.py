@@ -1,12 +1,15 @@
 from typing import Annotated
 
-from aiohttp import ClientSession
 from fastapi import Cookie, Depends, Request
 
 from zametka.notes.domain.exceptions.user import IsNotAuthorizedError
 from zametka.notes.domain.value_objects.user.user_id import UserId
 from zametka.notes.infrastructure.access_api_client import AccessAPIClient
+from zametka.notes.infrastructure.access_token import AccessTokenVerifier
+from zametka.notes.infrastructure.access_transport import AccessTransport
+from zametka.notes.infrastructure.cache.identity_cache import IdentityCache
 from zametka.notes.infrastructure.id_provider import (
+    JWTIdProvider,
     RawIdProvider,
     TokenIdProvider,
 )
@@ -14,34 +17,57 @@ from zametka.notes.presentation.web_api.dependencies.stub import Stub
 from zametka.notes.presentation.web_api.schemas.user import IdentitySchema
 
 
+CSRF_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
 async def get_token_id_provider(
     request: Request,
-    aiohttp_session: Annotated[ClientSession, Depends(Stub(ClientSession))],
+    transport: Annotated[AccessTransport, Depends(Stub(AccessTransport))],
+    identity_cache: Annotated[IdentityCache, Depends(Stub(IdentityCache))],
     csrf_access_token: Annotated[str | None, Cookie()] = None,
     access_token_cookie: Annotated[str | None, Cookie()] = None,
 ) -> TokenIdProvider:
-    csrf_methods = {"POST", "PUT", "PATCH", "DELETE"}
-
     if not access_token_cookie:
         raise IsNotAuthorizedError()
 
-    api_client = AccessAPIClient(access_token_cookie, session=aiohttp_session)
+    api_client = AccessAPIClient(access_token_cookie, transport)
 
-    if request.method in csrf_methods:
+    if request.method in CSRF_METHODS:
         if not csrf_access_token:
             raise IsNotAuthorizedError()
 
         api_client = AccessAPIClient(
-            access_token_cookie, aiohttp_session, csrf_access_token,
+            access_token_cookie, transport, csrf_access_token,
         )
         await api_client.ensure_can_edit(
             headers={"X-CSRF-Token": request.headers.get("X-CSRF-Token", "")},
         )
 
-    id_provider = TokenIdProvider(api_client)
+    id_provider = TokenIdProvider(api_client, identity_cache)
 
     return id_provider
 
 
+async def get_jwt_id_provider(
+    request: Request,
+    verifier: Annotated[AccessTokenVerifier, Depends(Stub(AccessTokenVerifier))],
+    csrf_access_token: Annotated[str | None, Cookie()] = None,
+    access_token_cookie: Annotated[str | None, Cookie()] = None,
+) -> JWTIdProvider:
+    """Like get_token_id_provider, but without the requests to the access service"""
+
+    if not access_token_cookie:
+        raise IsNotAuthorizedError()
+
+    if request.method in CSRF_METHODS:
+        verifier.ensure_can_edit(
+            access_token_cookie,
+            csrf_access_token,
+            request.headers.get("X-CSRF-Token"),
+        )
+
+    return JWTIdProvider(verifier, access_token_cookie)
+
+
 async def get_raw_id_provider(identity_data: IdentitySchema) -> RawIdProvider:
     return RawIdProvider(user_id=UserId(identity_data.identity_id))
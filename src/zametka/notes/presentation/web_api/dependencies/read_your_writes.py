@@ -0,0 +1,29 @@
+import math
+from typing import Annotated
+
+from fastapi import Cookie, Depends, Response
+
+from zametka.notes.infrastructure.config_loader import ReplicaConfig
+from zametka.notes.infrastructure.db.replicas import ReadYourWrites, WrittenLSN
+from zametka.notes.presentation.web_api.dependencies.stub import Stub
+
+WRITTEN_LSN_COOKIE = "notes_written_lsn"
+
+
+async def get_read_your_writes(
+    response: Response,
+    replica_config: Annotated[ReplicaConfig, Depends(Stub(ReplicaConfig))],
+    notes_written_lsn: Annotated[str | None, Cookie()] = None,
+) -> ReadYourWrites:
+    """The last write of the user from the cookie, a new write replaces it"""
+
+    def remember(written: WrittenLSN) -> None:
+        response.set_cookie(
+            WRITTEN_LSN_COOKIE,
+            written.to_cookie(),
+            max_age=math.ceil(replica_config.sticky_seconds),
+            httponly=True,
+            samesite="lax",
+        )
+
+    return ReadYourWrites(WrittenLSN.from_cookie(notes_written_lsn), remember)
@@ -1,18 +1,58 @@
 
-from fastapi import APIRouter, Depends
+import json
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from zametka.notes.application.common.id_provider import IdProvider
 from zametka.notes.application.note.dto import (
+    BatchNotesInputDTO,
+    BatchNotesResultDTO,
     CreateNoteInputDTO,
     DBNoteDTO,
     DeleteNoteInputDTO,
+    ExportNoteDTO,
+    ExportNotesInputDTO,
+    ImportNoteErrorDTO,
+    ImportNotesInputDTO,
+    ImportNotesProgressDTO,
     ListNotesDTO,
     ListNotesInputDTO,
+    NoteListField,
+    NoteSuggestionsDTO,
     ReadNoteInputDTO,
+    SearchMode,
+    SuggestNotesInputDTO,
     UpdateNoteInputDTO,
 )
+from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.infrastructure.db.replicas import ReadYourWrites
 from zametka.notes.presentation.interactor_factory import InteractorFactory
-from zametka.notes.presentation.web_api.schemas.note import NoteSchema
+from zametka.notes.presentation.note_import import ImportFormat, read_notes
+from zametka.notes.presentation.web_api.dependencies.read_your_writes import (
+    get_read_your_writes,
+)
+from zametka.notes.presentation.web_api.etag import (
+    etag_matches,
+    if_match_version,
+    make_etag,
+    not_modified,
+    note_etag,
+    set_etag,
+)
+from zametka.notes.presentation.web_api.schemas.note import (
+    BatchNotesSchema,
+    CreateNoteOperationSchema,
+    NoteSchema,
+    UpdateNoteOperationSchema,
+)
+
+MAX_REPORTED_IMPORT_ERRORS = 100
+MAX_PREVIEW_CHARS = 1000
 
 router = APIRouter(
     prefix="/notes",
@@ -26,8 +66,11 @@ async def create(
     note: NoteSchema,
     ioc: InteractorFactory = Depends(),
     id_provider: IdProvider = Depends(),
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
 ) -> DBNoteDTO:
-    async with ioc.pick_note_interactor(id_provider, lambda i: i.create) as interactor:
+    async with ioc.pick_note_interactor(
+        id_provider, lambda i: i.create, read_your_writes,
+    ) as interactor:
         response = await interactor(
             CreateNoteInputDTO(
                 text=note.text,
@@ -38,62 +81,251 @@ async def create(
         return response
 
 
-@router.get("/{note_id}")
+@router.post("/batch")
+async def batch(
+    data: BatchNotesSchema,
+    ioc: InteractorFactory = Depends(),
+    id_provider: IdProvider = Depends(),
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
+) -> BatchNotesResultDTO:
+    operations: list[CreateNoteInputDTO | UpdateNoteInputDTO | DeleteNoteInputDTO] = []
+
+    for operation in data.operations:
+        if isinstance(operation, CreateNoteOperationSchema):
+            operations.append(
+                CreateNoteInputDTO(title=operation.title, text=operation.text),
+            )
+        elif isinstance(operation, UpdateNoteOperationSchema):
+            operations.append(
+                UpdateNoteInputDTO(
+                    note_id=operation.note_id,
+                    title=operation.title,
+                    text=operation.text,
+                ),
+            )
+        else:
+            operations.append(DeleteNoteInputDTO(note_id=operation.note_id))
+
+    async with ioc.pick_note_interactor(
+        id_provider, lambda i: i.batch, read_your_writes,
+    ) as interactor:
+        response = await interactor(BatchNotesInputDTO(operations=operations))
+
+        return response
+
+
+@router.post("/import")
+async def import_notes(
+    request: Request,
+    import_format: ImportFormat = ImportFormat.NDJSON,
+    ioc: InteractorFactory = Depends(),
+    id_provider: IdProvider = Depends(),
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
+) -> ImportNotesProgressDTO:
+    rows = read_notes(request.stream(), import_format)
+    errors: list[ImportNoteErrorDTO] = []
+    progress = ImportNotesProgressDTO(imported=0, failed=0, errors=errors)
+
+    async with ioc.import_notes(id_provider, read_your_writes) as interactor:
+        async for progress in await interactor(ImportNotesInputDTO(notes=rows)):
+            errors.extend(progress.errors)
+            del errors[MAX_REPORTED_IMPORT_ERRORS:]
+
+    return ImportNotesProgressDTO(
+        imported=progress.imported, failed=progress.failed, errors=errors,
+    )
+
+
+def _export_lines(notes: list[ExportNoteDTO]) -> str:
+    return "".join(
+        json.dumps(
+            {
+                "note_id": note.note_id,
+                "title": note.title,
+                "text": note.text,
+                "created_at": note.created_at.isoformat(),
+            },
+            ensure_ascii=False,
+        )
+        + "\n"
+        for note in notes
+    )
+
+
+@router.get("/export")
+async def export(
+    ioc: InteractorFactory = Depends(),
+    id_provider: IdProvider = Depends(),
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
+) -> StreamingResponse:
+    # The session has to outlive the handler, it is closed when the stream ends
+    stack = AsyncExitStack()
+
+    async with stack:
+        interactor = await stack.enter_async_context(
+            ioc.pick_note_reader(id_provider, lambda i: i.export, read_your_writes),
+        )
+        notes = await interactor(ExportNotesInputDTO())
+        stack = stack.pop_all()
+
+    async def stream() -> AsyncIterator[str]:
+        async with stack:
+            async for batch in notes:
+                yield _export_lines(batch)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/suggest")
+async def suggest(
+    query: str = Query(min_length=1, max_length=NoteTitle.MAX_LENGTH),
+    ioc: InteractorFactory = Depends(),
+    id_provider: IdProvider = Depends(),
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
+) -> NoteSuggestionsDTO:
+    async with ioc.suggest_notes(id_provider, read_your_writes) as interactor:
+        return await interactor(SuggestNotesInputDTO(query=query))
+
+
+@router.get("/{note_id}", response_model=DBNoteDTO)
 async def read(
     note_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
     ioc: InteractorFactory = Depends(),
     id_provider: IdProvider = Depends(),
-) -> DBNoteDTO:
-    async with ioc.pick_note_interactor(id_provider, lambda i: i.read) as interactor:
-        response = await interactor(
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
+) -> DBNoteDTO | Response:
+    async with ioc.pick_note_reader(
+        id_provider, lambda i: i.read, read_your_writes,
+    ) as interactor:
+        note = await interactor(
             ReadNoteInputDTO(
                 note_id=note_id,
             ),
         )
 
-        return response
+    etag = note_etag(note.note_id, note.version)
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
 
+    return note
 
-@router.put("/{note_id}")
+
+@router.put("/{note_id}", responses={412: {"description": "Stale If-Match"}})
 async def update(
     new_note: NoteSchema,
     note_id: int,
+    response: Response,
+    if_match: str | None = Header(None),
     ioc: InteractorFactory = Depends(),
     id_provider: IdProvider = Depends(),
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
 ) -> DBNoteDTO:
-    async with ioc.pick_note_interactor(id_provider, lambda i: i.update) as interactor:
-        response = await interactor(
+    version = if_match_version(if_match, note_id)
+
+    async with ioc.pick_note_interactor(
+        id_provider, lambda i: i.update, read_your_writes,
+    ) as interactor:
+        note = await interactor(
             UpdateNoteInputDTO(
                 note_id=note_id,
                 title=new_note.title,
                 text=new_note.text,
+                version=version,
             ),
         )
 
-        return response
+    set_etag(response, note_etag(note.note_id, note.version))
+
+    return note
+
+
+def _list_content(
+    notes: ListNotesDTO, fields: frozenset[NoteListField],
+) -> dict[str, Any]:
+    """Only the requested fields of the notes, the rest are not serialized"""
 
+    names = [
+        "title",
+        "note_id",
+        *(field.value for field in NoteListField if field in fields),
+    ]
 
-@router.get("/")
+    return jsonable_encoder(
+        {
+            "notes": [
+                {name: getattr(note, name) for name in names} for note in notes.notes
+            ],
+            "has_next": notes.has_next,
+            "next_cursor": notes.next_cursor,
+            "total": notes.total,
+            "bytes_used": notes.bytes_used,
+        },
+    )
+
+
+@router.get(
+    "/", response_model=ListNotesDTO, response_model_exclude={"generation"},
+)
 async def list_notes(
     limit: int,
-    offset: int,
-    search: str | None = None,
+    response: Response,
+    offset: int = 0,
+    search: str | None = Query(None, max_length=NoteTitle.MAX_LENGTH),
+    search_mode: SearchMode = SearchMode.FUZZY,
+    cursor: str | None = None,
+    fields: list[NoteListField] = Query([]),
+    preview_chars: int = Query(100, ge=1, le=MAX_PREVIEW_CHARS),
+    if_none_match: str | None = Header(None),
     ioc: InteractorFactory = Depends(),
     id_provider: IdProvider = Depends(),
-) -> ListNotesDTO:
-    if search and len(search) > 50:
-        raise ValueError("Слишком длинный поисковый запрос!")
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
+) -> ListNotesDTO | Response:
+    requested_fields = frozenset(fields)
 
-    async with ioc.pick_note_interactor(id_provider, lambda i: i.list) as interactor:
-        response = await interactor(
+    async with ioc.pick_note_reader(
+        id_provider, lambda i: i.list, read_your_writes,
+    ) as interactor:
+        notes = await interactor(
             ListNotesInputDTO(
                 limit=limit,
                 offset=offset,
                 search=search,
+                search_mode=search_mode,
+                cursor=cursor,
+                fields=requested_fields,
+                preview_chars=preview_chars,
             ),
         )
 
-        return response
+    # the generation of the same read, the ETag is never newer than the page
+    etag = make_etag(
+        notes.generation,
+        limit,
+        offset,
+        search,
+        search_mode.value,
+        cursor,
+        sorted(field.value for field in requested_fields),
+        preview_chars if NoteListField.PREVIEW in requested_fields else None,
+    )
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+
+    if not requested_fields:
+        return notes
+
+    details = JSONResponse(_list_content(notes, requested_fields))
+    set_etag(details, etag)
+
+    return details
 
 
 @router.delete("/{note_id}")
@@ -101,8 +333,11 @@ async def delete(
     note_id: int,
     ioc: InteractorFactory = Depends(),
     id_provider: IdProvider = Depends(),
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
 ) -> None:
-    async with ioc.pick_note_interactor(id_provider, lambda i: i.delete) as interactor:
+    async with ioc.pick_note_interactor(
+        id_provider, lambda i: i.delete, read_your_writes,
+    ) as interactor:
         await interactor(
             DeleteNoteInputDTO(
                 note_id=note_id,
@@ -5,10 +5,14 @@ from fastapi import APIRouter, Depends
 from zametka.notes.application.common.id_provider import IdProvider
 from zametka.notes.application.user.create_user import CreateUserInputDTO
 from zametka.notes.application.user.dto import UserDTO
+from zametka.notes.infrastructure.db.replicas import ReadYourWrites
 from zametka.notes.presentation.interactor_factory import InteractorFactory
 from zametka.notes.presentation.web_api.dependencies.id_provider import (
     get_raw_id_provider,
 )
+from zametka.notes.presentation.web_api.dependencies.read_your_writes import (
+    get_read_your_writes,
+)
 from zametka.notes.presentation.web_api.schemas.user import UserSchema
 
 router = APIRouter(
@@ -22,9 +26,10 @@ router = APIRouter(
 async def create_user(
     data: UserSchema,
     id_provider: Annotated[IdProvider, Depends(get_raw_id_provider)],
+    read_your_writes: Annotated[ReadYourWrites, Depends(get_read_your_writes)],
     ioc: InteractorFactory = Depends(),
 ) -> UserDTO:
-    async with ioc.create_user(id_provider) as interactor:
+    async with ioc.create_user(id_provider, read_your_writes) as interactor:
         response = await interactor(
             CreateUserInputDTO(
                 first_name=data.first_name,
@@ -38,9 +43,10 @@ async def create_user(
 @router.get("/me")
 async def get_user(
     id_provider: IdProvider = Depends(),
+    read_your_writes: ReadYourWrites = Depends(get_read_your_writes),
     ioc: InteractorFactory = Depends(),
 ) -> UserDTO:
-    async with ioc.get_user(id_provider) as interactor:
+    async with ioc.get_user(id_provider, read_your_writes) as interactor:
         response = await interactor()
 
     return response
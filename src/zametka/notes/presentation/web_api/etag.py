@@ -0,0 +1,70 @@
+import hashlib
+
+from fastapi import Response
+
+from zametka.notes.domain.exceptions.note import NoteVersionConflictError
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag of the given parts"""
+
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+    return f'"{digest}"'
+
+
+def note_etag(note_id: int, version: int) -> str:
+    """Names the version of the note, so If-Match can be checked by the database"""
+
+    return f'"{note_id}.{version}"'
+
+
+def if_match_version(if_match: str | None, note_id: int) -> int | None:
+    """
+    Version of the note expected by If-Match, None when any version will do.
+
+    Weak tags are accepted too, the compression middleware weakens the ETags.
+    """
+
+    if not if_match or if_match.strip() == "*":
+        return None
+
+    for candidate in if_match.split(","):
+        tag = candidate.strip().removeprefix("W/").strip('"')
+        tag_note_id, _, version = tag.partition(".")
+
+        if tag_note_id == str(note_id) and version.isdigit():
+            return int(version)
+
+    raise NoteVersionConflictError("Заметка уже изменена!")
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison, the compression middleware weakens the ETags it encodes"""
+
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    tag = etag.removeprefix("W/")
+
+    return any(
+        candidate.strip().removeprefix("W/") == tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+
+    return response
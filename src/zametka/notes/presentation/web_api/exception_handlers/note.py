@@ -5,6 +5,8 @@ from zametka.notes.domain.exceptions.note import (
     NoteAccessDeniedError,
     NoteDataError,
     NoteNotExistsError,
+    NoteQuotaExceededError,
+    NoteVersionConflictError,
 )
 
 
@@ -30,3 +32,15 @@ async def note_data_exception_handler(
     _request: Request, exc: NoteDataError,
 ) -> JSONResponse:
     return JSONResponse(status_code=422, content={"detail": exc.message})
+
+
+async def note_version_conflict_exception_handler(
+    _request: Request, exc: NoteVersionConflictError,
+) -> JSONResponse:
+    return JSONResponse(status_code=412, content={"detail": exc.message})
+
+
+async def note_quota_exceeded_exception_handler(
+    _request: Request, exc: NoteQuotaExceededError,
+) -> JSONResponse:
+    return JSONResponse(status_code=403, content={"detail": exc.message})
@@ -1,3 +1,4 @@
+from aiohttp import ClientError
 from asyncpg import UniqueViolationError
 from fastapi import Request, responses
 
@@ -37,3 +38,11 @@ async def is_not_authorized_exception_handler(
     return responses.JSONResponse(
         status_code=401, content={"detail": "Вы не авторизованы"},
     )
+
+
+async def access_service_unavailable_exception_handler(
+    _request: Request, _exc: TimeoutError | ClientError,
+) -> responses.JSONResponse:
+    return responses.JSONResponse(
+        status_code=503, content={"detail": "Сервис временно недоступен"},
+    )
@@ -1,7 +1,32 @@
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class NoteSchema(BaseModel):
     title: str
     text: str | None = None
+
+
+class CreateNoteOperationSchema(NoteSchema):
+    op: Literal["create"]
+
+
+class UpdateNoteOperationSchema(NoteSchema):
+    op: Literal["update"]
+    note_id: int
+
+
+class DeleteNoteOperationSchema(BaseModel):
+    op: Literal["delete"]
+    note_id: int
+
+
+NoteOperationSchema = Annotated[
+    CreateNoteOperationSchema | UpdateNoteOperationSchema | DeleteNoteOperationSchema,
+    Field(discriminator="op"),
+]
+
+
+class BatchNotesSchema(BaseModel):
+    operations: list[NoteOperationSchema]
@@ -0,0 +1,10 @@
+from zametka.notes.application.common.id_provider import IdProvider
+from zametka.notes.domain.value_objects.user.user_id import UserId
+
+
+class FakeIdProvider(IdProvider):
+    def __init__(self, user_id: UserId):
+        self.user_id = user_id
+
+    async def get_user_id(self) -> UserId:
+        return self.user_id
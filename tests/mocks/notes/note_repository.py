@@ -0,0 +1,256 @@
+from collections.abc import AsyncIterator
+
+from zametka.notes.application.common.repository import NoteRepository
+from zametka.notes.application.note.dto import (
+    AuthorNotesStatsDTO,
+    DBNoteDTO,
+    ExportNoteDTO,
+    ListNoteDetailsDTO,
+    ListNoteDTO,
+    ListNotesDTO,
+    NoteListField,
+    SearchMode,
+)
+from zametka.notes.domain.entities.note import DBNote, Note
+from zametka.notes.domain.exceptions.note import NotesNotSavedError
+from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.note.note_version import NoteVersion
+from zametka.notes.domain.value_objects.user.user_id import UserId
+
+
+def to_dto(note: DBNote) -> DBNoteDTO:
+    return DBNoteDTO(
+        note_id=note.note_id.to_raw(),
+        title=note.title.to_raw(),
+        text=note.text.to_raw() if note.text else None,
+        version=note.version.to_raw(),
+    )
+
+
+class FakeNoteRepository(NoteRepository):
+    export_batch_size = 2
+
+    def __init__(self):
+        self.notes: dict[int, DBNote] = {}
+        self.next_id = 1
+        self.get_calls = 0
+        self.copy_calls = 0
+        self.suggest_calls = 0
+        self.search_calls = 0
+        self.generation = 0
+        self.stats_locks = 0
+        self.broken_titles: set[str] = set()
+
+    async def create(self, note: Note) -> DBNoteDTO:
+        db_note = DBNote(
+            title=note.title,
+            author_id=note.author_id,
+            note_id=NoteId(self.next_id),
+            text=note.text,
+            created_at=note.created_at,
+        )
+        self.notes[self.next_id] = db_note
+        self.next_id += 1
+        self.generation += 1
+
+        return to_dto(db_note)
+
+    async def create_many(self, notes: list[Note]) -> list[DBNoteDTO]:
+        return [await self.create(note) for note in notes]
+
+    async def copy_many(self, notes: list[Note]) -> None:
+        self.copy_calls += 1
+
+        if any(note.title.to_raw() in self.broken_titles for note in notes):
+            raise NotesNotSavedError("Не удалось сохранить заметки!")
+
+        for note in notes:
+            await self.create(note)
+
+    async def get(self, note_id: NoteId, author_id: UserId) -> DBNote | None:
+        self.get_calls += 1
+        note = self.notes.get(note_id.to_raw())
+
+        if not note or note.author_id != author_id:
+            return None
+
+        return note
+
+    async def get_author_id(self, note_id: NoteId) -> UserId | None:
+        note = self.notes.get(note_id.to_raw())
+        return note.author_id if note else None
+
+    async def get_author_ids(self, note_ids: list[NoteId]) -> dict[int, UserId]:
+        return {
+            note_id.to_raw(): self.notes[note_id.to_raw()].author_id
+            for note_id in note_ids
+            if note_id.to_raw() in self.notes
+        }
+
+    async def update(
+        self,
+        note_id: NoteId,
+        updated_note: Note,
+        version: NoteVersion | None = None,
+    ) -> DBNoteDTO | None:
+        note = self.notes.get(note_id.to_raw())
+
+        if not note or note.author_id != updated_note.author_id:
+            return None
+        # like the WHERE of the UPDATE, no expected version matches any
+        if version is not None and version != note.version:
+            return None
+
+        merged = note.merge(updated_note)
+        merged.version = NoteVersion(note.version.to_raw() + 1)
+        self.notes[note_id.to_raw()] = merged
+        self.generation += 1
+
+        return to_dto(merged)
+
+    async def update_many(
+        self, author_id: UserId, notes: list[tuple[NoteId, Note]],
+    ) -> list[DBNoteDTO]:
+        updated = [await self.update(note_id, note) for note_id, note in notes]
+        return [note for note in updated if note]
+
+    async def delete_many(
+        self, author_id: UserId, note_ids: list[NoteId],
+    ) -> list[int]:
+        return [
+            note_id.to_raw()
+            for note_id in note_ids
+            if await self.delete(note_id, author_id)
+        ]
+
+    async def get_generation(self, author_id: UserId) -> int:
+        return self.generation
+
+    async def get_stats(
+        self, author_id: UserId, lock: bool = False,
+    ) -> AuthorNotesStatsDTO:
+        self.stats_locks += lock
+        texts = [
+            note.text.to_raw() if note.text else ""
+            for note in self.notes.values()
+            if note.author_id == author_id
+        ]
+
+        return AuthorNotesStatsDTO(
+            generation=self.generation,
+            note_count=len(texts),
+            text_bytes=sum(len(text.encode()) for text in texts),
+        )
+
+    async def get_text_bytes(
+        self, author_id: UserId, note_ids: list[NoteId],
+    ) -> dict[int, int]:
+        notes = [self.notes.get(note_id.to_raw()) for note_id in note_ids]
+
+        return {
+            note.note_id.to_raw(): (
+                len(note.text.to_raw().encode()) if note.text else 0
+            )
+            for note in notes
+            if note and note.author_id == author_id
+        }
+
+    async def suggest(
+        self, author_id: UserId, query: str, limit: int,
+    ) -> list[ListNoteDTO]:
+        self.suggest_calls += 1
+
+        return [
+            ListNoteDTO(title=note.title.to_raw(), note_id=note.note_id.to_raw())
+            for note in self.notes.values()
+            if note.author_id == author_id and query in note.title.to_raw().lower()
+        ][:limit]
+
+    async def export(self, author_id: UserId) -> AsyncIterator[list[ExportNoteDTO]]:
+        notes = [
+            ExportNoteDTO(
+                note_id=note.note_id.to_raw(),
+                title=note.title.to_raw(),
+                text=note.text.to_raw() if note.text else None,
+                created_at=note.created_at.to_raw(),
+            )
+            for note in self.notes.values()
+            if note.author_id == author_id
+        ]
+
+        for start in range(0, len(notes), self.export_batch_size):
+            yield notes[start : start + self.export_batch_size]
+
+    @staticmethod
+    def _list_note(
+        note: DBNote, fields: frozenset[NoteListField], preview_chars: int,
+    ) -> ListNoteDTO:
+        if not fields:
+            return ListNoteDTO(title=note.title.to_raw(), note_id=note.note_id.to_raw())
+
+        text = note.text.to_raw() if note.text else ""
+
+        return ListNoteDetailsDTO(
+            title=note.title.to_raw(),
+            note_id=note.note_id.to_raw(),
+            preview=text[:preview_chars] if NoteListField.PREVIEW in fields else None,
+            created_at=(
+                note.created_at.to_raw()
+                if NoteListField.CREATED_AT in fields
+                else None
+            ),
+            text_length=len(text) if NoteListField.TEXT_LENGTH in fields else None,
+        )
+
+    def _page(
+        self,
+        author_id: UserId,
+        limit: int,
+        offset: int,
+        fields: frozenset[NoteListField],
+        preview_chars: int,
+    ) -> ListNotesDTO:
+        notes = [
+            self._list_note(note, fields, preview_chars)
+            for note in self.notes.values()
+            if note.author_id == author_id
+        ]
+        page = notes[offset : offset + limit]
+
+        return ListNotesDTO(notes=page, has_next=len(notes) > offset + limit)
+
+    async def list(
+        self,
+        limit: int,
+        offset: int,
+        author_id: UserId,
+        cursor: str | None = None,
+        fields: frozenset[NoteListField] = frozenset(),
+        preview_chars: int = 100,
+    ) -> ListNotesDTO:
+        return self._page(author_id, limit, offset, fields, preview_chars)
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        offset: int,
+        author_id: UserId,
+        cursor: str | None = None,
+        mode: SearchMode = SearchMode.FUZZY,
+        fields: frozenset[NoteListField] = frozenset(),
+        preview_chars: int = 100,
+    ) -> ListNotesDTO:
+        self.search_calls += 1
+        return self._page(author_id, limit, offset, fields, preview_chars)
+
+    async def delete(self, note_id: NoteId, author_id: UserId) -> bool:
+        note = self.notes.get(note_id.to_raw())
+
+        if not note or note.author_id != author_id:
+            return False
+
+        del self.notes[note_id.to_raw()]
+        self.generation += 1
+
+        return True
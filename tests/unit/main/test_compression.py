@@ -0,0 +1,124 @@
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from zametka.main.compression import (
+    CompressionMiddleware,
+    choose_encoding,
+    skip_compression,
+)
+
+LARGE_TEXT = "Очень длинная заметка. " * 200
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    async def large() -> PlainTextResponse:
+        return PlainTextResponse(LARGE_TEXT, headers={"ETag": '"1"'})
+
+    @app.get("/private")
+    async def private() -> PlainTextResponse:
+        return PlainTextResponse(
+            LARGE_TEXT, headers={"ETag": '"1"', "Cache-Control": "private"},
+        )
+
+    @app.get("/small")
+    async def small() -> PlainTextResponse:
+        return PlainTextResponse("Коротко")
+
+    @app.get("/skipped")
+    @skip_compression
+    async def skipped() -> PlainTextResponse:
+        return PlainTextResponse(LARGE_TEXT)
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def lines():
+            for _ in range(3):
+                yield LARGE_TEXT
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+@pytest.fixture
+def middleware_app() -> FastAPI:
+    return create_app()
+
+
+@pytest.fixture
+def client(middleware_app: FastAPI) -> TestClient:
+    return TestClient(middleware_app)
+
+
+@pytest.mark.parametrize(
+    ["accept_encoding", "encoding"],
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "br"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+    ],
+)
+def test_choose_encoding(accept_encoding: str, encoding: str | None):
+    assert choose_encoding(accept_encoding) == encoding
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+def test_compressed(client: TestClient, encoding: str):
+    response = client.get("/large", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"1"'
+    assert int(response.headers["Content-Length"]) < len(LARGE_TEXT.encode())
+    assert response.text == LARGE_TEXT
+
+
+@pytest.mark.parametrize("path", ["/small", "/skipped"])
+def test_not_compressed(client: TestClient, path: str):
+    response = client.get(path, headers={"Accept-Encoding": "br"})
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_streamed(client: TestClient):
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "br"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert "Content-Length" not in response.headers
+    assert brotli.decompress(raw).decode() == LARGE_TEXT * 3
+
+
+def get_middleware(app: FastAPI) -> CompressionMiddleware:
+    middleware = app.middleware_stack
+    while not isinstance(middleware, CompressionMiddleware):
+        middleware = middleware.app
+
+    return middleware
+
+
+def test_cached(middleware_app: FastAPI, client: TestClient):
+    client.get("/large", headers={"Accept-Encoding": "br"})
+    client.get("/large", headers={"Accept-Encoding": "br"})
+
+    assert get_middleware(middleware_app).cache.stats.hits == 1
+
+
+def test_private_cached_per_credentials(middleware_app: FastAPI, client: TestClient):
+    for token in ("first", "second", "first"):
+        client.get(
+            "/private",
+            headers={"Accept-Encoding": "br", "Authorization": f"Bearer {token}"},
+        )
+
+    assert get_middleware(middleware_app).cache.stats.hits == 1
@@ -0,0 +1,62 @@
+from uuid import uuid4
+
+import pytest
+from zametka.notes.application.note.note_interactor import NoteInteractor
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.cache.note_cache import LRUNoteCache
+from zametka.notes.infrastructure.cache.search_cache import LRUSearchCache
+from zametka.notes.infrastructure.config_loader import (
+    NoteCacheConfig,
+    SearchCacheConfig,
+)
+
+from tests.mocks.notes.id_provider import FakeIdProvider
+from tests.mocks.notes.note_repository import FakeNoteRepository
+from tests.mocks.notes.uow import FakeUoW
+
+
+@pytest.fixture
+def user_id() -> UserId:
+    return UserId(uuid4())
+
+
+@pytest.fixture
+def note_repository() -> FakeNoteRepository:
+    return FakeNoteRepository()
+
+
+@pytest.fixture
+def uow() -> FakeUoW:
+    return FakeUoW()
+
+
+@pytest.fixture
+def id_provider(user_id: UserId) -> FakeIdProvider:
+    return FakeIdProvider(user_id)
+
+
+@pytest.fixture
+def note_cache() -> LRUNoteCache:
+    return LRUNoteCache(NoteCacheConfig())
+
+
+@pytest.fixture
+def search_cache() -> LRUSearchCache:
+    return LRUSearchCache(SearchCacheConfig())
+
+
+@pytest.fixture
+def note_interactor(
+    note_repository: FakeNoteRepository,
+    uow: FakeUoW,
+    id_provider: FakeIdProvider,
+    note_cache: LRUNoteCache,
+    search_cache: LRUSearchCache,
+) -> NoteInteractor:
+    return NoteInteractor(
+        note_repository=note_repository,
+        uow=uow,
+        id_provider=id_provider,
+        note_cache=note_cache,
+        search_cache=search_cache,
+    )
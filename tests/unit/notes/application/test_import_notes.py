@@ -0,0 +1,137 @@
+from collections.abc import AsyncIterator
+
+import pytest
+from zametka.notes.application.common.uow import UoW
+from zametka.notes.application.note.dto import (
+    ImportNoteDTO,
+    ImportNoteErrorDTO,
+    ImportNotesInputDTO,
+)
+from zametka.notes.application.note.import_notes import ImportNotes
+from zametka.notes.application.note.quota import NoteQuota
+
+from tests.mocks.notes.id_provider import FakeIdProvider
+from tests.mocks.notes.note_repository import FakeNoteRepository
+
+
+class CountingUoW(UoW):
+    """Import commits every chunk, so the same uow is used many times"""
+
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+    async def flush(self) -> None:
+        pass
+
+
+async def rows(
+    *items: ImportNoteDTO | ImportNoteErrorDTO,
+) -> AsyncIterator[ImportNoteDTO | ImportNoteErrorDTO]:
+    for item in items:
+        yield item
+
+
+@pytest.fixture
+def counting_uow() -> CountingUoW:
+    return CountingUoW()
+
+
+@pytest.fixture
+def import_notes(
+    note_repository: FakeNoteRepository,
+    counting_uow: CountingUoW,
+    id_provider: FakeIdProvider,
+) -> ImportNotes:
+    interactor = ImportNotes(
+        note_repository=note_repository,
+        uow=counting_uow,
+        id_provider=id_provider,
+    )
+    interactor.CHUNK_SIZE = 2
+
+    return interactor
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_import_in_chunks(
+    import_notes: ImportNotes,
+    note_repository: FakeNoteRepository,
+    counting_uow: CountingUoW,
+) -> None:
+    note_repository.broken_titles.add("Сломана")
+
+    progress = [
+        item
+        async for item in await import_notes(
+            ImportNotesInputDTO(
+                notes=rows(
+                    ImportNoteDTO(line=1, title="Первая"),
+                    ImportNoteDTO(line=2, title="Вторая", text="Текст"),
+                    ImportNoteDTO(line=3, title=" "),
+                    ImportNoteErrorDTO(line=4, error="Некорректная строка!"),
+                    ImportNoteDTO(line=5, title="Сломана"),
+                ),
+            ),
+        )
+    ]
+
+    assert [(item.imported, item.failed) for item in progress] == [
+        (2, 0),
+        (2, 2),
+        (2, 3),
+    ]
+    assert [error.line for error in progress[1].errors] == [3, 4]
+    assert progress[2].errors[0].line == 5
+    assert note_repository.copy_calls == 2
+    assert len(note_repository.notes) == 2
+    assert counting_uow.commits == 1
+    assert counting_uow.rollbacks == 1
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_import_nothing(import_notes: ImportNotes) -> None:
+    progress = [
+        item async for item in await import_notes(ImportNotesInputDTO(notes=rows()))
+    ]
+
+    assert [(item.imported, item.failed) for item in progress] == [(0, 0)]
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_import_over_quota(
+    import_notes: ImportNotes,
+    note_repository: FakeNoteRepository,
+    counting_uow: CountingUoW,
+) -> None:
+    import_notes.quota = NoteQuota(max_notes=3)
+
+    progress = [
+        item
+        async for item in await import_notes(
+            ImportNotesInputDTO(
+                notes=rows(
+                    *(ImportNoteDTO(line=line, title="Заметка") for line in range(5)),
+                ),
+            ),
+        )
+    ]
+
+    assert [(item.imported, item.failed) for item in progress] == [
+        (2, 0),
+        (2, 2),
+        (3, 2),
+    ]
+    assert "3 заметок" in progress[1].errors[0].error
+    assert len(note_repository.notes) == 3
+    assert note_repository.stats_locks == 3
+    assert counting_uow.rollbacks == 1
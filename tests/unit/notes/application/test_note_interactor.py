@@ -0,0 +1,506 @@
+from uuid import uuid4
+
+import pytest
+from zametka.notes.application.note.dto import (
+    BatchNotesInputDTO,
+    BatchNoteStatus,
+    CreateNoteInputDTO,
+    DeleteNoteInputDTO,
+    ExportNotesInputDTO,
+    ListNoteDetailsDTO,
+    ListNotesInputDTO,
+    NoteListField,
+    ReadNoteInputDTO,
+    UpdateNoteInputDTO,
+)
+from zametka.notes.application.note.note_interactor import NoteInteractor
+from zametka.notes.application.note.quota import NoteQuota
+from zametka.notes.domain.entities.note import Note
+from zametka.notes.domain.exceptions.note import (
+    NoteAccessDeniedError,
+    NoteNotExistsError,
+    NoteQuotaExceededError,
+    NoteVersionConflictError,
+    TooManyNoteOperationsError,
+)
+from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.domain.value_objects.user.user_id import UserId
+
+from zametka.notes.infrastructure.cache.note_cache import LRUNoteCache
+from zametka.notes.infrastructure.cache.search_cache import LRUSearchCache
+
+from tests.mocks.notes.id_provider import FakeIdProvider
+from tests.mocks.notes.note_repository import FakeNoteRepository
+from tests.mocks.notes.uow import FakeUoW
+
+
+async def create_foreign_note(note_repository: FakeNoteRepository) -> int:
+    note = Note(NoteTitle("Чужая заметка"), UserId(uuid4()))
+    dto = await note_repository.create(note)
+    return dto.note_id
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_update_keeps_text(
+    note_interactor: NoteInteractor,
+    uow: FakeUoW,
+) -> None:
+    created = await note_interactor.create(
+        CreateNoteInputDTO(title="Заметка", text="Текст"),
+    )
+
+    updated = await note_interactor.update(
+        UpdateNoteInputDTO(note_id=created.note_id, title="Новое название"),
+    )
+
+    assert updated.title == "Новое название"
+    assert updated.text == "Текст"
+    assert uow.committed
+
+
+@pytest.mark.notes
+@pytest.mark.application
+@pytest.mark.parametrize(
+    ["is_foreign", "exc_class"],
+    [
+        (True, NoteAccessDeniedError),
+        (False, NoteNotExistsError),
+    ],
+)
+async def test_update_miss(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    is_foreign: bool,
+    exc_class,
+) -> None:
+    note_id = await create_foreign_note(note_repository) if is_foreign else 100
+
+    with pytest.raises(exc_class):
+        await note_interactor.update(
+            UpdateNoteInputDTO(note_id=note_id, title="Название"),
+        )
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_update_version(
+    note_interactor: NoteInteractor,
+    uow: FakeUoW,
+) -> None:
+    created = await note_interactor.create(CreateNoteInputDTO(title="Заметка"))
+
+    updated = await note_interactor.update(
+        UpdateNoteInputDTO(
+            note_id=created.note_id, title="Первая вкладка", version=created.version,
+        ),
+    )
+
+    assert updated.version == created.version + 1
+
+    with pytest.raises(NoteVersionConflictError):
+        await note_interactor.update(
+            UpdateNoteInputDTO(
+                note_id=created.note_id,
+                title="Вторая вкладка",
+                version=created.version,
+            ),
+        )
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_stale_version_of_foreign_note(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+) -> None:
+    note_id = await create_foreign_note(note_repository)
+
+    with pytest.raises(NoteAccessDeniedError):
+        await note_interactor.update(
+            UpdateNoteInputDTO(note_id=note_id, title="Название", version=100),
+        )
+
+
+@pytest.mark.notes
+@pytest.mark.application
+@pytest.mark.parametrize(
+    ["is_foreign", "exc_class"],
+    [
+        (True, NoteAccessDeniedError),
+        (False, NoteNotExistsError),
+    ],
+)
+async def test_delete_miss(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    uow: FakeUoW,
+    is_foreign: bool,
+    exc_class,
+) -> None:
+    note_id = await create_foreign_note(note_repository) if is_foreign else 100
+
+    with pytest.raises(exc_class):
+        await note_interactor.delete(DeleteNoteInputDTO(note_id=note_id))
+
+    assert not uow.committed
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_delete(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    uow: FakeUoW,
+) -> None:
+    created = await note_interactor.create(CreateNoteInputDTO(title="Заметка"))
+
+    await note_interactor.delete(DeleteNoteInputDTO(note_id=created.note_id))
+
+    assert created.note_id not in note_repository.notes
+    assert uow.committed
+
+
+@pytest.mark.notes
+@pytest.mark.application
+@pytest.mark.parametrize(
+    ["is_foreign", "exc_class"],
+    [
+        (True, NoteAccessDeniedError),
+        (False, NoteNotExistsError),
+    ],
+)
+async def test_read_miss(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    is_foreign: bool,
+    exc_class,
+) -> None:
+    note_id = await create_foreign_note(note_repository) if is_foreign else 100
+
+    with pytest.raises(exc_class):
+        await note_interactor.read(ReadNoteInputDTO(note_id=note_id))
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_read_through_cache(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    note_cache: LRUNoteCache,
+) -> None:
+    created = await note_interactor.create(CreateNoteInputDTO(title="Заметка"))
+    read_data = ReadNoteInputDTO(note_id=created.note_id)
+
+    await note_interactor.read(read_data)
+    await note_interactor.read(read_data)
+
+    assert note_repository.get_calls == 1
+    assert note_cache.stats.hits == 1
+
+    await note_interactor.update(
+        UpdateNoteInputDTO(note_id=created.note_id, title="Новое название"),
+    )
+    note = await note_interactor.read(read_data)
+
+    assert note.title == "Новое название"
+    assert note_repository.get_calls == 2
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_cached_note_of_older_generation(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    note_cache: LRUNoteCache,
+    user_id: UserId,
+) -> None:
+    created = await note_interactor.create(CreateNoteInputDTO(title="Заметка"))
+    read_data = ReadNoteInputDTO(note_id=created.note_id)
+
+    await note_interactor.read(read_data)
+
+    # written by another process, the cache of this one is not invalidated
+    await note_repository.update(
+        NoteId(created.note_id),
+        Note(NoteTitle("Новое название"), user_id),
+    )
+    note = await note_interactor.read(read_data)
+
+    assert note.title == "Новое название"
+    assert note.version == 2
+    assert note_repository.get_calls == 2
+    assert (note_cache.stats.hits, note_cache.stats.misses) == (0, 2)
+    assert note_cache.stats.entries == 1
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_cached_note_of_another_author(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    note_cache: LRUNoteCache,
+) -> None:
+    note_id = await create_foreign_note(note_repository)
+    note_cache.put(note_repository.notes[note_id], note_repository.generation)
+
+    with pytest.raises(NoteAccessDeniedError):
+        await note_interactor.read(ReadNoteInputDTO(note_id=note_id))
+
+    assert note_repository.get_calls == 1
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_batch(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    uow: FakeUoW,
+) -> None:
+    own = await note_interactor.create(CreateNoteInputDTO(title="Своя"))
+    doomed = await note_interactor.create(CreateNoteInputDTO(title="Удалить"))
+    foreign_id = await create_foreign_note(note_repository)
+
+    result = await note_interactor.batch(
+        BatchNotesInputDTO(
+            operations=[
+                CreateNoteInputDTO(title="Новая"),
+                CreateNoteInputDTO(title=""),
+                UpdateNoteInputDTO(note_id=own.note_id, title="Изменена"),
+                DeleteNoteInputDTO(note_id=own.note_id),
+                DeleteNoteInputDTO(note_id=doomed.note_id),
+                DeleteNoteInputDTO(note_id=foreign_id),
+                UpdateNoteInputDTO(note_id=404, title="Нет такой"),
+            ],
+        ),
+    )
+
+    assert [item.status for item in result.results] == [
+        BatchNoteStatus.OK,
+        BatchNoteStatus.INVALID,
+        BatchNoteStatus.OK,
+        BatchNoteStatus.INVALID,
+        BatchNoteStatus.OK,
+        BatchNoteStatus.ACCESS_DENIED,
+        BatchNoteStatus.NOT_FOUND,
+    ]
+    assert result.results[0].note.title == "Новая"
+    assert note_repository.notes[own.note_id].title.to_raw() == "Изменена"
+    assert doomed.note_id not in note_repository.notes
+    assert foreign_id in note_repository.notes
+    assert uow.committed
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_batch_too_large(note_interactor: NoteInteractor) -> None:
+    operations = [
+        DeleteNoteInputDTO(note_id=note_id)
+        for note_id in range(NoteInteractor.MAX_BATCH_SIZE + 1)
+    ]
+
+    with pytest.raises(TooManyNoteOperationsError):
+        await note_interactor.batch(BatchNotesInputDTO(operations=operations))
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_export(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+) -> None:
+    for title in ("Первая", "Вторая", "Третья"):
+        await note_interactor.create(CreateNoteInputDTO(title=title))
+    await create_foreign_note(note_repository)
+
+    notes = await note_interactor.export(ExportNotesInputDTO())
+    batches = [batch async for batch in notes]
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [note.title for batch in batches for note in batch] == [
+        "Первая",
+        "Вторая",
+        "Третья",
+    ]
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_generation_changes_on_write(note_interactor: NoteInteractor) -> None:
+    list_data = ListNotesInputDTO(limit=10, offset=0)
+    before = await note_interactor.list(list_data)
+
+    await note_interactor.create(CreateNoteInputDTO(title="Заметка"))
+
+    after = await note_interactor.list(list_data)
+
+    assert after.generation is not None
+    assert after.generation != before.generation
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_list_previews(note_interactor: NoteInteractor) -> None:
+    await note_interactor.create(
+        CreateNoteInputDTO(title="Заметка", text="Длинный текст заметки"),
+    )
+
+    plain = await note_interactor.list(ListNotesInputDTO(limit=10))
+    details = await note_interactor.list(
+        ListNotesInputDTO(
+            limit=10,
+            fields=frozenset({NoteListField.PREVIEW, NoteListField.TEXT_LENGTH}),
+            preview_chars=7,
+        ),
+    )
+
+    assert not isinstance(plain.notes[0], ListNoteDetailsDTO)
+    assert details.notes == [
+        ListNoteDetailsDTO(
+            title="Заметка",
+            note_id=plain.notes[0].note_id,
+            preview="Длинный",
+            text_length=21,
+        ),
+    ]
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_search_cache_follows_generation(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+    search_cache: LRUSearchCache,
+) -> None:
+    await note_interactor.create(CreateNoteInputDTO(title="Заметка"))
+
+    first = await note_interactor.list(ListNotesInputDTO(limit=10, search="Заметка"))
+    await note_interactor.list(ListNotesInputDTO(limit=10, search=" заметка  "))
+
+    assert note_repository.search_calls == 1
+    assert search_cache.stats.hit_ratio == 0.5
+    assert search_cache.stats.size_bytes > 0
+
+    await note_interactor.create(CreateNoteInputDTO(title="Еще заметка"))
+    second = await note_interactor.list(ListNotesInputDTO(limit=10, search="заметка"))
+
+    assert note_repository.search_calls == 2
+    assert len(second.notes) == len(first.notes) + 1
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_list_totals(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+) -> None:
+    await create_foreign_note(note_repository)
+    await note_interactor.create(CreateNoteInputDTO(title="Заметка", text="Текст"))
+    await note_interactor.create(CreateNoteInputDTO(title="Еще заметка"))
+
+    page = await note_interactor.list(ListNotesInputDTO(limit=1))
+
+    assert len(page.notes) == 1
+    assert page.total == 2
+    assert page.bytes_used == len("Текст".encode())
+
+
+@pytest.mark.notes
+@pytest.mark.application
+@pytest.mark.parametrize(
+    "quota",
+    [NoteQuota(max_notes=1), NoteQuota(max_text_bytes=len("Текст".encode()))],
+)
+async def test_quota_exceeded(
+    note_repository: FakeNoteRepository,
+    uow: FakeUoW,
+    id_provider: FakeIdProvider,
+    note_cache: LRUNoteCache,
+    search_cache: LRUSearchCache,
+    quota: NoteQuota,
+) -> None:
+    note_interactor = NoteInteractor(
+        note_repository=note_repository,
+        uow=uow,
+        id_provider=id_provider,
+        note_cache=note_cache,
+        search_cache=search_cache,
+        quota=quota,
+    )
+    await create_foreign_note(note_repository)
+    await note_interactor.create(CreateNoteInputDTO(title="Заметка", text="Текст"))
+
+    with pytest.raises(NoteQuotaExceededError):
+        await note_interactor.create(
+            CreateNoteInputDTO(title="Еще заметка", text="Т"),
+        )
+
+    with pytest.raises(NoteQuotaExceededError):
+        await note_interactor.batch(
+            BatchNotesInputDTO(
+                operations=[CreateNoteInputDTO(title="Еще заметка", text="Т")],
+            ),
+        )
+
+    assert len(note_repository.notes) == 2
+    assert note_repository.stats_locks == 3
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_quota_counts_grown_texts(
+    note_repository: FakeNoteRepository,
+    uow: FakeUoW,
+    id_provider: FakeIdProvider,
+    note_cache: LRUNoteCache,
+    search_cache: LRUSearchCache,
+) -> None:
+    note_interactor = NoteInteractor(
+        note_repository=note_repository,
+        uow=uow,
+        id_provider=id_provider,
+        note_cache=note_cache,
+        search_cache=search_cache,
+        quota=NoteQuota(max_text_bytes=10),
+    )
+    created = await note_interactor.create(
+        CreateNoteInputDTO(title="Заметка", text="abcde"),
+    )
+
+    await note_interactor.update(
+        UpdateNoteInputDTO(note_id=created.note_id, title="Заметка", text="a" * 10),
+    )
+
+    with pytest.raises(NoteQuotaExceededError):
+        await note_interactor.update(
+            UpdateNoteInputDTO(
+                note_id=created.note_id, title="Заметка", text="a" * 11,
+            ),
+        )
+
+    with pytest.raises(NoteQuotaExceededError):
+        await note_interactor.batch(
+            BatchNotesInputDTO(
+                operations=[
+                    UpdateNoteInputDTO(
+                        note_id=created.note_id, title="Заметка", text="a" * 11,
+                    ),
+                ],
+            ),
+        )
+
+    await note_interactor.update(
+        UpdateNoteInputDTO(note_id=created.note_id, title="Новое название"),
+    )
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_no_quota_no_lock(
+    note_interactor: NoteInteractor,
+    note_repository: FakeNoteRepository,
+) -> None:
+    await note_interactor.create(CreateNoteInputDTO(title="Заметка"))
+
+    assert note_repository.stats_locks == 0
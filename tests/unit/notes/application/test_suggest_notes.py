@@ -0,0 +1,74 @@
+import pytest
+from zametka.notes.application.note.dto import SuggestNotesInputDTO
+from zametka.notes.application.note.suggest_notes import SuggestNotes
+from zametka.notes.domain.entities.note import Note
+from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.cache.suggestion_cache import LRUSuggestionCache
+from zametka.notes.infrastructure.config_loader import SuggestionCacheConfig
+
+from tests.mocks.notes.id_provider import FakeIdProvider
+from tests.mocks.notes.note_repository import FakeNoteRepository
+
+
+@pytest.fixture
+def suggestion_cache() -> LRUSuggestionCache:
+    return LRUSuggestionCache(SuggestionCacheConfig())
+
+
+@pytest.fixture
+def suggest_notes(
+    note_repository: FakeNoteRepository,
+    id_provider: FakeIdProvider,
+    suggestion_cache: LRUSuggestionCache,
+) -> SuggestNotes:
+    return SuggestNotes(
+        note_repository=note_repository,
+        id_provider=id_provider,
+        suggestion_cache=suggestion_cache,
+    )
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_suggest_cached(
+    suggest_notes: SuggestNotes,
+    note_repository: FakeNoteRepository,
+    user_id: UserId,
+) -> None:
+    for title in ("Список покупок", "Список дел", "Рецепт"):
+        await note_repository.create(Note(NoteTitle(title), user_id))
+
+    first = await suggest_notes(SuggestNotesInputDTO(query="  список "))
+    second = await suggest_notes(SuggestNotesInputDTO(query="СПИСОК"))
+
+    assert [note.title for note in first.notes] == ["Список покупок", "Список дел"]
+    assert second == first
+    assert note_repository.suggest_calls == 1
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_suggest_limit(
+    suggest_notes: SuggestNotes,
+    note_repository: FakeNoteRepository,
+    user_id: UserId,
+) -> None:
+    for number in range(SuggestNotes.LIMIT + 2):
+        await note_repository.create(Note(NoteTitle(f"Заметка {number}"), user_id))
+
+    suggestions = await suggest_notes(SuggestNotesInputDTO(query="заметка"))
+
+    assert len(suggestions.notes) == SuggestNotes.LIMIT
+
+
+@pytest.mark.notes
+@pytest.mark.application
+async def test_suggest_blank_query(
+    suggest_notes: SuggestNotes,
+    note_repository: FakeNoteRepository,
+) -> None:
+    suggestions = await suggest_notes(SuggestNotesInputDTO(query="   "))
+
+    assert suggestions.notes == []
+    assert note_repository.suggest_calls == 0
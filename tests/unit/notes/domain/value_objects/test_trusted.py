@@ -0,0 +1,22 @@
+import pytest
+from zametka.notes.domain.exceptions.note import InvalidNoteTitleError
+from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+
+
+@pytest.mark.notes
+@pytest.mark.domain
+def test_trusted_skips_validation():
+    with pytest.raises(InvalidNoteTitleError):
+        NoteTitle(" ")
+
+    title = NoteTitle.from_trusted(" ")
+
+    assert title.to_raw() == " "
+    assert isinstance(title, NoteTitle)
+
+
+@pytest.mark.notes
+@pytest.mark.domain
+def test_trusted_equals_validated():
+    assert NoteTitle.from_trusted("Заметка") == NoteTitle("Заметка")
+    assert not hasattr(NoteTitle("Заметка"), "__dict__")
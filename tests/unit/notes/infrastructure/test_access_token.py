@@ -0,0 +1,76 @@
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+import jwt
+import pytest
+from zametka.notes.domain.exceptions.user import IsNotAuthorizedError
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.access_token import AccessTokenVerifier
+from zametka.notes.infrastructure.config_loader import AccessTokenConfig
+from zametka.notes.infrastructure.id_provider import JWTIdProvider
+
+KEY = "secret"
+
+
+def make_access_token(
+    uid: UUID,
+    token_id: UUID,
+    expires_in: timedelta = timedelta(minutes=5),
+    key: str = KEY,
+) -> str:
+    """As the AccessTokenProcessor of the access service encodes it"""
+
+    return jwt.encode(
+        {
+            "sub": {"uid": str(uid), "token_id": str(token_id)},
+            "exp": datetime.now(UTC) + expires_in,
+        },
+        key,
+        "HS256",
+    )
+
+
+@pytest.fixture
+def verifier() -> AccessTokenVerifier:
+    return AccessTokenVerifier(AccessTokenConfig(key=KEY))
+
+
+@pytest.mark.notes
+async def test_identity(verifier: AccessTokenVerifier):
+    uid = uuid4()
+    id_provider = JWTIdProvider(verifier, make_access_token(uid, uuid4()))
+
+    assert await id_provider.get_user_id() == UserId(uid)
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize(
+    "access_token",
+    [
+        make_access_token(uuid4(), uuid4(), expires_in=timedelta(minutes=-1)),
+        make_access_token(uuid4(), uuid4(), key="another secret"),
+        jwt.encode({"sub": "not an identity"}, KEY, "HS256"),
+        "not a token",
+    ],
+)
+def test_bad_token(verifier: AccessTokenVerifier, access_token: str):
+    with pytest.raises(IsNotAuthorizedError):
+        verifier.get_identity(access_token)
+
+
+@pytest.mark.notes
+def test_csrf(verifier: AccessTokenVerifier):
+    token_id = uuid4()
+    access_token = make_access_token(uuid4(), token_id)
+    csrf_token = jwt.encode({"sub": str(token_id)}, KEY, "HS256")
+    other_csrf_token = jwt.encode({"sub": str(uuid4())}, KEY, "HS256")
+
+    verifier.ensure_can_edit(access_token, csrf_token, csrf_token)
+
+    for cookie, header in (
+        (csrf_token, None),
+        (csrf_token, other_csrf_token),
+        (other_csrf_token, other_csrf_token),
+    ):
+        with pytest.raises(IsNotAuthorizedError):
+            verifier.ensure_can_edit(access_token, cookie, header)
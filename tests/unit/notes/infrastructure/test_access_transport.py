@@ -0,0 +1,118 @@
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from zametka.notes.infrastructure.access_transport import create_access_transport
+from zametka.notes.infrastructure.config_loader import AccessClientConfig
+
+
+class FakeAccessService:
+    def __init__(self):
+        self.delays: list[float] = []
+        self.calls = 0
+
+    async def me(self, _request: web.Request) -> web.Response:
+        delay = self.delays[self.calls] if self.calls < len(self.delays) else 0
+        self.calls += 1
+        await asyncio.sleep(delay)
+
+        return web.json_response({"identity_id": "id"})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/me/", self.me)
+
+        return app
+
+
+@pytest.fixture
+def access_service() -> FakeAccessService:
+    return FakeAccessService()
+
+
+@pytest.fixture
+async def access_url(access_service: FakeAccessService) -> AsyncIterator[str]:
+    runner = web.AppRunner(access_service.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+    yield f"http://127.0.0.1:{port}"
+
+    await runner.cleanup()
+
+
+@pytest.mark.notes
+async def test_slow_request_is_hedged(
+    access_service: FakeAccessService, access_url: str,
+):
+    access_service.delays = [0, 5]
+    config = AccessClientConfig(
+        url=access_url, hedge_percentile=0.5, hedge_min_samples=1,
+    )
+
+    async with create_access_transport(config) as transport:
+        assert await transport.get("/me/", cookies={}) == (200, {"identity_id": "id"})
+        assert await asyncio.wait_for(transport.get("/me/", cookies={}), 2) == (
+            200,
+            {"identity_id": "id"},
+        )
+
+        assert transport.stats.hedged == 1
+        assert access_service.calls == 3
+
+
+@pytest.mark.notes
+async def test_timeouts_are_counted(
+    access_service: FakeAccessService, access_url: str,
+):
+    access_service.delays = [5]
+    config = AccessClientConfig(url=access_url, read_timeout_seconds=0.1)
+
+    async with create_access_transport(config) as transport:
+        with pytest.raises(TimeoutError):
+            await transport.get("/me/", cookies={})
+
+        assert transport.stats.timeouts == 1
+        assert transport.stats.in_use == 0
+
+
+@pytest.mark.notes
+async def test_timed_out_waiters_leave_the_queue(
+    access_service: FakeAccessService, access_url: str,
+):
+    access_service.delays = [5] * 4
+    config = AccessClientConfig(url=access_url, limit=1, total_timeout_seconds=0.3)
+
+    async with create_access_transport(config) as transport:
+        results = await asyncio.gather(
+            *(transport.get("/me/", cookies={}) for _ in range(4)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, TimeoutError) for result in results)
+        assert (transport.stats.in_use, transport.stats.queued) == (0, 0)
+
+
+@pytest.mark.notes
+async def test_unix_socket(access_service: FakeAccessService, tmp_path: Path):
+    runner = web.AppRunner(access_service.app())
+    await runner.setup()
+    await web.UnixSite(runner, str(tmp_path / "access.sock")).start()
+
+    config = AccessClientConfig(unix_socket=str(tmp_path / "access.sock"))
+
+    try:
+        async with create_access_transport(config) as transport:
+            for _ in range(2):
+                status, _ = await transport.get("/me/", cookies={})
+                assert status == 200
+
+            assert transport.stats.requests == 2
+            assert (transport.stats.in_use, transport.stats.queued) == (0, 0)
+    finally:
+        await runner.cleanup()
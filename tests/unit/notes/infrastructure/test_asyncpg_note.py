@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from zametka.notes.domain.value_objects.note.note_id import NoteId
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.repositories.asyncpg_note import (
+    GET_NOTE,
+    GET_STATS,
+    LIST_NOTES,
+    LIST_NOTES_AFTER,
+    AsyncpgNoteRepository,
+)
+from zametka.notes.infrastructure.repositories.cursor import decode_list_cursor
+from zametka.notes.infrastructure.repositories.text_codec import NoteTextCodec
+
+CREATED_AT = datetime(2024, 5, 1, 12, 0)
+
+
+class FakeDriverConnection:
+    def __init__(self, records: list[dict[str, Any]]):
+        self.records = records
+        self.queries: list[tuple[str, tuple[Any, ...]]] = []
+        self.in_transaction = False
+
+    def is_in_transaction(self) -> bool:
+        return self.in_transaction
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict[str, Any]]:
+        self.queries.append((sql, args))
+        return self.records
+
+    async def fetchrow(self, sql: str, *args: Any) -> dict[str, Any] | None:
+        self.queries.append((sql, args))
+        return self.records[0] if self.records else None
+
+    async def fetchval(self, sql: str, *args: Any) -> Any:
+        self.queries.append((sql, args))
+        return next(iter(self.records[0].values())) if self.records else None
+
+
+class FakeRawConnection:
+    def __init__(self, driver_connection: FakeDriverConnection):
+        self.driver_connection = driver_connection
+
+
+class FakeConnection:
+    def __init__(self, driver_connection: FakeDriverConnection):
+        self._raw = FakeRawConnection(driver_connection)
+        self.driver_statements: list[str] = []
+
+    async def get_raw_connection(self) -> FakeRawConnection:
+        return self._raw
+
+    async def exec_driver_sql(self, statement: str) -> None:
+        # like SQLAlchemy, BEGIN goes before the first statement
+        self.driver_statements.append(statement)
+        self._raw.driver_connection.in_transaction = True
+
+
+class FakeSession:
+    def __init__(self, driver_connection: FakeDriverConnection):
+        self._connection = FakeConnection(driver_connection)
+
+    async def connection(self) -> FakeConnection:
+        return self._connection
+
+
+def make_repository(
+    records: list[dict[str, Any]],
+) -> tuple[AsyncpgNoteRepository, FakeDriverConnection]:
+    driver_connection = FakeDriverConnection(records)
+    repository = AsyncpgNoteRepository(
+        FakeSession(driver_connection),  # type: ignore[arg-type]
+        NoteTextCodec(threshold_bytes=10),
+    )
+
+    return repository, driver_connection
+
+
+def list_record(note_id: int) -> dict[str, Any]:
+    return {
+        "title": f"Заметка {note_id}",
+        "note_id": note_id,
+        "created_at": CREATED_AT + timedelta(minutes=note_id),
+    }
+
+
+@pytest.mark.notes
+def test_binds_follow_compiled_order():
+    assert LIST_NOTES.args(offset=0, limit=11, author_id="a") == ["a", 11, 0]
+    assert "$4" in LIST_NOTES_AFTER.sql
+    assert GET_NOTE.params == ("note_id", "author_id")
+
+
+@pytest.mark.notes
+async def test_get_decodes_compressed_text():
+    author_id = UserId(uuid4())
+    text = "Длинный текст заметки " * 20
+    codec = NoteTextCodec(threshold_bytes=10)
+    stored = codec.encode(text)
+    repository, connection = make_repository(
+        [
+            {
+                "note_id": 7,
+                "title": "Заметка",
+                "text": stored.text,
+                "text_compressed": stored.compressed,
+                "text_codec": stored.codec,
+                "created_at": CREATED_AT,
+                "version": 3,
+            },
+        ],
+    )
+
+    note = await repository.get(NoteId(7), author_id)
+
+    assert note is not None
+    assert note.text is not None and note.text.to_raw() == text
+    assert note.version.to_raw() == 3
+    assert note.author_id == author_id
+    assert connection.queries == [(GET_NOTE.sql, (7, author_id.to_raw()))]
+
+
+@pytest.mark.notes
+async def test_get_miss():
+    repository, _ = make_repository([])
+
+    assert await repository.get(NoteId(7), UserId(uuid4())) is None
+
+
+@pytest.mark.notes
+async def test_list_pages_by_cursor():
+    author_id = UserId(uuid4())
+    repository, connection = make_repository([list_record(1), list_record(2)])
+
+    page = await repository.list(limit=1, offset=0, author_id=author_id)
+
+    assert [note.note_id for note in page.notes] == [1]
+    assert page.has_next
+    assert page.next_cursor is not None
+
+    await repository.list(
+        limit=1, offset=0, author_id=author_id, cursor=page.next_cursor,
+    )
+
+    after = decode_list_cursor(page.next_cursor)
+    assert connection.queries[-1] == (
+        LIST_NOTES_AFTER.sql,
+        (author_id.to_raw(), after.created_at, 1, 2),
+    )
+
+
+@pytest.mark.notes
+async def test_generation_of_author_without_notes():
+    repository, _ = make_repository([])
+
+    assert await repository.get_generation(UserId(uuid4())) == 0
+
+
+@pytest.mark.notes
+async def test_stats_read_by_author():
+    author_id = UserId(uuid4())
+    repository, connection = make_repository(
+        [{"generation": 5, "note_count": 2, "text_bytes": 40}],
+    )
+
+    stats = await repository.get_stats(author_id)
+
+    assert (stats.note_count, stats.text_bytes) == (2, 40)
+    assert connection.queries == [(GET_STATS.sql, (author_id.to_raw(),))]
+
+
+@pytest.mark.notes
+async def test_reads_run_in_the_transaction():
+    author_id = UserId(uuid4())
+    repository, connection = make_repository([list_record(1)])
+    session_connection: Any = await repository.session.connection()
+
+    await repository.get_generation(author_id)
+    await repository.list(limit=1, offset=0, author_id=author_id)
+
+    assert session_connection.driver_statements == ["SELECT 1"]
+    assert len(connection.queries) == 2
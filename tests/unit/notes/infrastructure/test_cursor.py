@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+from zametka.notes.domain.exceptions.note import InvalidNoteCursorError
+from zametka.notes.infrastructure.repositories.cursor import (
+    ListCursor,
+    SearchCursor,
+    decode_list_cursor,
+    decode_search_cursor,
+    encode_list_cursor,
+    encode_search_cursor,
+)
+
+
+@pytest.mark.notes
+def test_list_cursor_roundtrip():
+    cursor = ListCursor(created_at=datetime(2024, 1, 3, 13, 4, 46, 906573), note_id=42)
+
+    encoded = encode_list_cursor(cursor)
+
+    assert "=" not in encoded
+    assert decode_list_cursor(encoded) == cursor
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "W10",  # []
+        "WyJzZWFyY2giLDEsMl0",  # ["search",1,2]
+        "WyJsaXN0IiwiYmFkIiwxXQ",  # ["list","bad",1]
+    ],
+)
+def test_list_cursor_invalid(cursor):
+    with pytest.raises(InvalidNoteCursorError):
+        decode_list_cursor(cursor)
+
+
+@pytest.mark.notes
+def test_search_cursor_roundtrip():
+    cursor = SearchCursor(
+        score=0.2857142984867096,
+        created_at=datetime(2024, 1, 3, 13, 4, 46),
+        note_id=7,
+    )
+
+    assert decode_search_cursor(encode_search_cursor(cursor)) == cursor
+
+
+@pytest.mark.notes
+def test_cursor_kinds_are_not_interchangeable():
+    list_cursor = encode_list_cursor(ListCursor(created_at=datetime.now(), note_id=1))
+
+    with pytest.raises(InvalidNoteCursorError):
+        decode_search_cursor(list_cursor)
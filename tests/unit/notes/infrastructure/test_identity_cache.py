@@ -0,0 +1,106 @@
+import asyncio
+from uuid import uuid4
+
+import jwt
+import pytest
+from zametka.notes.domain.exceptions.user import IsNotAuthorizedError
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.cache.identity_cache import IdentityCache
+from zametka.notes.infrastructure.config_loader import IdentityCacheConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeAccessService:
+    def __init__(self):
+        self.user_id = UserId(uuid4())
+        self.calls = 0
+        self.fails = False
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def get_identity(self) -> UserId:
+        self.calls += 1
+        await self.release.wait()
+
+        if self.fails:
+            raise IsNotAuthorizedError()
+
+        return self.user_id
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def identity_cache(clock: FakeClock) -> IdentityCache:
+    return IdentityCache(IdentityCacheConfig(ttl_seconds=60), clock=clock)
+
+
+def make_token(expires_at: float) -> str:
+    return jwt.encode({"sub": {"uid": str(uuid4())}, "exp": expires_at}, "k")
+
+
+@pytest.mark.notes
+async def test_ttl_capped_by_token_expiry(
+    identity_cache: IdentityCache, clock: FakeClock,
+):
+    access_service = FakeAccessService()
+    token = make_token(clock.now + 10)
+
+    for _ in range(3):
+        assert await identity_cache.get_identity(
+            token, access_service.get_identity,
+        ) == access_service.user_id
+
+    clock.now += 10
+    await identity_cache.get_identity(token, access_service.get_identity)
+
+    assert access_service.calls == 2
+    assert identity_cache.stats.hit_ratio == 0.5
+    assert identity_cache.upstream_calls_per_second == 2 / 10
+
+
+@pytest.mark.notes
+async def test_concurrent_lookups_share_one_call(
+    identity_cache: IdentityCache, clock: FakeClock,
+):
+    access_service = FakeAccessService()
+    access_service.release.clear()
+    token = make_token(clock.now + 600)
+
+    lookups = [
+        asyncio.create_task(
+            identity_cache.get_identity(token, access_service.get_identity),
+        )
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    access_service.release.set()
+
+    assert set(await asyncio.gather(*lookups)) == {access_service.user_id}
+    assert access_service.calls == 1
+    assert identity_cache.upstream_calls == 1
+
+
+@pytest.mark.notes
+async def test_failures_are_not_cached(
+    identity_cache: IdentityCache, clock: FakeClock,
+):
+    access_service = FakeAccessService()
+    access_service.fails = True
+    token = make_token(clock.now + 600)
+
+    for _ in range(2):
+        with pytest.raises(IsNotAuthorizedError):
+            await identity_cache.get_identity(token, access_service.get_identity)
+
+    assert access_service.calls == 2
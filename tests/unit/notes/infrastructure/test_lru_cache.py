@@ -0,0 +1,69 @@
+import pytest
+from zametka.notes.infrastructure.cache.lru import TTLLRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.mark.notes
+def test_evicts_least_recently_used(clock: FakeClock):
+    cache: TTLLRUCache[str, int] = TTLLRUCache(2, ttl_seconds=10, clock=clock)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+
+
+@pytest.mark.notes
+def test_expires(clock: FakeClock):
+    cache: TTLLRUCache[str, int] = TTLLRUCache(2, ttl_seconds=10, clock=clock)
+
+    cache.put("a", 1)
+    clock.now = 10
+
+    assert cache.get("a") is None
+    assert cache.stats.entries == 0
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.notes
+def test_invalid_entry_is_a_miss(clock: FakeClock):
+    cache: TTLLRUCache[str, int] = TTLLRUCache(2, ttl_seconds=10, clock=clock)
+
+    cache.put("a", 1)
+
+    assert cache.get("a", is_valid=lambda value: value == 2) is None
+    assert cache.get("a") is None
+    assert (cache.stats.hits, cache.stats.misses) == (0, 2)
+    assert cache.stats.entries == 0
+
+
+@pytest.mark.notes
+def test_max_bytes(clock: FakeClock):
+    cache: TTLLRUCache[str, str] = TTLLRUCache(
+        10, ttl_seconds=10, max_bytes=10, sizeof=len, clock=clock,
+    )
+
+    cache.put("a", "x" * 6)
+    cache.put("b", "x" * 6)
+    cache.put("c", "x" * 11)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "x" * 6
+    assert cache.get("c") is None
+    assert cache.stats.size_bytes == 6
@@ -0,0 +1,35 @@
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.repositories.note import NoteRepositoryImpl
+
+
+class FakeResult:
+    def one_or_none(self) -> None:
+        return None
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    async def execute(self, statement: Any) -> FakeResult:
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult()
+
+
+@pytest.mark.notes
+async def test_locked_stats_row_is_created_first():
+    session = FakeSession()
+    repository = NoteRepositoryImpl(session)  # type: ignore[arg-type]
+
+    await repository.get_stats(UserId(uuid4()), lock=True)
+
+    upsert, select = session.statements
+
+    assert upsert.startswith("INSERT INTO author_note_stats")
+    assert upsert.endswith("ON CONFLICT DO NOTHING")
+    assert select.endswith("FOR UPDATE")
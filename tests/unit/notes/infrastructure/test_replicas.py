@@ -0,0 +1,156 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from zametka.notes.infrastructure.db.replicas import (
+    REPLAYED_QUERY,
+    Replica,
+    WrittenLSN,
+    pick_replica,
+)
+from zametka.notes.infrastructure.db.sharding import ShardRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeReplicaSession:
+    def __init__(self, database: "FakeReplicaDatabase"):
+        self._database = database
+
+    async def __aenter__(self) -> "FakeReplicaSession":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    async def scalar(
+        self, statement: object, params: object = None,
+    ) -> float | bool | None:
+        self._database.checks += 1
+
+        if self._database.down:
+            raise OperationalError("SELECT", {}, ConnectionRefusedError())
+
+        if statement is REPLAYED_QUERY:
+            return self._database.replayed
+
+        return self._database.lag
+
+
+class FakeReplicaDatabase:
+    def __init__(
+        self, lag: float | None = 0, down: bool = False, replayed: bool = True,
+    ):
+        self.lag = lag
+        self.down = down
+        self.replayed = replayed
+        self.checks = 0
+
+    def __call__(self) -> FakeReplicaSession:
+        return FakeReplicaSession(self)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def make_replica(database: FakeReplicaDatabase, clock: FakeClock) -> Replica:
+    return Replica(
+        database,  # type: ignore[arg-type]
+        max_lag_seconds=1,
+        check_interval_seconds=1,
+        clock=clock,
+    )
+
+
+@pytest.mark.notes
+async def test_lag_check_is_cached(clock: FakeClock):
+    database = FakeReplicaDatabase(lag=0.5)
+    replica = make_replica(database, clock)
+
+    assert await replica.is_fresh()
+
+    database.lag = 5
+    assert await replica.is_fresh()
+    assert database.checks == 1
+
+    clock.now = 1
+    assert not await replica.is_fresh()
+    assert database.checks == 2
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize(
+    "database",
+    [FakeReplicaDatabase(lag=None), FakeReplicaDatabase(down=True)],
+)
+async def test_unknown_lag_is_stale(clock: FakeClock, database: FakeReplicaDatabase):
+    assert not await make_replica(database, clock).is_fresh()
+
+
+@pytest.mark.notes
+async def test_pick_replica_skips_stale(clock: FakeClock):
+    fresh = make_replica(FakeReplicaDatabase(), clock)
+    stale = make_replica(FakeReplicaDatabase(down=True), clock)
+    author_id = uuid4()
+
+    assert await pick_replica([fresh, stale], author_id) is fresh
+    assert await pick_replica([stale, fresh], author_id) is fresh
+    assert await pick_replica([stale], author_id) is None
+    assert await pick_replica([], author_id) is None
+
+
+@pytest.mark.notes
+async def test_reads_own_writes_from_primary(clock: FakeClock):
+    primary = FakeReplicaDatabase()
+    replica = make_replica(FakeReplicaDatabase(), clock)
+    router = ShardRouter(
+        [primary],  # type: ignore[list-item]
+        replicas=[[replica]],
+        sticky_seconds=5,
+    )
+    author_id = uuid4()
+
+    assert await router.read_session_factory(author_id) is replica.session_factory
+
+    router.stick_to_primary(author_id)
+
+    assert await router.read_session_factory(author_id) is primary
+    assert await router.read_session_factory(uuid4()) is replica.session_factory
+
+
+@pytest.mark.notes
+async def test_reads_writes_of_other_workers(clock: FakeClock):
+    primary = FakeReplicaDatabase()
+    behind = FakeReplicaDatabase(replayed=False)
+    replicas = [make_replica(behind, clock), make_replica(FakeReplicaDatabase(), clock)]
+    router = ShardRouter(
+        [primary],  # type: ignore[list-item]
+        replicas=[replicas[:1]],
+    )
+    author_id = uuid4()
+    written = WrittenLSN.from_cookie("0:16/B374D848")
+
+    assert await router.read_session_factory(author_id) is behind
+    assert await router.read_session_factory(author_id, written) is primary
+
+    router.replicas = [replicas]
+    assert await router.read_session_factory(author_id, written) is (
+        replicas[1].session_factory
+    )
+
+    moved = WrittenLSN(shard=1, lsn="16/B374D848")
+    assert await router.read_session_factory(author_id, moved) is primary
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize("cookie", [None, "", "0", "x:16/B374D848", "0:16/zz"])
+def test_malformed_written_lsn_is_ignored(cookie: str | None):
+    assert WrittenLSN.from_cookie(cookie) is None
@@ -0,0 +1,184 @@
+from collections import Counter
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import Delete, Insert
+from zametka.notes.infrastructure.db.sharding import (
+    MOVE_BATCH_SIZE,
+    ShardRouter,
+    home_shard,
+    move_author,
+)
+
+
+class FakeDirectorySession:
+    def __init__(self, directory: "FakeDirectory"):
+        self._directory = directory
+
+    async def __aenter__(self) -> "FakeDirectorySession":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    async def scalar(self, statement: object) -> int | None:
+        self._directory.lookups += 1
+        return self._directory.moved_to
+
+
+class FakeDirectory:
+    def __init__(self, moved_to: int | None = None):
+        self.moved_to = moved_to
+        self.lookups = 0
+
+    def __call__(self) -> FakeDirectorySession:
+        return FakeDirectorySession(self)
+
+
+class FakeResult:
+    def one_or_none(self) -> None:
+        return None
+
+    def all(self) -> list[object]:
+        return []
+
+
+class FakeRow:
+    def __init__(self, note_id: int):
+        self.note_id = note_id
+        self._mapping = {"note_id": note_id}
+
+
+class FakeStreamResult:
+    def __init__(self, rows: list[FakeRow], batch_size: int):
+        self._rows = rows
+        self._batch_size = batch_size
+
+    async def partitions(self) -> AsyncIterator[list[FakeRow]]:
+        for start in range(0, len(self._rows), self._batch_size):
+            yield self._rows[start:start + self._batch_size]
+
+
+class FakeShardSession(FakeDirectorySession):
+    _directory: "FakeShard"
+
+    async def execute(self, statement: object, *args: object) -> FakeResult:
+        self._directory.statements.append(statement)
+        self._directory.parameters.append(args)
+        return FakeResult()
+
+    async def stream(self, statement: Any) -> FakeStreamResult:
+        self._directory.streamed += 1
+        batch_size = statement.get_execution_options()["yield_per"]
+
+        return FakeStreamResult(self._directory.notes, batch_size)
+
+    async def commit(self) -> None:
+        self._directory.commits += 1
+
+
+class FakeShard(FakeDirectory):
+    """A shard where the author has no user and the given notes"""
+
+    def __init__(self, notes: list[FakeRow] | None = None):
+        super().__init__()
+        self.notes = notes or []
+        self.statements: list[object] = []
+        self.parameters: list[tuple[object, ...]] = []
+        self.commits = 0
+        self.streamed = 0
+
+    def __call__(self) -> FakeShardSession:
+        return FakeShardSession(self)
+
+
+@pytest.mark.notes
+def test_home_shard_is_stable_and_even():
+    author_id = UUID("5b0e3c52-3a4c-4a36-8d32-0f7b0c1d2e3f")
+
+    assert home_shard(author_id, 4) == home_shard(UUID(str(author_id)), 4)
+
+    shards = Counter(home_shard(uuid4(), 4) for _ in range(4000))
+
+    assert set(shards) == {0, 1, 2, 3}
+    assert min(shards.values()) > 800
+
+
+@pytest.mark.notes
+async def test_single_shard_skips_directory():
+    directory = FakeDirectory(moved_to=1)
+    router = ShardRouter([directory])  # type: ignore[list-item]
+
+    assert await router.shard_of(uuid4()) == 0
+    assert directory.lookups == 0
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize("moved_to", [None, 1])
+async def test_directory_lookup_is_cached(moved_to: int | None):
+    directory = FakeDirectory(moved_to=moved_to)
+    router = ShardRouter([directory, directory])  # type: ignore[list-item]
+    author_id = uuid4()
+    expected = home_shard(author_id, 2) if moved_to is None else moved_to
+
+    assert await router.shard_of(author_id) == expected
+    assert await router.shard_of(author_id) == expected
+    assert directory.lookups == 1
+
+    router.forget(author_id)
+    await router.shard_of(author_id)
+
+    assert directory.lookups == 2
+
+
+@pytest.mark.notes
+async def test_rerun_of_moved_author_keeps_target():
+    """The earlier run committed the source and failed before the directory"""
+
+    shards = [FakeShard(), FakeShard()]
+    router = ShardRouter(shards)  # type: ignore[arg-type]
+    author_id = uuid4()
+    source = home_shard(author_id, 2)
+    target = 1 - source
+
+    assert await move_author(router, author_id, target) == 0
+
+    target_deletes = [
+        statement
+        for statement in shards[target].statements
+        if isinstance(statement, Delete) and statement.table.name == "notes"
+    ]
+    directory = shards[0].statements[-1]
+
+    assert not target_deletes
+    assert getattr(directory, "table").name == "author_shards"
+    assert shards[0].commits >= 1
+
+
+@pytest.mark.notes
+async def test_notes_are_moved_in_batches():
+    author_id = uuid4()
+    source = home_shard(author_id, 2)
+    target = 1 - source
+    notes = [FakeRow(note_id) for note_id in range(1, MOVE_BATCH_SIZE * 2 + 2)]
+    shards = [FakeShard(), FakeShard()]
+    shards[source] = FakeShard(notes)
+    router = ShardRouter(shards)  # type: ignore[arg-type]
+
+    assert await move_author(router, author_id, target) == len(notes)
+
+    calls = list(zip(shards[target].statements, shards[target].parameters))
+    inserted = [
+        len(parameters[0])  # type: ignore[arg-type]
+        for statement, parameters in calls
+        if isinstance(statement, Insert) and statement.table.name == "notes"
+    ]
+    sequence = [
+        parameters for statement, parameters in calls if "setval" in str(statement)
+    ]
+
+    assert inserted == [MOVE_BATCH_SIZE, MOVE_BATCH_SIZE, 1]
+    assert sequence == [({"note_id": len(notes)},)]
+    assert shards[source].streamed == 1
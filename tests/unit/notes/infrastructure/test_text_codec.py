@@ -0,0 +1,127 @@
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from zametka.notes.application.note.dto import NoteListField
+from zametka.notes.domain.entities.note import Note as NoteEntity
+from zametka.notes.domain.value_objects.note.note_text import NoteText
+from zametka.notes.domain.value_objects.note.note_title import NoteTitle
+from zametka.notes.domain.value_objects.user.user_id import UserId
+from zametka.notes.infrastructure.db.models.note import Note
+from zametka.notes.infrastructure.repositories.converters.note import (
+    note_db_data_to_list_note_details_dto,
+    note_db_model_to_db_note_entity,
+    note_entity_to_db_record,
+)
+from zametka.notes.infrastructure.repositories.note import COPY_COLUMNS
+from zametka.notes.infrastructure.repositories.text_codec import (
+    BROTLI_CODEC,
+    NoteTextCodec,
+    StoredText,
+    decode_text,
+)
+
+LONG_TEXT = "Очень длинная заметка. " * 200
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize(
+    ["codec", "text"],
+    [
+        (NoteTextCodec(), LONG_TEXT),
+        (NoteTextCodec(threshold_bytes=10_000_000), LONG_TEXT),
+        (NoteTextCodec(threshold_bytes=16), "Короткая"),
+        (NoteTextCodec(threshold_bytes=16), None),
+    ],
+)
+def test_kept_as_is(codec: NoteTextCodec, text: str | None):
+    assert codec.encode(text) == StoredText(text=text)
+
+
+@pytest.mark.notes
+def test_compressed_roundtrip():
+    stored = NoteTextCodec(threshold_bytes=1024).encode(LONG_TEXT)
+
+    assert stored.text is None
+    assert stored.codec == BROTLI_CODEC
+    assert stored.compressed is not None
+    assert len(stored.compressed) < len(LONG_TEXT.encode())
+    assert decode_text(stored.text, stored.compressed, stored.codec) == LONG_TEXT
+
+
+@pytest.mark.notes
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        decode_text(None, b"", "zstd")
+
+
+@pytest.mark.notes
+def test_model_to_entity_decompresses():
+    stored = NoteTextCodec(threshold_bytes=1024).encode(LONG_TEXT)
+    db_note = Note(
+        note_id=1,
+        title="Заметка",
+        text=stored.text,
+        text_compressed=stored.compressed,
+        text_codec=stored.codec,
+        created_at=datetime.now(),
+        author_id=uuid4(),
+    )
+
+    note = note_db_model_to_db_note_entity(db_note)
+
+    assert note.text is not None
+    assert note.text.to_raw() == LONG_TEXT
+
+
+@pytest.mark.notes
+def test_list_details_of_compressed_text():
+    stored = NoteTextCodec(threshold_bytes=16).encode(LONG_TEXT)
+    # SQL leaves the details of compressed texts NULL
+    row = SimpleNamespace(
+        title="Заметка",
+        note_id=1,
+        created_at=datetime(2024, 1, 1),
+        preview=None,
+        text_length=0,
+        text_compressed=stored.compressed,
+        text_codec=stored.codec,
+    )
+
+    note = note_db_data_to_list_note_details_dto(
+        row,  # type:ignore
+        frozenset({NoteListField.PREVIEW, NoteListField.TEXT_LENGTH}),
+        preview_chars=10,
+    )
+
+    assert note.preview == LONG_TEXT[:10]
+    assert note.text_length == len(LONG_TEXT)
+    assert note.created_at is None
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize(
+    ["threshold_bytes", "search_text"],
+    [(None, None), (1024, LONG_TEXT)],
+)
+def test_record_keeps_search_text_of_compressed(
+    threshold_bytes: int | None, search_text: str | None,
+):
+    note = NoteEntity(
+        title=NoteTitle("Заметка"),
+        text=NoteText(LONG_TEXT),
+        author_id=UserId(uuid4()),
+    )
+
+    record = dict(
+        zip(
+            COPY_COLUMNS,
+            note_entity_to_db_record(note, NoteTextCodec(threshold_bytes)),
+            strict=True,
+        ),
+    )
+
+    # the search vector is built from the text column when it is kept as is
+    assert record["search_text"] == search_text
+    assert (record["text"] is None) == (search_text is not None)
@@ -0,0 +1,56 @@
+import pytest
+from zametka.notes.domain.exceptions.note import NoteVersionConflictError
+from zametka.notes.presentation.web_api.etag import (
+    etag_matches,
+    if_match_version,
+    make_etag,
+    note_etag,
+)
+
+
+@pytest.mark.notes
+def test_make_etag():
+    etag = make_etag(1, "Заметка", None)
+
+    assert etag.startswith('"')
+    assert etag == make_etag(1, "Заметка", None)
+    assert etag != make_etag(1, "Заметка", "Текст")
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize(
+    ["if_none_match", "matches"],
+    [
+        (None, False),
+        ("", False),
+        ('"1"', True),
+        ('W/"1"', True),
+        ('"0", "1"', True),
+        ('"2"', False),
+        ("*", True),
+    ],
+)
+def test_etag_matches(if_none_match: str | None, matches: bool):
+    assert etag_matches(if_none_match, '"1"') is matches
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize(
+    ["if_match", "version"],
+    [
+        (None, None),
+        ("*", None),
+        (note_etag(7, 3), 3),
+        (f"W/{note_etag(7, 3)}", 3),
+        (f"{note_etag(8, 1)}, {note_etag(7, 2)}", 2),
+    ],
+)
+def test_if_match_version(if_match: str | None, version: int | None):
+    assert if_match_version(if_match, 7) == version
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize("if_match", ['"garbage"', note_etag(8, 1), '"7.x"'])
+def test_if_match_of_other_note(if_match: str):
+    with pytest.raises(NoteVersionConflictError):
+        if_match_version(if_match, 7)
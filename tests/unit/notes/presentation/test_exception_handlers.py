@@ -0,0 +1,23 @@
+import pytest
+from aiohttp import ClientConnectionError
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from zametka.notes.presentation import include_exception_handlers
+
+
+@pytest.mark.notes
+@pytest.mark.parametrize(
+    "exc", [TimeoutError(), ClientConnectionError("refused")],
+)
+def test_access_service_unavailable(exc: Exception):
+    app = FastAPI()
+
+    @app.get("/me/")
+    async def me() -> None:
+        raise exc
+
+    include_exception_handlers(app)
+
+    response = TestClient(app).get("/me/")
+
+    assert response.status_code == 503
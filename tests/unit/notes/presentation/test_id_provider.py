@@ -0,0 +1,54 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import jwt
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from zametka.notes.application.common.id_provider import IdProvider
+from zametka.notes.infrastructure.config_loader import AccessTokenConfig
+from zametka.notes.presentation import include_id_provider
+from zametka.notes.presentation.web_api.dependencies import (
+    get_jwt_id_provider,
+    get_token_id_provider,
+)
+
+KEY = "secret"
+
+
+def make_app(access_token: AccessTokenConfig | None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/me/")
+    async def me(id_provider: IdProvider = Depends()) -> str:
+        return str((await id_provider.get_user_id()).to_raw())
+
+    include_id_provider(app, access_token)
+
+    return app
+
+
+@pytest.mark.notes
+def test_access_service_by_default():
+    app = make_app(None)
+
+    assert app.dependency_overrides[IdProvider] is get_token_id_provider
+
+
+@pytest.mark.notes
+def test_tokens_verified_locally_with_key():
+    app = make_app(AccessTokenConfig(key=KEY))
+    uid = uuid4()
+    access_token = jwt.encode(
+        {
+            "sub": {"uid": str(uid), "token_id": str(uuid4())},
+            "exp": datetime.now(UTC) + timedelta(minutes=5),
+        },
+        KEY,
+        "HS256",
+    )
+
+    client = TestClient(app, cookies={"access_token_cookie": access_token})
+
+    assert app.dependency_overrides[IdProvider] is get_jwt_id_provider
+    assert client.get("/me/").json() == str(uid)
@@ -0,0 +1,65 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+import pytest
+from zametka.notes.application.note.dto import ImportNoteDTO, ImportNoteErrorDTO
+from zametka.notes.presentation.note_import import (
+    ImportFormat,
+    ImportRow,
+    read_notes,
+)
+
+
+async def stream(data: bytes, chunk_size: int = 3) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+async def read(data: str, import_format: ImportFormat) -> list[ImportRow]:
+    return [row async for row in read_notes(stream(data.encode()), import_format)]
+
+
+@pytest.mark.notes
+async def test_read_ndjson():
+    rows = await read(
+        '{"title": "Заметка", "text": "Текст", "created_at": "2024-01-03T13:04:46"}\n'
+        "\n"
+        "not json\n"
+        '{"title": 1}\n'
+        '{"title": "Без текста"}',
+        ImportFormat.NDJSON,
+    )
+
+    assert rows == [
+        ImportNoteDTO(
+            line=1,
+            title="Заметка",
+            text="Текст",
+            created_at=datetime(2024, 1, 3, 13, 4, 46),
+        ),
+        ImportNoteErrorDTO(line=3, error="Некорректная строка!"),
+        ImportNoteErrorDTO(line=4, error="Некорректная строка!"),
+        ImportNoteDTO(line=5, title="Без текста"),
+    ]
+
+
+@pytest.mark.notes
+async def test_read_csv():
+    rows = await read(
+        "title,text,created_at\r\n"
+        'Заметка,"Первая строка\nвторая ""строка""",\r\n'
+        "Дата,,вчера\r\n"
+        "Последняя,Текст,2024-01-03\r\n",
+        ImportFormat.CSV,
+    )
+
+    assert rows == [
+        ImportNoteDTO(line=2, title="Заметка", text='Первая строка\nвторая "строка"'),
+        ImportNoteErrorDTO(line=4, error="Некорректная дата создания!"),
+        ImportNoteDTO(
+            line=5,
+            title="Последняя",
+            text="Текст",
+            created_at=datetime(2024, 1, 3),
+        ),
+    ]